@@ -15,4 +15,9 @@ python manage.py collectstatic --noinput
 #TODO add migrations
 echo "Postgresql migrations finished"
 
-gunicorn tsa_app.wsgi:application --bind 0.0.0.0:8000
+# "entrypoint.sh worker" runs the upload worker instead of the web server
+if [ "$1" = "worker" ]; then
+  exec python manage.py process_uploads
+fi
+
+gunicorn --config gunicorn.conf.py
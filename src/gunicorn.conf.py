@@ -0,0 +1,79 @@
+"""
+Gunicorn configuration for tsa_app, picked up from this directory or passed with ``--config``.
+
+Every setting can be adjusted with the GUNICORN_* variables of example.env.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+# run from src/ so tsa_app is importable wherever gunicorn is started from
+chdir = str(Path(__file__).resolve().parent)
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+
+# gthread serves the WSGI app with threads per worker, uvicorn serves the ASGI app of tsa_app/asgi.py,
+# which disables persistent database connections (use DB_POOL=True to reuse connections)
+WORKER_CLASSES = {
+    "sync": ("sync", "tsa_app.wsgi:application"),
+    "gthread": ("gthread", "tsa_app.wsgi:application"),
+    "uvicorn": ("uvicorn_worker.UvicornWorker", "tsa_app.asgi:application"),
+}
+worker_class, wsgi_app = WORKER_CLASSES[os.getenv("GUNICORN_WORKER_CLASS", "gthread")]
+
+# the cores this process may run on, which is less than os.cpu_count() in a container limited by affinity
+cpu_count = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+# the requests wait for the database most of the time, threads cover the waiting of a worker. An
+# async worker waits for many requests at once on its event loop, one per core is enough
+default_workers = cpu_count * 2 + 1 if worker_class in ("sync", "gthread") else cpu_count
+workers = int(os.getenv("GUNICORN_WORKERS", str(default_workers)))
+threads = int(os.getenv("GUNICORN_THREADS", "4" if worker_class == "gthread" else "1"))
+
+# import the app in the master, forked workers share its memory pages until they write to them
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+# restart a worker after this many requests to bound memory creep, the jitter keeps the workers
+# from restarting at the same time
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", str(max_requests // 10)))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    # samples of the workers of a previous run would be added to the ones of this run
+    multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+
+
+def pre_fork(server, worker):
+    if not preload_app:
+        return
+    from django.db import connections
+
+    # a connection opened while preloading must not be shared by the workers
+    connections.close_all()
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        # the app is imported by the worker after this hook, it warms up on its first requests
+        return
+    from tsa_products.warmup import warm_up
+
+    # only the sync worker serves requests from the thread running this hook
+    duration = warm_up(keep_connections=worker_class == "sync")
+    worker.log.info("worker %s warmed up in %.1fms", worker.pid, duration * 1000)
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
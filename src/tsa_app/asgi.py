@@ -0,0 +1,20 @@
+"""
+ASGI config for tsa_app project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+Run it with uvicorn workers, e.g. ``gunicorn tsa_app.asgi:application -k uvicorn_worker.UvicornWorker``.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tsa_app.settings")
+# the sync code of every async request runs in a thread of its own, each of them would keep its own
+# persistent connection open. Connections are reused under ASGI with DB_POOL=True instead
+os.environ["DB_CONN_MAX_AGE"] = "0"
+
+application = get_asgi_application()
@@ -6,27 +6,25 @@ import logging
 import os
 from pathlib import Path
 
-from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
-# Configure Django logging
+# handlers are configured by Django from LOGGING below, after the settings are imported. Until then
+# only warnings of this module are printed.
 logger = logging.getLogger(__name__)
 
-# Configure logging format
-logging.basicConfig(
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(filename)s:%(funcName)s:%(lineno)d",  # noqa E501
-    datefmt="%Y-%m-%d_%H-%M-%S",
-)
-logger.setLevel(level="INFO")
-
 # path: truck-signs-api/src = root of project tsa_app
 BASE_DIR = Path(__file__).resolve().parent.parent
 # path: truck-signs-api = root of project truck-signs-api
 ROOT_BASE_DIR = BASE_DIR.parent
 TEMPLATES_DIR = BASE_DIR / "templates"
 
-# load environment variables from .env file
-has_env_vars_configuration = load_dotenv(ROOT_BASE_DIR / ".env")
-if not has_env_vars_configuration:
+# load environment variables from .env file, python-dotenv is only imported when there is one
+ENV_FILE = ROOT_BASE_DIR / ".env"
+if ENV_FILE.is_file():
+    from dotenv import load_dotenv
+
+    load_dotenv(ENV_FILE)
+else:
     logger.warning("could not find .env file, make sure env variables are set as required")
 
 # read configuration from environment, set secure defaults where possible
@@ -46,13 +44,34 @@ elif not MODE or MODE == "":
 if MODE == "prod":
     logger.info("running in production mode, ensure 'DEBUG' is disabled")
     DEBUG = False
-    logger.setLevel(level=LOG_LEVEL)
 else:
     # dev mode
     logger.info("running in development mode, enabling 'DEBUG'")
     DEBUG = True
     LOG_LEVEL = "DEBUG"
-    logger.setLevel(level=LOG_LEVEL)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {
+            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s - %(filename)s:%(funcName)s:%(lineno)d",
+            "datefmt": "%Y-%m-%d_%H-%M-%S",
+        },
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "default"},
+    },
+    "root": {"handlers": ["console"], "level": "WARNING"},
+    "loggers": {
+        "tsa_app": {"level": LOG_LEVEL},
+        # see REQUEST_TIMING_SAMPLE_RATE
+        "tsa_products.timing": {"level": "INFO"},
+    },
+}
+
+# only load the cloudinary app and storage when an account is configured
+CLOUD_NAME = os.getenv("CLOUD_NAME", "")
 
 SECRET_KEY = os.getenv("SECRET_KEY", "django-insecure-change-me-in-production")
 
@@ -68,15 +87,18 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "corsheaders",
     "rest_framework",
-    "cloudinary",
+    *(["cloudinary"] if CLOUD_NAME else []),
     "tsa_products",
     "django.contrib.admin",
 ]
 
 MIDDLEWARE = [
+    "tsa_products.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "tsa_products.middleware.RequestTimingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.http.ConditionalGetMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -122,8 +144,108 @@ sqlite_config = {
 
 db_config = sqlite_config if MODE != "prod" else pg_config
 
+# connections are kept open for DB_CONN_MAX_AGE seconds and reused by the following requests of the
+# same worker (0 opens a new connection for every request), DB_CONN_HEALTH_CHECKS checks a reused
+# connection before the first query of a request. DB_POOL=True uses a psycopg connection pool per
+# worker instead, Django does not combine it with persistent connections so DB_CONN_MAX_AGE is ignored.
+DB_POOL = MODE == "prod" and os.getenv("DB_POOL", "False") == "True"
+db_config["CONN_MAX_AGE"] = 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60" if MODE == "prod" else "0"))
+db_config["CONN_HEALTH_CHECKS"] = os.getenv("DB_CONN_HEALTH_CHECKS", str(MODE == "prod")) == "True"
+if DB_POOL:
+    db_config["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            # seconds a request waits for a free connection before failing
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+    }
+
 DATABASES = {"default": db_config}
 
+# the local-memory cache is per process, point CACHE_REDIS_URL to a redis server or CACHE_LOCATION
+# to a shared directory to use a cache that all gunicorn workers see
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "")
+CACHE_LOCATION = os.getenv("CACHE_LOCATION", "")
+
+if CACHE_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+        }
+    }
+elif CACHE_LOCATION:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_LOCATION,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tsa-default",
+        }
+    }
+
+CATALOG_CACHE_ALIAS = "default"
+# every worker keeps its own catalog version in a per-process cache, so a catalog change bumps the
+# version of the worker that made it only. The others serve their cached payloads and answer their
+# ETags with 304 until the version expires, after CATALOG_CACHE_TIMEOUT seconds, which is kept short
+CATALOG_CACHE_SHARED = bool(CACHE_REDIS_URL or CACHE_LOCATION)
+if MODE == "prod" and not CATALOG_CACHE_SHARED:
+    logger.warning("the catalog cache is not shared by the workers, set CACHE_REDIS_URL or CACHE_LOCATION")
+CATALOG_CACHE_TIMEOUT = int(os.getenv("CATALOG_CACHE_TIMEOUT", "3600" if CATALOG_CACHE_SHARED else "30"))
+# build the category and product lists from .values() rows instead of DRF serializers
+CATALOG_FAST_SERIALIZATION = os.getenv("CATALOG_FAST_SERIALIZATION", "True") == "True"
+
+# manage.py snapshot_catalog writes the JSON of the catalog lists to content hashed files in
+# CATALOG_SNAPSHOT_ROOT, served under CATALOG_SNAPSHOT_URL, with a manifest.json mapping api paths
+# to them. Image urls are built for CATALOG_SNAPSHOT_BASE_URL, the public url of the api, whose host
+# must be in ALLOWED_HOSTS. CATALOG_SNAPSHOT_AUTO rewrites the snapshot whenever the catalog changes.
+CATALOG_SNAPSHOT_ROOT = os.getenv("CATALOG_SNAPSHOT_ROOT", os.path.join(BASE_DIR, "catalog-snapshot/"))
+CATALOG_SNAPSHOT_URL = os.getenv("CATALOG_SNAPSHOT_URL", "/catalog-snapshot/")
+CATALOG_SNAPSHOT_BASE_URL = os.getenv("CATALOG_SNAPSHOT_BASE_URL", "http://localhost:8000")
+CATALOG_SNAPSHOT_AUTO = os.getenv("CATALOG_SNAPSHOT_AUTO", "False") == "True"
+
+# list views are paginated only when a client sends a cursor or page_size parameter,
+# without one they return a plain list of at most API_UNPAGINATED_MAX_RESULTS rows
+REST_FRAMEWORK = {
+    "DEFAULT_PAGINATION_CLASS": "tsa_products.pagination.OptInCursorPagination",
+    "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", "50")),
+}
+API_MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "200"))
+API_UNPAGINATED_MAX_RESULTS = int(os.getenv("API_UNPAGINATED_MAX_RESULTS", "1000"))
+# API_JSON_BACKEND=orjson encodes and decodes JSON with orjson when it is installed, stdlib keeps DRF's
+# json based renderer and parser
+API_JSON_BACKEND = os.getenv("API_JSON_BACKEND", "orjson")
+if API_JSON_BACKEND == "orjson":
+    json_renderer, json_parser = "tsa_products.renderers.FastJSONRenderer", "tsa_products.parsers.FastJSONParser"
+else:
+    json_renderer, json_parser = "rest_framework.renderers.JSONRenderer", "rest_framework.parsers.JSONParser"
+REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = [json_renderer, "rest_framework.renderers.BrowsableAPIRenderer"]
+REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = [
+    json_parser,
+    "rest_framework.parsers.FormParser",
+    "rest_framework.parsers.MultiPartParser",
+]
+ORDER_BATCH_MAX_SIZE = int(os.getenv("ORDER_BATCH_MAX_SIZE", "100"))
+# unfiltered admin changelists of larger tables show an estimated row count instead of counting every row
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv("ADMIN_ESTIMATED_COUNT_THRESHOLD", "100000"))
+
+# share of requests (0 to 1) whose SQL, serialization and render time is reported in a Server-Timing
+# header and a log line, optionally limited to a comma separated list of url names. Measuring is
+# off by default, unsampled requests skip the middleware without any overhead.
+REQUEST_TIMING_SAMPLE_RATE = float(os.getenv("REQUEST_TIMING_SAMPLE_RATE", "0"))
+REQUEST_TIMING_VIEWS = [name for name in os.getenv("REQUEST_TIMING_VIEWS", "").split(",") if name]
+
+# /metrics answers only requests with an "Authorization: Bearer <METRICS_TOKEN>" header when set.
+# Without a token /metrics is open in dev only, in prod it answers 404.
+# Point PROMETHEUS_MULTIPROC_DIR to an empty directory to aggregate the metrics of all gunicorn workers.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -151,10 +273,20 @@ STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles/")
 MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "mediafiles/")
 
+# queued uploads wait here until `manage.py process_uploads` moves them to the media storage
+UPLOAD_SPOOL_ROOT = os.getenv("UPLOAD_SPOOL_ROOT", os.path.join(BASE_DIR, "upload-spool/"))
+UPLOAD_TASK_MAX_ATTEMPTS = int(os.getenv("UPLOAD_TASK_MAX_ATTEMPTS", "5"))
+
 CORS_ALLOWED_ORIGINS = os.getenv(
     "CORS_ALLOWED_ORIGINS",
     "http://localhost:3000",
 ).split(",")
+CORS_ALLOW_HEADERS = (*default_headers, "idempotency-key")
+CORS_EXPOSE_HEADERS = ["idempotent-replayed"]
+
+# seconds the response to a POST with an Idempotency-Key header is replayed to its retries, expired
+# keys are deleted by manage.py purge_idempotency_keys
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", "86400"))
 
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = "smtp.gmail.com"
@@ -163,18 +295,22 @@ EMAIL_PORT = 587
 EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
 EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
 
-CLOUDINARY_STORAGE = {
-    "CLOUD_NAME": os.getenv("CLOUD_NAME", ""),
-    "API_KEY": os.getenv("CLOUD_API_KEY", ""),
-    "API_SECRET": os.getenv("CLOUD_API_SECRET", ""),
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
 }
 
-# Only use Cloudinary in production if configured
-if os.getenv("CLOUD_NAME", ""):
-    DEFAULT_FILE_STORAGE = "cloudinary_storage.storage.MediaCloudinaryStorage"
-
-# Debugging output of settings
-if MODE != "prod" or DEBUG is True:
+# Only use Cloudinary if configured
+if CLOUD_NAME:
+    CLOUDINARY_STORAGE = {
+        "CLOUD_NAME": CLOUD_NAME,
+        "API_KEY": os.getenv("CLOUD_API_KEY", ""),
+        "API_SECRET": os.getenv("CLOUD_API_SECRET", ""),
+    }
+    STORAGES["default"] = {"BACKEND": "cloudinary_storage.storage.MediaCloudinaryStorage"}
+
+# Debugging output of settings, printed by every process that imports them when enabled
+if os.getenv("SETTINGS_DEBUG_DUMP", "False") == "True":
     logger.debug("dumping settings for debugging/development purposes:")
     print("")
     print(f"[{"---" * 20} \t\tSTART SETTINGS DEBUG INFO \t{"---" * 20}]")
@@ -187,7 +323,7 @@ if MODE != "prod" or DEBUG is True:
     print(f"[ALLOWED HOSTS]: \t\t{ALLOWED_HOSTS}")
     print("[DB CONFIG]:")
     for key, value in DATABASES["default"].items():
-        print(f"  {key}: \t\t\t{value}")
+        print(f"  {key}: \t\t\t{'********' if key == 'PASSWORD' else value}")
     print("")
     print(f"[{"---" * 20} \t\tEND SETTINGS DEBUG INFO \t{"---" * 20}]")
     print("")
@@ -20,6 +20,9 @@ from django.contrib import admin
 from django.shortcuts import render
 from django.urls import include, path, re_path
 
+from tsa_products.metrics import metrics_view
+from tsa_products.urls import URL_NAMESPACE
+
 
 def home_view(request):
     return render(request, "base.html")
@@ -28,5 +31,8 @@ def home_view(request):
 urlpatterns = [
     path("", home_view, name="home"),
     path("admin/", admin.site.urls),
-    re_path(r"^truck-signs/", include("tsa_products.urls", namespace="trucks-signs-namespace")),
+    path("metrics", metrics_view, name="metrics"),
+    re_path(r"^truck-signs/", include("tsa_products.urls", namespace=URL_NAMESPACE)),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# the catalog snapshot, in production a front proxy serves CATALOG_SNAPSHOT_ROOT instead
+urlpatterns += static(settings.CATALOG_SNAPSHOT_URL, document_root=settings.CATALOG_SNAPSHOT_ROOT)
@@ -1,8 +1,11 @@
 from django.contrib import admin
+from django.db.models import Count
 
+from .exports import stream_orders
 from .models import (
     Category,
     Comment,
+    ImageVariantTask,
     LetteringItemCategory,
     LetteringItemVariation,
     Order,
@@ -10,7 +13,9 @@ from .models import (
     Product,
     ProductColor,
     ProductVariation,
+    UploadTask,
 )
+from .pagination import EstimatedCountPaginator
 
 # Register your models here.
 
@@ -23,8 +28,30 @@ class OrderAdmin(admin.ModelAdmin):
         "get_product_variation_id",
         "get_product",
         "get_product_category",
+        "get_total_price",
         "ordered_date",
     ]
+    list_select_related = ["product__product__category"]
+    list_filter = ["ordered", "ordered_date"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ["export_orders_csv", "export_orders_ndjson"]
+
+    def get_queryset(self, request):
+        # variations without a stored total price are priced from their lettering items
+        return (
+            super()
+            .get_queryset(request)
+            .prefetch_related("product__lettering_item_variation_set__lettering_item_category")
+        )
+
+    @admin.action(description="Export selected orders as CSV")
+    def export_orders_csv(self, request, queryset):
+        return stream_orders(queryset, "csv")
+
+    @admin.action(description="Export selected orders as NDJSON")
+    def export_orders_ndjson(self, request, queryset):
+        return stream_orders(queryset, "ndjson")
 
     def get_product_variation_id(self, obj):
         try:
@@ -53,6 +80,15 @@ class OrderAdmin(admin.ModelAdmin):
     get_product_category.short_description = "Product Category"
     get_product_category.admin_order_field = "product__product__category"
 
+    def get_total_price(self, obj):
+        try:
+            return obj.get_total_price()
+        except AttributeError:
+            return "---"
+
+    get_total_price.short_description = "Total Price"
+    get_total_price.admin_order_field = "product__total_price"
+
     search_fields = ["user_email", "id"]
 
 
@@ -93,7 +129,21 @@ class ProductAdmin(admin.ModelAdmin):
         "is_uploaded",
         "id",
     ]
-    search_fields = ["title", "category", "id"]
+    list_select_related = ["category"]
+    search_fields = ["title", "category__title", "id"]
+
+
+def reprice_variation(variation):
+    """Store the price of `variation` calculated from its current product, amount and lettering items."""
+    if variation is None or variation.product is None:
+        return
+    variation.reprice()
+    variation.save(update_fields=["total_price", "price_breakdown"])
+
+
+class LetteringItemVariationInline(admin.TabularInline):
+    model = LetteringItemVariation
+    extra = 0
 
 
 class ProductVariationAdmin(admin.ModelAdmin):
@@ -102,8 +152,22 @@ class ProductVariationAdmin(admin.ModelAdmin):
         "get_amount_of_lettering",
         "product_color",
         "get_amount",
+        "total_price",
         "id",
     ]
+    list_select_related = ["product__category", "product_color"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    # the price is calculated from the product, amount and lettering items when the variation is saved
+    readonly_fields = ["total_price", "price_breakdown"]
+    inlines = [LetteringItemVariationInline]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(amount_of_lettering=Count("lettering_item_variation_set"))
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        reprice_variation(form.instance)
 
     def get_amount(self, obj):
         try:
@@ -115,15 +179,12 @@ class ProductVariationAdmin(admin.ModelAdmin):
     get_amount.admin_order_field = "amount"
 
     def get_amount_of_lettering(self, obj):
-        try:
-            return len(obj.get_all_lettering_items())
-        except (AttributeError, TypeError):
-            return "0"
+        return obj.amount_of_lettering
 
     get_amount_of_lettering.short_description = "Amount of Lettering"
-    get_amount_of_lettering.admin_order_field = "len(obj.get_all_lettering_items())"
+    get_amount_of_lettering.admin_order_field = "amount_of_lettering"
 
-    search_fields = ["product", "product_color", "id"]
+    search_fields = ["product__title", "product_color__color_nickname", "id"]
 
 
 class LetteringItemVariationAdmin(admin.ModelAdmin):
@@ -133,6 +194,22 @@ class LetteringItemVariationAdmin(admin.ModelAdmin):
         "get_product_variation",
         "id",
     ]
+    list_select_related = ["lettering_item_category", "product_variation__product"]
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def save_model(self, request, obj, form, change):
+        previous_variation = form.initial.get("product_variation")
+        super().save_model(request, obj, form, change)
+        # the lettering items are part of the price of their variations
+        reprice_variation(obj.product_variation)
+        if previous_variation is not None and previous_variation != obj.product_variation_id:
+            reprice_variation(ProductVariation.objects.filter(pk=previous_variation).first())
+
+    def delete_model(self, request, obj):
+        variation = obj.product_variation
+        super().delete_model(request, obj)
+        reprice_variation(variation)
 
     def get_lettering_item_category(self, obj):
         try:
@@ -150,7 +227,7 @@ class LetteringItemVariationAdmin(admin.ModelAdmin):
 
     get_product_variation.short_description = "Product Variation"
 
-    search_fields = ["lettering_item_category", "lettering", "id"]
+    search_fields = ["lettering_item_category__title", "lettering", "id"]
 
 
 class PaymentAdmin(admin.ModelAdmin):
@@ -182,6 +259,36 @@ class CommentAdmin(admin.ModelAdmin):
     search_fields = ["user_email", "id"]
 
 
+class UploadTaskAdmin(admin.ModelAdmin):
+    list_display = [
+        "spooled_file",
+        "status",
+        "attempts",
+        "product",
+        "comment",
+        "created_at",
+        "id",
+    ]
+    list_filter = ["status"]
+    list_select_related = ["product__category", "comment"]
+
+    search_fields = ["spooled_file", "id"]
+
+
+class ImageVariantTaskAdmin(admin.ModelAdmin):
+    list_display = [
+        "model_name",
+        "object_id",
+        "status",
+        "attempts",
+        "created_at",
+        "id",
+    ]
+    list_filter = ["status", "model_name"]
+
+    search_fields = ["object_id", "id"]
+
+
 admin.site.register(Category, CategoryAdmin)
 admin.site.register(LetteringItemCategory, LetteringItemCategoryAdmin)
 admin.site.register(Product, ProductAdmin)
@@ -191,3 +298,5 @@ admin.site.register(LetteringItemVariation, LetteringItemVariationAdmin)
 admin.site.register(Payment, PaymentAdmin)
 admin.site.register(Order, OrderAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(UploadTask, UploadTaskAdmin)
+admin.site.register(ImageVariantTask, ImageVariantTaskAdmin)
@@ -0,0 +1,192 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from django.views import View
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .cache import (
+    aget_catalog_version,
+    catalog_cache_key,
+    catalog_version_etag,
+    catalog_version_last_modified,
+    get_catalog_cache,
+)
+from .fast_serializers import CATEGORY_VALUES, PRODUCT_VALUES, aserialize_categories, aserialize_products
+from .metrics import record_cache_lookup
+from .models import Category, LetteringItemCategory, Order, Product, ProductColor
+from .pagination import OptInCursorPagination
+from .serializers import (
+    CategorySerializer,
+    LetteringItemCategorySerializer,
+    OrderSerializer,
+    ProductColorSerializer,
+    ProductSerializer,
+)
+
+# Async counterparts of the read-only catalog and order views of views.py, served under /async/.
+# Under ASGI (tsa_app/asgi.py) they wait for the database without holding a worker thread, so one
+# worker can keep many slow requests in flight. They return the same JSON as the DRF views but do
+# not offer the browsable API.
+
+
+def render_json(data, status=200):
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(data), content_type="application/json", status=status)
+
+
+def error_response(exc):
+    """The JSON response DRF's exception handler answers an Http404 or APIException with."""
+    if isinstance(exc, Http404):
+        return render_json({"detail": str(exc)}, status=404)
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    return render_json(data, status=exc.status_code)
+
+
+def not_found(model):
+    # the message DRF's get_object_or_404 answers with
+    return Http404(f"No {model._meta.object_name} matches the given query.")
+
+
+class AsyncAPIView(View):
+    """Async GET view rendering the data returned by the coroutine `get_data` as JSON, errors like DRF does.
+
+    Subclasses define `get_data(request, *args, **kwargs)`, `request` being a DRF Request.
+    """
+
+    http_method_names = ["get", "head", "options"]
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            data = await self.get_data(Request(request), *args, **kwargs)
+        except (Http404, APIException) as exc:
+            return error_response(exc)
+        return render_json(data)
+
+
+class AsyncCatalogView(AsyncAPIView):
+    """AsyncAPIView serving its data from the catalog cache, like CatalogCacheMixin does.
+
+    The ETag and Last-Modified header are those condition() adds to the sync views, computed from
+    a catalog version read with the async cache api so a network cache does not block the loop.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        version = await aget_catalog_version()
+        etag = quote_etag(catalog_version_etag(request, version))
+        last_modified = int(catalog_version_last_modified(version).timestamp())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await self.get_catalog_response(request, version, *args, **kwargs)
+        if request.method in ("GET", "HEAD"):
+            if not response.has_header("Last-Modified"):
+                response.headers["Last-Modified"] = http_date(last_modified)
+            response.headers.setdefault("ETag", etag)
+        return response
+
+    async def get_catalog_response(self, request, version, *args, **kwargs):
+        cache = get_catalog_cache()
+        key = catalog_cache_key(request, version)
+        data = await cache.aget(key)
+        record_cache_lookup("catalog", data is not None)
+        if data is not None:
+            return render_json(data)
+
+        try:
+            data = await self.get_data(Request(request), *args, **kwargs)
+        except (Http404, APIException) as exc:
+            return error_response(exc)
+        await cache.aset(key, data, settings.CATALOG_CACHE_TIMEOUT)
+        return render_json(data)
+
+
+class AsyncCatalogListView(AsyncCatalogView):
+    """List of `queryset`, paginated like the DRF list views with OptInCursorPagination.
+
+    With CATALOG_FAST_SERIALIZATION the rows are read with `.values(*values_fields)` and turned
+    into data by the coroutine `values_serializer`, otherwise `serializer_class` serializes the
+    model instances.
+    """
+
+    queryset = None
+    serializer_class = None
+    values_fields = ()
+    values_serializer = None
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    async def get_data(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        serialize = self.serialize
+        if self.values_serializer is not None and settings.CATALOG_FAST_SERIALIZATION:
+            queryset = queryset.prefetch_related(None).values(*self.values_fields)
+            serialize = self.values_serializer
+
+        paginator = OptInCursorPagination()
+        if paginator.is_requested(request):
+            # building the cursor links is not available in the async ORM
+            page = await sync_to_async(paginator.paginate_queryset)(queryset, request, self)
+            return paginator.get_paginated_response(await serialize(page, request)).data
+
+        ordering = paginator.get_ordering(request, queryset, self)
+        rows = [row async for row in queryset.order_by(*ordering)[: paginator.unpaginated_max_results]]
+        return await serialize(rows, request)
+
+    async def serialize(self, rows, request):
+        # the querysets load their relations up front, so serializing does not query the database
+        return self.serializer_class(rows, many=True, context={"request": request}).data
+
+
+class AsyncCategoryListView(AsyncCatalogListView):
+    serializer_class = CategorySerializer
+    values_fields = CATEGORY_VALUES
+    values_serializer = staticmethod(aserialize_categories)
+    queryset = Category.objects.with_sample_product_id()
+
+
+class AsyncLetteringItemCategoryListView(AsyncCatalogListView):
+    serializer_class = LetteringItemCategorySerializer
+    queryset = LetteringItemCategory.objects.all()
+
+
+class AsyncProductListView(AsyncCatalogListView):
+    serializer_class = ProductSerializer
+    values_fields = PRODUCT_VALUES
+    values_serializer = staticmethod(aserialize_products)
+    queryset = Product.objects.with_category()
+
+
+class AsyncProductFromCategoryListView(AsyncProductListView):
+    def get_queryset(self):
+        return Product.objects.with_category().filter(category__id=self.kwargs.get("id"))
+
+
+class AsyncProductColorListView(AsyncCatalogListView):
+    serializer_class = ProductColorSerializer
+    queryset = ProductColor.objects.all()
+
+
+class AsyncLogoListView(AsyncProductListView):
+    queryset = Product.objects.with_category().filter(category__title="Truck Sign", is_uploaded=False)
+
+
+class AsyncProductDetail(AsyncCatalogView):
+    async def get_data(self, request, id):
+        try:
+            product = await Product.objects.with_category().aget(id=id)
+        except Product.DoesNotExist:
+            raise not_found(Product)
+        return ProductSerializer(product, context={"request": request}).data
+
+
+class AsyncRetrieveOrder(AsyncAPIView):
+    async def get_data(self, request, id):
+        try:
+            order = await Order.objects.with_related().aget(id=id)
+        except Order.DoesNotExist:
+            raise not_found(Order)
+        return OrderSerializer(order, context={"request": request}).data
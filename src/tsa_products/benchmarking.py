@@ -0,0 +1,236 @@
+import base64
+import io
+import json
+import math
+import secrets
+import subprocess
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from PIL import Image
+
+from .models import LetteringItemCategory, Order, Product, ProductColor, ProductVariation, UploadTask
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(values)
+    rank = max(math.ceil(fraction * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def summarize(durations_ms):
+    return {
+        "mean_ms": round(sum(durations_ms) / len(durations_ms), 3),
+        "p50_ms": round(percentile(durations_ms, 0.50), 3),
+        "p95_ms": round(percentile(durations_ms, 0.95), 3),
+        "p99_ms": round(percentile(durations_ms, 0.99), 3),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+@contextmanager
+def throwaway_database():
+    """Point the default connection to a new test database for the duration of the block."""
+    setup_test_environment()
+    old_database_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_database_name, verbosity=0)
+        teardown_test_environment()
+
+
+def build_test_image(name="benchmark.png"):
+    content = io.BytesIO()
+    Image.new("RGB", (64, 64), "red").save(content, format="PNG")
+    return SimpleUploadedFile(name, content.getvalue(), content_type="image/png")
+
+
+def response_size(response):
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def timed_request(client, method, path, request_kwargs):
+    """Send one request, returns the response, its duration in ms, the number of queries and the body size."""
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = getattr(client, method.lower())(path, **request_kwargs)
+        size = response_size(response)
+        duration_ms = (time.perf_counter() - started) * 1000
+    return response, duration_ms, len(queries), size
+
+
+class Scenario:
+    """One request shape for a route of tsa_products/urls.py.
+
+    `kwargs` builds the url kwargs and `payload` the test client arguments of a request
+    from the benchmark context, the payload is built again for every request.
+    """
+
+    def __init__(self, method, kwargs=None, payload=None):
+        self.method = method
+        self.kwargs = kwargs or (lambda context: {})
+        self.payload = payload or (lambda context: {})
+
+
+def json_payload(build):
+    return lambda context: {"data": json.dumps(build(context)), "content_type": "application/json"}
+
+
+def order_item(context, index=0):
+    return {
+        "product_id": context["product"].id,
+        "product_color_id": context["color"].id,
+        "lettering_items": [{"title": context["lettering_category"].title, "text": f"TRUCKING {index}"}],
+        "order": {"user_email": f"benchmark-{index}@example.com"},
+    }
+
+
+def comment_payload(context):
+    return {"data": {"user_email": "benchmark@example.com", "text": "benchmark", "image": build_test_image()}}
+
+
+def image_payload(context):
+    return {"data": {"image": build_test_image()}}
+
+
+def staff_credentials(context):
+    return {"headers": {"authorization": context["staff_authorization"]}}
+
+
+def order_id(context):
+    return {"id": context["order"].id}
+
+
+# every route name in tsa_products/urls.py needs at least one scenario
+SCENARIOS = {
+    "categories-api": [Scenario("GET")],
+    "lettering-item-categories-api": [Scenario("GET")],
+    "products-api": [Scenario("GET")],
+    "product-category-api": [Scenario("GET", lambda context: {"id": context["category"].id})],
+    "product-variation-retrieve-api": [Scenario("GET", lambda context: {"id": context["product_variation"].id})],
+    "product-color-api": [Scenario("GET")],
+    "product-detail-api": [Scenario("GET", lambda context: {"id": context["product"].id})],
+    "truck-logo-list-api": [Scenario("GET")],
+    "create-order-api": [
+        Scenario("POST", lambda context: {"id": context["product"].id}, json_payload(order_item)),
+    ],
+    "batch-create-order-api": [
+        Scenario("POST", payload=json_payload(lambda context: [order_item(context, index) for index in range(10)]))
+    ],
+    "retrieve-order-api": [Scenario("GET", order_id)],
+    "order-export-api": [Scenario("GET", lambda context: {"export_format": "csv"}, staff_credentials)],
+    "order-payment-api": [
+        Scenario("GET", order_id),
+        Scenario("POST", order_id, json_payload(lambda context: {"order": {"user_first_name": "Bench"}})),
+    ],
+    "comments-api": [Scenario("GET")],
+    "comment-create-api": [Scenario("POST", payload=comment_payload)],
+    "queued-comment-create-api": [Scenario("POST", payload=comment_payload)],
+    "upload-customer-image-api": [Scenario("POST", payload=image_payload)],
+    "queued-upload-customer-image-api": [Scenario("POST", payload=image_payload)],
+    "upload-task-api": [Scenario("GET", lambda context: {"id": context["upload_task"].id})],
+    "async-categories-api": [Scenario("GET")],
+    "async-lettering-item-categories-api": [Scenario("GET")],
+    "async-products-api": [Scenario("GET")],
+    "async-product-category-api": [Scenario("GET", lambda context: {"id": context["category"].id})],
+    "async-product-color-api": [Scenario("GET")],
+    "async-product-detail-api": [Scenario("GET", lambda context: {"id": context["product"].id})],
+    "async-truck-logo-list-api": [Scenario("GET")],
+    "async-retrieve-order-api": [Scenario("GET", order_id)],
+}
+
+
+def build_context():
+    """Pick the rows the parametrised routes are called with from the seeded database."""
+    product = Product.objects.select_related("category").filter(category__title="Truck Sign").order_by("pk").first()
+    upload_product = Product.objects.create(category=product.category, title="Benchmark upload", is_uploaded=True)
+    staff_username, staff_password = f"benchmark-staff-{secrets.token_hex(4)}", secrets.token_urlsafe()
+    staff_user = User.objects.create_user(staff_username, password=staff_password, is_staff=True)
+    staff_credentials = base64.b64encode(f"{staff_username}:{staff_password}".encode()).decode()
+    return {
+        "category": product.category,
+        "product": product,
+        "color": ProductColor.objects.order_by("pk").first(),
+        "lettering_category": LetteringItemCategory.objects.order_by("pk").first(),
+        "product_variation": ProductVariation.objects.filter(product__isnull=False).order_by("pk").first(),
+        "order": Order.objects.filter(product__isnull=False, payment__isnull=True).order_by("pk").first(),
+        "staff_user": staff_user,
+        "staff_authorization": f"Basic {staff_credentials}",
+        "upload_task": UploadTask.objects.create(
+            product=upload_product, spooled_file="benchmark.png", status=UploadTask.Status.DONE
+        ),
+    }
+
+
+def benchmark_routes(client, urlpatterns, namespace, iterations, clear_cache):
+    """Run every scenario of every url pattern, returns the measurements keyed by "<route name> <method>"."""
+    missing = [pattern.name for pattern in urlpatterns if pattern.name not in SCENARIOS]
+    if missing:
+        raise KeyError(f"no benchmark scenario for routes: {', '.join(missing)}")
+
+    context = build_context()
+    results = {}
+    try:
+        for pattern in urlpatterns:
+            for scenario in SCENARIOS[pattern.name]:
+                path = reverse(f"{namespace}:{pattern.name}", kwargs=scenario.kwargs(context))
+
+                clear_cache()
+                response, cold_ms, cold_queries, _ = timed_request(
+                    client, scenario.method, path, scenario.payload(context)
+                )
+                durations_ms, query_counts, sizes = [], [], []
+                for _ in range(iterations):
+                    response, duration_ms, queries, size = timed_request(
+                        client, scenario.method, path, scenario.payload(context)
+                    )
+                    durations_ms.append(duration_ms)
+                    query_counts.append(queries)
+                    sizes.append(size)
+
+                results[f"{pattern.name} {scenario.method}"] = {
+                    "method": scenario.method,
+                    "path": path,
+                    "status": response.status_code,
+                    "cold_ms": round(cold_ms, 3),
+                    "cold_queries": cold_queries,
+                    "queries": max(query_counts),
+                    "bytes": max(sizes),
+                    **summarize(durations_ms),
+                }
+    finally:
+        # a staff user with a known password must not outlive an --in-place run
+        context["staff_user"].delete()
+    return results
+
+
+def find_regressions(results, baseline, max_query_increase=0, max_p95_regression=None):
+    """Compare results with a previous run, returns a description of every regression."""
+    regressions = []
+    for route, measurement in results.items():
+        previous = baseline.get(route)
+        if previous is None:
+            continue
+        for metric in ("queries", "cold_queries"):
+            if measurement[metric] > previous[metric] + max_query_increase:
+                regressions.append(f"{route}: {metric} {previous[metric]} -> {measurement[metric]}")
+        if max_p95_regression is not None and measurement["p95_ms"] > previous["p95_ms"] * (1 + max_p95_regression):
+            regressions.append(f"{route}: p95 {previous['p95_ms']}ms -> {measurement['p95_ms']}ms")
+    return regressions
@@ -0,0 +1,105 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from rest_framework.response import Response
+
+from .metrics import record_cache_lookup
+from .pagination import pagination_query
+
+CATALOG_VERSION_KEY = "tsa_products:catalog:version"
+
+
+def get_catalog_cache():
+    return caches[settings.CATALOG_CACHE_ALIAS]
+
+
+def catalog_version_timeout():
+    # a version in a per-process cache expires with the payloads, which bounds how long a worker
+    # misses the changes made through the other workers
+    return None if settings.CATALOG_CACHE_SHARED else settings.CATALOG_CACHE_TIMEOUT
+
+
+def get_catalog_version():
+    """Return the current catalog version, initialising it on first use."""
+    cache = get_catalog_cache()
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # add() keeps the value another process may have stored in the meantime
+        cache.add(CATALOG_VERSION_KEY, time.time_ns(), catalog_version_timeout())
+        version = cache.get(CATALOG_VERSION_KEY, time.time_ns())
+    return version
+
+
+async def aget_catalog_version():
+    """get_catalog_version() for async views, the cache is not accessed from the event loop."""
+    cache = get_catalog_cache()
+    version = await cache.aget(CATALOG_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CATALOG_VERSION_KEY, time.time_ns(), catalog_version_timeout())
+        version = await cache.aget(CATALOG_VERSION_KEY, time.time_ns())
+    return version
+
+
+def bump_catalog_version():
+    """Start a new catalog version, which orphans every payload cached under the old one."""
+    version = time.time_ns()
+    get_catalog_cache().set(CATALOG_VERSION_KEY, version, catalog_version_timeout())
+    return version
+
+
+def catalog_cache_key(request, version=None):
+    if version is None:
+        version = get_catalog_version()
+    # the host is part of the key as serialized image urls contain it. Of the query only the pagination
+    # parameters the catalog views read are, so other parameters cannot add entries to the cache.
+    uri = f"{request.build_absolute_uri(request.path)}?{pagination_query(request)}"
+    uri_hash = hashlib.md5(uri.encode("utf-8"), usedforsecurity=False).hexdigest()
+    return f"tsa_products:catalog:{version}:{uri_hash}"
+
+
+def catalog_version_etag(request, version):
+    """Strong ETag of a catalog response, derived from the catalog version without touching the database."""
+    # the accept header selects the renderer, so it changes the bytes sent for the same uri
+    fingerprint = "|".join([str(version), request.build_absolute_uri(), request.META.get("HTTP_ACCEPT", "")])
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+def catalog_version_last_modified(version):
+    return datetime.fromtimestamp(version / 1e9, tz=timezone.utc)
+
+
+def catalog_etag(request, *args, **kwargs):
+    return catalog_version_etag(request, get_catalog_version())
+
+
+def catalog_last_modified(request, *args, **kwargs):
+    return catalog_version_last_modified(get_catalog_version())
+
+
+class CatalogCacheMixin:
+    """Serve the serialized payload of a read-only catalog view from the catalog cache.
+
+    Responses carry an ETag and Last-Modified header based on the catalog version, so
+    conditional requests are answered with 304 before any serialization happens.
+    The version is bumped by the save and delete signals of the catalog models, queryset
+    update() and bulk_create() send none, so their changes show once the cache expires.
+    """
+
+    @method_decorator(condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified))
+    def get(self, request, *args, **kwargs):
+        cache = get_catalog_cache()
+        key = catalog_cache_key(request)
+        data = cache.get(key)
+        record_cache_lookup("catalog", data is not None)
+        if data is not None:
+            return Response(data)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.CATALOG_CACHE_TIMEOUT)
+        return response
@@ -0,0 +1,124 @@
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+
+from .models import LetteringItemVariation
+
+EXPORT_COLUMNS = (
+    "order_id",
+    "ordered_date",
+    "ordered",
+    "user_email",
+    "user_first_name",
+    "user_last_name",
+    "address1",
+    "address2",
+    "comment",
+    "product_variation_id",
+    "product_id",
+    "product_title",
+    "category",
+    "amount",
+    "color_nickname",
+    "color_in_hex",
+    "lettering",
+    "total_price",
+)
+EXPORT_CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+# orders loaded per query, the lettering items of a chunk are loaded with one more query
+EXPORT_CHUNK_SIZE = 2000
+
+
+def filter_orders(queryset, date_from=None, date_to=None, ordered=None):
+    """Orders of the inclusive date range with the given ordered status, None disables a filter."""
+    if date_from is not None:
+        queryset = queryset.filter(ordered_date__gte=datetime.combine(date_from, time.min))
+    if date_to is not None:
+        queryset = queryset.filter(ordered_date__lt=datetime.combine(date_to + timedelta(days=1), time.min))
+    if ordered is not None:
+        queryset = queryset.filter(ordered=ordered)
+    return queryset
+
+
+def iter_export_rows(queryset):
+    """Yield one dict per order, reading the orders in chunks so memory use does not grow with the export."""
+    # the lookups of the admin changelist queryset are replaced by the ones the export reads
+    orders = (
+        queryset.select_related("product__product__category", "product__product_color")
+        .prefetch_related(None)
+        .prefetch_related(
+            Prefetch(
+                "product__lettering_item_variation_set",
+                queryset=LetteringItemVariation.objects.select_related("lettering_item_category").order_by("pk"),
+            )
+        )
+        .order_by("pk")
+    )
+    for order in orders.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        variation = order.product
+        product = variation.product if variation else None
+        color = variation.product_color if variation else None
+        lettering_items = variation.get_all_lettering_items() if variation else []
+        yield {
+            "order_id": order.id,
+            "ordered_date": order.ordered_date,
+            "ordered": order.ordered,
+            "user_email": order.user_email,
+            "user_first_name": order.user_first_name,
+            "user_last_name": order.user_last_name,
+            "address1": order.address1,
+            "address2": order.address2,
+            "comment": order.comment,
+            "product_variation_id": variation.id if variation else None,
+            "product_id": product.id if product else None,
+            "product_title": product.title if product else None,
+            "category": product.category.title if product else None,
+            "amount": variation.amount if variation else None,
+            "color_nickname": color.color_nickname if color else None,
+            "color_in_hex": color.color_in_hex if color else None,
+            "lettering": "; ".join(str(item) for item in lettering_items),
+            "total_price": variation.get_total_price() if product else None,
+        }
+
+
+class Echo:
+    """File-like object handing back what csv.writer writes, so each row can be yielded as it is written."""
+
+    def write(self, value):
+        return value
+
+
+def escape_formula(value):
+    # spreadsheets run cells starting with one of these as formulas, customer text could call out or
+    # read other cells when staff open the export
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_csv(rows):
+    writer = csv.DictWriter(Echo(), fieldnames=EXPORT_COLUMNS)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow({column: escape_formula(value) for column, value in row.items()})
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def stream_orders(queryset, export_format):
+    """StreamingHttpResponse with the orders of `queryset` as a csv or ndjson attachment."""
+    content = iter_csv if export_format == "csv" else iter_ndjson
+    response = StreamingHttpResponse(
+        content(iter_export_rows(queryset)), content_type=EXPORT_CONTENT_TYPES[export_format]
+    )
+    filename = f"orders-{datetime.now():%Y-%m-%d-%H%M%S}.{export_format}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,151 @@
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri
+from rest_framework.response import Response
+
+from .images import IMAGE_VARIANTS, variant_name
+from .models import Category, Product
+
+# building a ModelSerializer and calling to_representation on every field of every row dominates the
+# CPU time of the catalog lists. The functions below build the same JSON as CategorySerializer and
+# ProductSerializer from .values() rows, tests/test_fast_serializers.py checks the output byte for byte.
+CATEGORY_VALUES = (
+    "id",
+    "title",
+    "image",
+    "base_price",
+    "max_amount_of_lettering_items",
+    "height",
+    "width",
+    "sample_product_id",
+    "image_variants_ready",
+)
+PRODUCT_VALUES = ("id", "category_id", "title", "image", "detail_image", "is_uploaded", "image_variants_ready")
+
+
+class MediaUrls:
+    """Absolute urls of stored files, as ImageField(use_url=True) renders them for a request.
+
+    For the file system storage the absolute url of the media root is computed once and file
+    names are appended to it, other storages and unusual names go through storage.url().
+    """
+
+    def __init__(self, storage, request):
+        self.storage = storage
+        self.request = request
+        self.prefix = None
+        # __class__ instead of type() as the default storage is a lazy object wrapping the real storage
+        if storage.__class__.url is FileSystemStorage.url and storage.base_url and storage.base_url.endswith("/"):
+            self.prefix = self.absolute(storage.base_url)
+
+    def absolute(self, url):
+        return self.request.build_absolute_uri(url) if self.request is not None else url
+
+    def url(self, name):
+        if self.prefix is not None and not name.startswith(".") and "./" not in name:
+            # the same as urljoin(base_url, filepath_to_uri(name).lstrip("/")) for these names
+            return self.prefix + filepath_to_uri(name).lstrip("/")
+        return self.absolute(self.storage.url(name))
+
+    def file(self, name):
+        return self.url(name) if name else None
+
+    def variants(self, name, ready):
+        """Urls of the derivatives of `name`, or of the original while `ready`, the name they were made of, differs."""
+        if not name:
+            return None
+        if ready != name:
+            url = self.url(name)
+            return {variant: url for variant in IMAGE_VARIANTS}
+        return {variant: self.url(variant_name(name, variant)) for variant in IMAGE_VARIANTS}
+
+
+def category_urls(request):
+    return MediaUrls(Category._meta.get_field("image").storage, request)
+
+
+def serialize_category(row, urls):
+    return {
+        "title": row["title"],
+        "image": urls.file(row["image"]),
+        "base_price": float(row["base_price"]),
+        "max_amount_of_lettering_items": int(row["max_amount_of_lettering_items"]),
+        "height": float(row["height"]),
+        "width": float(row["width"]),
+        "sample_product_id": row["sample_product_id"],
+        "image_variants": urls.variants(row["image"], row["image_variants_ready"].get("image")),
+    }
+
+
+def serialize_categories(rows, request):
+    """CategorySerializer(many=True) data of rows of Category.objects.with_sample_product_id().values()."""
+    urls = category_urls(request)
+    return [serialize_category(row, urls) for row in rows]
+
+
+def product_category_rows(rows):
+    """Queryset of the category rows the product rows refer to."""
+    category_ids = {row["category_id"] for row in rows}
+    return Category.objects.with_sample_product_id().filter(pk__in=category_ids).values(*CATEGORY_VALUES)
+
+
+def serialize_products(rows, request, category_rows=None):
+    """ProductSerializer(many=True) data of rows of Product.objects.values(*PRODUCT_VALUES).
+
+    The categories of all rows are loaded with one query unless `category_rows` are passed in.
+    """
+    rows = list(rows)
+    if category_rows is None:
+        category_rows = product_category_rows(rows) if rows else []
+    urls = category_urls(request)
+    categories = {row["id"]: serialize_category(row, urls) for row in category_rows}
+
+    image_urls = MediaUrls(Product._meta.get_field("image").storage, request)
+    detail_image_urls = MediaUrls(Product._meta.get_field("detail_image").storage, request)
+    return [
+        {
+            "id": row["id"],
+            "category": categories[row["category_id"]],
+            "image": image_urls.file(row["image"]),
+            "detail_image": detail_image_urls.file(row["detail_image"]),
+            "image_variants": image_urls.variants(row["image"], row["image_variants_ready"].get("image")),
+            "detail_image_variants": detail_image_urls.variants(
+                row["detail_image"], row["image_variants_ready"].get("detail_image")
+            ),
+            "title": row["title"],
+            "is_uploaded": bool(row["is_uploaded"]),
+        }
+        for row in rows
+    ]
+
+
+async def aserialize_categories(rows, request):
+    return serialize_categories(rows, request)
+
+
+async def aserialize_products(rows, request):
+    """serialize_products() loading the categories with the async ORM."""
+    rows = list(rows)
+    category_rows = [row async for row in product_category_rows(rows)] if rows else []
+    return serialize_products(rows, request, category_rows)
+
+
+class ValuesListMixin:
+    """Serve a list view from `.values()` rows when CATALOG_FAST_SERIALIZATION is enabled.
+
+    `values_fields` selects the columns and `values_serializer` turns the rows of a page into the
+    data the view's serializer_class would produce.
+    """
+
+    values_fields = ()
+    values_serializer = None
+
+    def list(self, request, *args, **kwargs):
+        if not settings.CATALOG_FAST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None).values(*self.values_fields)
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(self.values_serializer(queryset, request))
+        return self.get_paginated_response(self.values_serializer(page, request))
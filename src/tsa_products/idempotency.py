@@ -0,0 +1,85 @@
+import functools
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+def request_fingerprint(request):
+    digest = hashlib.sha256()
+    for part in (request.method.encode(), request.get_full_path().encode(), request.body):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def idempotent(handler):
+    """Make a POST handler of an APIView replay its response to retries sent with the same Idempotency-Key.
+
+    The key is claimed with a row lock in the transaction the handler runs in, so a concurrent
+    duplicate waits for the first request and receives its response. Responses are kept for
+    IDEMPOTENCY_KEY_TTL seconds. Error responses and raised exceptions roll back the handler's
+    writes together with the key, so a corrected request or a retry can use the key again.
+    Requests without the header are handled as before.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(view, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return handler(view, request, *args, **kwargs)
+        if not key or len(key) > IdempotencyKey._meta.get_field("key").max_length:
+            return Response(
+                {"detail": f"The {IDEMPOTENCY_HEADER} header must be 1 to 255 characters long."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fingerprint = request_fingerprint(request)
+        now = timezone.now()
+        expires_at = now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+        with transaction.atomic():
+            # the unique constraint makes a concurrent insert of the same key wait for this transaction
+            record, created = IdempotencyKey.objects.select_for_update().get_or_create(
+                scope=request.resolver_match.view_name,
+                key=key,
+                defaults={"request_fingerprint": fingerprint, "expires_at": expires_at},
+            )
+            if not created and record.expires_at <= now:
+                record.request_fingerprint, record.expires_at, record.status_code = fingerprint, expires_at, None
+            elif not created:
+                if record.request_fingerprint != fingerprint:
+                    return Response(
+                        {"detail": f"The {IDEMPOTENCY_HEADER} was already used for a different request."},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                return Response(
+                    json.loads(record.response_body), status=record.status_code, headers={REPLAYED_HEADER: "true"}
+                )
+
+            response = handler(view, request, *args, **kwargs)
+            if response.status_code >= 400:
+                transaction.set_rollback(True)
+                return response
+            record.status_code = response.status_code
+            record.response_body = json.dumps(response.data, cls=DjangoJSONEncoder)
+            record.save()
+        return response
+
+    return wrapper
+
+
+def purge_expired_keys(now=None):
+    """Delete the expired idempotency keys, returns how many were deleted."""
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=now or timezone.now()).delete()
+    return deleted
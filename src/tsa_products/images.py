@@ -0,0 +1,102 @@
+import io
+import logging
+import posixpath
+
+from django.core.files.base import ContentFile
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# derivatives are stored next to the original as <dir>/variants/<name>_<variant>.<extension>
+IMAGE_VARIANTS = {
+    "thumbnail": {"size": (200, 200), "format": "JPEG", "extension": "jpg"},
+    "medium": {"size": (800, 800), "format": "JPEG", "extension": "jpg"},
+    "webp": {"size": (800, 800), "format": "WEBP", "extension": "webp"},
+}
+
+# image fields of each model that get derivatives
+IMAGE_VARIANT_FIELDS = {
+    "Category": ("image",),
+    "Product": ("image", "detail_image"),
+    "Comment": ("image",),
+}
+
+
+def variant_name(name, variant):
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, "variants", f"{stem}_{variant}.{IMAGE_VARIANTS[variant]['extension']}")
+
+
+def variant_urls(field_file):
+    """Return the url of every derivative of an image without touching the storage backend.
+
+    Until the derivatives of the current file exist, every variant is the url of the original.
+    """
+    if field_file.instance.image_variants_ready.get(field_file.field.name) != field_file.name:
+        return {variant: field_file.url for variant in IMAGE_VARIANTS}
+    return {variant: field_file.storage.url(variant_name(field_file.name, variant)) for variant in IMAGE_VARIANTS}
+
+
+def render_variant(image, variant):
+    options = IMAGE_VARIANTS[variant]
+    resized = image.copy()
+    resized.thumbnail(options["size"])
+    if options["format"] == "JPEG" and resized.mode != "RGB":
+        # jpeg has no alpha channel, flatten transparent logos onto white
+        rgba = resized.convert("RGBA")
+        resized = Image.new("RGB", rgba.size, "white")
+        resized.paste(rgba, mask=rgba.split()[-1])
+    content = io.BytesIO()
+    resized.save(content, format=options["format"], quality=85)
+    return ContentFile(content.getvalue())
+
+
+def generate_image_variants(field_file, force=False):
+    """Create the missing derivatives of an image.
+
+    Returns the number of files written, or None when the original is missing or cannot be read.
+    """
+    if not field_file:
+        return None
+    storage = field_file.storage
+    variants = [
+        variant for variant in IMAGE_VARIANTS if force or not storage.exists(variant_name(field_file.name, variant))
+    ]
+    if not variants:
+        return 0
+    if not storage.exists(field_file.name):
+        return None
+
+    with storage.open(field_file.name, "rb") as original:
+        try:
+            image = Image.open(original)
+            image.load()
+        except (OSError, Image.DecompressionBombError) as error:
+            # a broken or oversized image does not get better by trying again, storage errors are raised
+            logger.warning("could not generate image variants for %s: %s", field_file.name, error)
+            return None
+
+    for variant in variants:
+        name = variant_name(field_file.name, variant)
+        if storage.exists(name):
+            storage.delete(name)
+        storage.save(name, render_variant(image, variant))
+    return len(variants)
+
+
+def generate_instance_image_variants(instance, force=False):
+    """Create the derivatives of the images of `instance` and record which exist, returns the files written."""
+    generated = 0
+    ready = {}
+    for field_name in IMAGE_VARIANT_FIELDS.get(type(instance).__name__, ()):
+        field_file = getattr(instance, field_name)
+        written = generate_image_variants(field_file, force=force)
+        if written is not None:
+            generated += written
+            ready[field_name] = field_file.name
+    if ready != instance.image_variants_ready:
+        # the serializers expose the derivatives from now on, saving bumps the catalog version
+        instance.image_variants_ready = ready
+        instance.save(update_fields=["image_variants_ready"])
+    return generated
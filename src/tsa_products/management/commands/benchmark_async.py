@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from tsa_products.benchmarking import SCENARIOS, build_context, summarize, throwaway_database
+from tsa_products.cache import get_catalog_cache
+from tsa_products.seeding import seed_catalog, seed_orders
+from tsa_products.urls import URL_NAMESPACE
+
+# read-only routes of views.py, their async versions in async_views.py are named "async-<route>"
+ROUTES = [
+    "categories-api",
+    "lettering-item-categories-api",
+    "products-api",
+    "product-category-api",
+    "product-color-api",
+    "product-detail-api",
+    "truck-logo-list-api",
+    "retrieve-order-api",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the throughput of the sync DRF read views, called from a pool of threads like a threaded WSGI "
+        "worker does, with their async versions, called concurrently on one event loop like an ASGI worker does."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--products", type=int, default=500)
+        parser.add_argument("--orders", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=64, help="requests in flight at the same time")
+        parser.add_argument("--requests", type=int, default=512, help="measured requests per route and mode")
+        parser.add_argument("--cached", action="store_true", help="serve the catalog from the catalog cache")
+        parser.add_argument("routes", nargs="*", help=f"routes to measure, all of {', '.join(ROUTES)} by default")
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            catalog = seed_catalog(categories=options["categories"], products=options["products"])
+            seed_orders(
+                catalog["products"], catalog["colors"], catalog["lettering_categories"], orders=options["orders"]
+            )
+            context = build_context()
+            # a timeout of 0 stores nothing, so every catalog request is served from the database
+            timeout = {} if options["cached"] else {"CATALOG_CACHE_TIMEOUT": 0}
+            with override_settings(**timeout):
+                self.run(context, options)
+
+    def run(self, context, options):
+        concurrency = options["concurrency"]
+        # every worker sends the same number of requests
+        per_worker = max(options["requests"] // concurrency, 1)
+        self.stdout.write(f"{'route':<30} {'sync':>10} {'p95':>10} {'async':>10} {'p95':>10} {'speedup':>8}  identical")
+        for route in options["routes"] or ROUTES:
+            kwargs = SCENARIOS[route][0].kwargs(context)
+            sync_path = reverse(f"{URL_NAMESPACE}:{route}", kwargs=kwargs)
+            async_path = reverse(f"{URL_NAMESPACE}:async-{route}", kwargs=kwargs)
+
+            get_catalog_cache().clear()
+            sync_rate, sync_ms, sync_content = self.measure_sync(sync_path, concurrency, per_worker)
+            get_catalog_cache().clear()
+            async_rate, async_ms, async_content = asyncio.run(self.measure_async(async_path, concurrency, per_worker))
+            self.stdout.write(
+                f"{route:<30} {sync_rate:>8.1f}/s {summarize(sync_ms)['p95_ms']:>8.1f}ms "
+                f"{async_rate:>8.1f}/s {summarize(async_ms)['p95_ms']:>8.1f}ms {async_rate / sync_rate:>7.2f}x  "
+                f"{'yes' if async_content == sync_content else 'NO'}"
+            )
+        self.stdout.write(f"requests per second and p95 latency at {concurrency} concurrent requests")
+
+    def measure_sync(self, path, concurrency, per_worker):
+        """Requests per second, durations in ms and the last content of `concurrency` threads sending requests."""
+        durations_ms, contents = [], []
+
+        def worker():
+            client = Client()
+            try:
+                for _ in range(per_worker):
+                    started = time.perf_counter()
+                    response = client.get(path)
+                    durations_ms.append((time.perf_counter() - started) * 1000)
+                    contents.append(response.content)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return len(durations_ms) / (time.perf_counter() - started), durations_ms, contents[-1]
+
+    async def measure_async(self, path, concurrency, per_worker):
+        """Requests per second, durations in ms and the last content of `concurrency` concurrent tasks."""
+        durations_ms, contents = [], []
+        client = AsyncClient()
+
+        async def worker():
+            for _ in range(per_worker):
+                started = time.perf_counter()
+                response = await client.get(path)
+                durations_ms.append((time.perf_counter() - started) * 1000)
+                contents.append(response.content)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        rate = len(durations_ms) / (time.perf_counter() - started)
+        # the async ORM queries from a thread of its own, close its connections with it
+        await sync_to_async(connections.close_all)()
+        return rate, durations_ms, contents[-1]
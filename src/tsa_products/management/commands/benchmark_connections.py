@@ -0,0 +1,125 @@
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.urls import reverse
+
+from tsa_products.benchmarking import summarize, throwaway_database
+from tsa_products.cache import get_catalog_cache
+from tsa_products.models import Category
+from tsa_products.seeding import seed_catalog
+from tsa_products.urls import URL_NAMESPACE
+
+ROUTES = ["categories-api", "products-api", "product-category-api", "product-detail-api"]
+# name, CONN_MAX_AGE, CONN_HEALTH_CHECKS and whether a connection pool is used
+CONFIGURATIONS = [
+    ("new connection", 0, False, False),
+    ("persistent", 60, False, False),
+    ("persistent + health checks", 60, True, False),
+    ("pool", 0, False, True),
+]
+
+
+@contextmanager
+def connection_configuration(conn_max_age, health_checks, pool):
+    """Reconnect the default connection with other persistence settings for the duration of the block."""
+    saved = {key: connection.settings_dict[key] for key in ("CONN_MAX_AGE", "CONN_HEALTH_CHECKS", "OPTIONS")}
+    connection.close()
+    connection.settings_dict.update(CONN_MAX_AGE=conn_max_age, CONN_HEALTH_CHECKS=health_checks)
+    if pool:
+        connection.settings_dict["OPTIONS"] = {**saved["OPTIONS"], "pool": {"min_size": 1, "max_size": 2}}
+    try:
+        yield
+    finally:
+        connection.close()
+        if pool:
+            connection.close_pool()
+        connection.settings_dict.update(saved)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the latency of catalog requests that open a new database connection, reuse a persistent "
+        "connection, with and without health checks, and take one from a psycopg pool (PostgreSQL only)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=200)
+        parser.add_argument("--iterations", type=int, default=50, help="measured requests per route and setup")
+        parser.add_argument("--cached", action="store_true", help="serve the catalog from the catalog cache")
+        parser.add_argument(
+            "--in-place",
+            action="store_true",
+            help="measure the configured database instead of seeding a throwaway test database",
+        )
+
+    def handle(self, *args, **options):
+        if options["in_place"]:
+            self.run(options)
+            return
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == "sqlite":
+                # closing an in-memory SQLite database would drop it, so Django keeps it open
+                connection.settings_dict["TEST"]["NAME"] = str(Path(directory) / "benchmark.sqlite3")
+            with throwaway_database():
+                seed_catalog(products=options["products"])
+                self.run(options)
+
+    def run(self, options):
+        client = Client()
+        category = Category.objects.filter(title="Truck Sign").order_by("pk").first()
+        kwargs = {
+            "categories-api": {},
+            "products-api": {},
+            "product-category-api": {"id": category.id},
+            "product-detail-api": {"id": category.product_set.order_by("pk").first().id},
+        }
+        configurations = [
+            configuration
+            for configuration in CONFIGURATIONS
+            if not configuration[3] or connection.vendor == "postgresql"
+        ]
+        if len(configurations) < len(CONFIGURATIONS):
+            self.stdout.write(self.style.WARNING("connection pools need PostgreSQL, the pool is not measured"))
+
+        self.stdout.write(f"{'route':<22} {'setup':<28} {'mean':>10} {'p95':>10} {'connects':>9}")
+        for route in ROUTES:
+            path = reverse(f"{URL_NAMESPACE}:{route}", kwargs=kwargs[route])
+            for name, conn_max_age, health_checks, pool in configurations:
+                with connection_configuration(conn_max_age, health_checks, pool):
+                    durations_ms, connects = self.measure(client, path, options)
+                summary = summarize(durations_ms)
+                self.stdout.write(
+                    f"{route:<22} {name:<28} {summary['mean_ms']:>8.2f}ms {summary['p95_ms']:>8.2f}ms {connects:>9}"
+                )
+
+    def measure(self, client, path, options):
+        """Durations in ms of the requests to `path` and the number of connections they opened."""
+        connects = []
+
+        def count_connect(sender, connection, **kwargs):
+            connects.append(connection.alias)
+
+        # the test client disconnects close_old_connections from the request signals, call it like
+        # the WSGI and ASGI handlers do at the start and the end of every request
+        durations_ms = []
+        connection_created.connect(count_connect)
+        try:
+            for index in range(options["iterations"] + 1):
+                if not options["cached"]:
+                    get_catalog_cache().clear()
+                started = time.perf_counter()
+                close_old_connections()
+                client.get(path)
+                close_old_connections()
+                if index:
+                    # the first request opens the connection of the persistent setups
+                    durations_ms.append((time.perf_counter() - started) * 1000)
+        finally:
+            connection_created.disconnect(count_connect)
+        return durations_ms, len(connects)
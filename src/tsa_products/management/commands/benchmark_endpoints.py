@@ -0,0 +1,118 @@
+import json
+import tempfile
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from tsa_products import urls
+from tsa_products.benchmarking import benchmark_routes, find_regressions, git_commit, throwaway_database
+from tsa_products.cache import get_catalog_cache
+from tsa_products.seeding import seed_catalog, seed_comments, seed_orders
+from tsa_products.urls import URL_NAMESPACE
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database and measure latency percentiles, query counts and response sizes "
+        "of every route in tsa_products/urls.py."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--categories", type=int, default=5)
+        parser.add_argument("--products", type=int, default=200)
+        parser.add_argument("--colors", type=int, default=10)
+        parser.add_argument("--lettering-categories", type=int, default=6)
+        parser.add_argument("--orders", type=int, default=500)
+        parser.add_argument("--comments", type=int, default=200)
+        parser.add_argument("--iterations", type=int, default=20, help="measured requests per route")
+        parser.add_argument("--output", default="benchmark-results.json", help="file the results are written to")
+        parser.add_argument("--baseline", help="results of a previous run to compare against")
+        parser.add_argument(
+            "--max-query-increase", type=int, default=0, help="allowed query count increase over the baseline"
+        )
+        parser.add_argument(
+            "--max-p95-regression",
+            type=float,
+            help="allowed relative p95 increase over the baseline, e.g. 0.2 for 20%%",
+        )
+        parser.add_argument(
+            "--in-place",
+            action="store_true",
+            help="seed the configured database instead of a throwaway test database",
+        )
+
+    def handle(self, *args, **options):
+        dataset = {
+            key: options[key]
+            for key in ("categories", "products", "colors", "lettering_categories", "orders", "comments")
+        }
+        if options["in_place"]:
+            results = self.run(dataset, options["iterations"])
+        else:
+            with throwaway_database():
+                results = self.run(dataset, options["iterations"])
+
+        report = {
+            "meta": {
+                "created": datetime.now(timezone.utc).isoformat(),
+                "commit": git_commit(),
+                "database": connection.vendor,
+                "dataset": dataset,
+                "iterations": options["iterations"],
+            },
+            "routes": results,
+        }
+        with open(options["output"], "w") as output:
+            json.dump(report, output, indent=2)
+
+        for route, measurement in results.items():
+            self.stdout.write(
+                f"{route:<45} {measurement['status']} "
+                f"p50 {measurement['p50_ms']:>8.2f}ms p95 {measurement['p95_ms']:>8.2f}ms "
+                f"queries {measurement['cold_queries']:>3} cold {measurement['queries']:>3} warm "
+                f"{measurement['bytes']:>9} bytes"
+            )
+        self.stdout.write(self.style.SUCCESS(f"results written to {options['output']}"))
+
+        if options["baseline"]:
+            with open(options["baseline"]) as baseline_file:
+                baseline = json.load(baseline_file)["routes"]
+            regressions = find_regressions(
+                results, baseline, options["max_query_increase"], options["max_p95_regression"]
+            )
+            if regressions:
+                raise CommandError("performance regressions:\n" + "\n".join(regressions))
+
+    def run(self, dataset, iterations):
+        # uploads made by the benchmark must not end up in the real media storage, which is Cloudinary
+        # when it is configured
+        with (
+            tempfile.TemporaryDirectory(prefix="tsa-benchmark-") as media_root,
+            override_settings(
+                MEDIA_ROOT=media_root,
+                UPLOAD_SPOOL_ROOT=media_root,
+                STORAGES={
+                    **settings.STORAGES,
+                    "default": {
+                        "BACKEND": "django.core.files.storage.FileSystemStorage",
+                        "OPTIONS": {"location": media_root},
+                    },
+                },
+            ),
+        ):
+            catalog = seed_catalog(
+                categories=dataset["categories"],
+                products=dataset["products"],
+                colors=dataset["colors"],
+                lettering_categories=dataset["lettering_categories"],
+            )
+            seed_orders(
+                catalog["products"], catalog["colors"], catalog["lettering_categories"], orders=dataset["orders"]
+            )
+            seed_comments(dataset["comments"])
+            return benchmark_routes(
+                Client(), urls.urlpatterns, URL_NAMESPACE, iterations, clear_cache=get_catalog_cache().clear
+            )
@@ -0,0 +1,68 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from tsa_products.benchmarking import throwaway_database
+from tsa_products.models import Order, Product
+from tsa_products.parsers import FastJSONParser
+from tsa_products.renderers import FastJSONRenderer, orjson
+from tsa_products.seeding import seed_catalog, seed_orders
+from tsa_products.serializers import OrderSerializer, ProductSerializer
+
+
+def throughput(function, payload_size, iterations):
+    """Operations per second and MB per second of calling `function` `iterations` times."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    duration = time.perf_counter() - started
+    return iterations / duration, payload_size * iterations / duration / 1e6
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the encode and decode throughput of DRF's stdlib JSON renderer and parser with the orjson "
+        "based FastJSONRenderer and FastJSONParser on product and order list payloads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=500)
+        parser.add_argument("--orders", type=int, default=500)
+        parser.add_argument("--iterations", type=int, default=50)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed, both backends use the stdlib json module"))
+        with throwaway_database():
+            catalog = seed_catalog(products=options["products"])
+            seed_orders(
+                catalog["products"], catalog["colors"], catalog["lettering_categories"], orders=options["orders"]
+            )
+            context = {"request": RequestFactory().get("/")}
+            payloads = {
+                "products": ProductSerializer(Product.objects.with_category(), many=True, context=context).data,
+                "orders": OrderSerializer(Order.objects.with_related(), many=True, context=context).data,
+            }
+
+        self.stdout.write(f"{'payload':<10} {'operation':<8} {'size':>10} {'stdlib':>22} {'fast':>22} {'speedup':>8}")
+        for name, data in payloads.items():
+            body = JSONRenderer().render(data)
+            operations = {
+                "encode": (lambda: JSONRenderer().render(data), lambda: FastJSONRenderer().render(data)),
+                "decode": (
+                    lambda: JSONParser().parse(io.BytesIO(body)),
+                    lambda: FastJSONParser().parse(io.BytesIO(body)),
+                ),
+            }
+            for operation, (stdlib, fast) in operations.items():
+                stdlib_ops, stdlib_mb = throughput(stdlib, len(body), options["iterations"])
+                fast_ops, fast_mb = throughput(fast, len(body), options["iterations"])
+                self.stdout.write(
+                    f"{name:<10} {operation:<8} {len(body):>10} "
+                    f"{stdlib_ops:>8.1f}/s {stdlib_mb:>8.1f}MB/s {fast_ops:>8.1f}/s {fast_mb:>8.1f}MB/s "
+                    f"{fast_ops / stdlib_ops:>7.1f}x"
+                )
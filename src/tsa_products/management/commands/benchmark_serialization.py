@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from tsa_products.benchmarking import summarize, throwaway_database
+from tsa_products.cache import get_catalog_cache
+from tsa_products.models import Category
+from tsa_products.seeding import seed_catalog
+from tsa_products.urls import URL_NAMESPACE
+
+ROUTES = ["categories-api", "products-api", "product-category-api", "truck-logo-list-api"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the CPU time per request of the catalog lists serialized by the DRF serializers and by "
+        "the .values() fast path (CATALOG_FAST_SERIALIZATION) on a throwaway database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--products", type=int, default=1000)
+        parser.add_argument("--iterations", type=int, default=20, help="measured requests per route and path")
+        parser.add_argument(
+            "--in-place",
+            action="store_true",
+            help="measure the configured database instead of seeding a throwaway test database",
+        )
+
+    def handle(self, *args, **options):
+        if options["in_place"]:
+            self.run(options)
+            return
+        with throwaway_database():
+            seed_catalog(categories=options["categories"], products=options["products"])
+            self.run(options)
+
+    def run(self, options):
+        client = Client()
+        category = Category.objects.filter(title="Truck Sign").order_by("pk").first()
+        self.stdout.write(f"{'route':<24} {'serializers':>14} {'fast path':>14} {'saved':>7}  identical")
+        for route in ROUTES:
+            kwargs = {"id": category.id} if route == "product-category-api" else {}
+            path = reverse(f"{URL_NAMESPACE}:{route}", kwargs=kwargs)
+            serializers_ms, serializers_content = self.measure(client, path, False, options["iterations"])
+            fast_ms, fast_content = self.measure(client, path, True, options["iterations"])
+            serializers_mean = summarize(serializers_ms)["mean_ms"]
+            fast_mean = summarize(fast_ms)["mean_ms"]
+            saved = 1 - fast_mean / serializers_mean if serializers_mean else 0
+            self.stdout.write(
+                f"{route:<24} {serializers_mean:>10.2f}ms {fast_mean:>10.2f}ms {saved:>7.0%}  "
+                f"{'yes' if fast_content == serializers_content else 'NO'}"
+            )
+        self.stdout.write("mean CPU time per uncached request")
+
+    def measure(self, client, path, fast, iterations):
+        """CPU time in ms of `iterations` uncached requests and the content of the last response."""
+        durations_ms = []
+        with override_settings(CATALOG_FAST_SERIALIZATION=fast):
+            for _ in range(iterations + 1):
+                get_catalog_cache().clear()
+                started = time.process_time()
+                response = client.get(path)
+                durations_ms.append((time.process_time() - started) * 1000)
+        # the first request warms up imports and url resolving
+        return durations_ms[1:], response.content
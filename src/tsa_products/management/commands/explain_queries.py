@@ -0,0 +1,115 @@
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from tsa_products.models import (
+    Category,
+    ImageVariantTask,
+    LetteringItemCategory,
+    Order,
+    Product,
+    ProductVariation,
+    UploadTask,
+)
+from tsa_products.uploads import claimable_tasks
+from tsa_products.views import (
+    CategoryListView,
+    CommentsView,
+    LetteringItemCategoryListView,
+    LogoListView,
+    ProductColorListView,
+    ProductDetail,
+    ProductFromCategoryListView,
+    ProductListView,
+    ProductVariationRetrieveView,
+    RetrieveOrder,
+    UploadTaskRetrieveView,
+)
+
+# plan lines of a scan that reads the whole table
+FULL_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    "sqlite": re.compile(r"\bSCAN (\w+)$", re.MULTILINE),
+}
+
+
+def view_queryset(view_class, **kwargs):
+    view = view_class(kwargs=kwargs)
+    return view.get_queryset()
+
+
+def first_id(model):
+    return model.objects.order_by("pk").values_list("pk", flat=True).first() or 0
+
+
+def main_queries():
+    """The main query of each view and of the other hot lookups, as they are sent to the database."""
+    unpaginated_max_results = settings.API_UNPAGINATED_MAX_RESULTS
+    return {
+        "categories-api": view_queryset(CategoryListView).order_by("id")[:unpaginated_max_results],
+        "lettering-item-categories-api": view_queryset(LetteringItemCategoryListView).order_by("id")[
+            :unpaginated_max_results
+        ],
+        "products-api": view_queryset(ProductListView).order_by("id")[:unpaginated_max_results],
+        "product-category-api": view_queryset(ProductFromCategoryListView, id=first_id(Category)).order_by("id")[
+            :unpaginated_max_results
+        ],
+        "product-color-api": view_queryset(ProductColorListView).order_by("id")[:unpaginated_max_results],
+        "truck-logo-list-api": view_queryset(LogoListView).order_by("id")[:unpaginated_max_results],
+        "product-detail-api": view_queryset(ProductDetail).filter(id=first_id(Product)),
+        "product-variation-retrieve-api": view_queryset(ProductVariationRetrieveView).filter(
+            id=first_id(ProductVariation)
+        ),
+        "retrieve-order-api": view_queryset(RetrieveOrder).filter(id=first_id(Order)),
+        "comments-api": view_queryset(CommentsView).order_by("id")[:unpaginated_max_results],
+        "upload-task-api": view_queryset(UploadTaskRetrieveView).filter(id=first_id(UploadTask)),
+        "create-order-api lettering categories": LetteringItemCategory.objects.filter(
+            title__in=["Company Name", "VIN Number"]
+        ).order_by("pk"),
+        "upload-customer-image-api category": Category.objects.filter(title="Truck Sign"),
+        "admin order search": Order.objects.filter(user_email__icontains="example").order_by("-pk"),
+        "admin order dates": Order.objects.order_by("-ordered_date", "-pk")[:100],
+        "process_uploads claim": claimable_tasks(UploadTask, timezone.now())[:10],
+        "process_uploads image variant claim": claimable_tasks(ImageVariantTask, timezone.now())[:10],
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on the main query of every view and report full table scans. The planner prefers full "
+        "scans of small tables, so seed production-like volumes with generate_data before reading the plans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("names", nargs="*", help="only explain these queries, e.g. products-api")
+        parser.add_argument("--analyze", action="store_true", help="run the queries and show real timings")
+        parser.add_argument("--check", action="store_true", help="fail when a query scans a whole table")
+
+    def handle(self, *args, **options):
+        queries = main_queries()
+        unknown = set(options["names"]) - queries.keys()
+        if unknown:
+            raise CommandError(f"unknown queries: {', '.join(sorted(unknown))}")
+
+        explain_options = {"analyze": True} if options["analyze"] and connection.vendor == "postgresql" else {}
+        full_scan_pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        full_scans = []
+        for name, queryset in queries.items():
+            if options["names"] and name not in options["names"]:
+                continue
+            plan = queryset.explain(**explain_options)
+            self.stdout.write(self.style.MIGRATE_HEADING(name))
+            self.stdout.write(plan)
+            # listings of whole tables are expected to scan them, only filtered queries should use an index
+            filtered = bool(queryset.query.where)
+            scanned_tables = full_scan_pattern.findall(plan) if full_scan_pattern and filtered else []
+            for table in scanned_tables:
+                full_scans.append(f"{name}: full scan of {table}")
+                self.stdout.write(self.style.WARNING(f"full scan of {table}"))
+            self.stdout.write("")
+
+        if options["check"] and full_scans:
+            raise CommandError("queries scan whole tables:\n" + "\n".join(full_scans))
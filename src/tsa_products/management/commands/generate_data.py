@@ -0,0 +1,109 @@
+import multiprocessing
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from tsa_products.models import LetteringItemCategory, Product, ProductColor
+from tsa_products.seeding import seed_catalog, seed_comments, seed_orders
+
+
+def seed_orders_worker(orders, seed, batch_size, spread_days):
+    """Seed a share of the orders in a forked process with its own database connection."""
+    connections.close_all()
+    try:
+        return seed_orders(
+            list(Product.objects.order_by("pk")),
+            list(ProductColor.objects.order_by("pk")),
+            list(LetteringItemCategory.objects.order_by("pk")),
+            orders=orders,
+            seed=seed,
+            batch_size=batch_size,
+            spread_days=spread_days,
+        )
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate production-like volumes of catalog rows, orders with product variations and lettering items "
+        "and comments with batched bulk inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument("--products", type=int, default=5000)
+        parser.add_argument("--colors", type=int, default=30)
+        parser.add_argument("--lettering-categories", type=int, default=12)
+        parser.add_argument("--orders", type=int, default=200000)
+        parser.add_argument("--comments", type=int, default=5000)
+        parser.add_argument("--batch-size", type=int, default=2000, help="rows per bulk insert")
+        parser.add_argument("--workers", type=int, default=1, help="processes generating orders in parallel")
+        parser.add_argument("--spread-days", type=int, default=365, help="order dates are spread over these days")
+        parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        if workers < 1:
+            raise CommandError("--workers must be at least 1")
+        if workers > 1 and connection.vendor == "sqlite":
+            # sqlite allows one writer at a time, parallel workers would only wait for each other's locks
+            self.stdout.write(self.style.WARNING("sqlite serializes writes, generating orders in one process"))
+            workers = 1
+        if workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+            self.stdout.write(self.style.WARNING("parallel workers need the fork start method, using one process"))
+            workers = 1
+
+        if connection.vendor == "sqlite" and not connection.in_atomic_block:
+            with connection.cursor() as cursor:
+                # only affects this connection, skips the fsync after every committed batch
+                cursor.execute("PRAGMA synchronous = OFF")
+
+        started = time.perf_counter()
+        catalog = seed_catalog(
+            categories=options["categories"],
+            products=options["products"],
+            colors=options["colors"],
+            lettering_categories=options["lettering_categories"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+        )
+        seed_comments(options["comments"], seed=options["seed"], batch_size=options["batch_size"])
+        self.stdout.write(f"catalog and comments generated in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        if workers == 1:
+            orders = seed_orders(
+                catalog["products"],
+                catalog["colors"],
+                catalog["lettering_categories"],
+                orders=options["orders"],
+                seed=options["seed"],
+                batch_size=options["batch_size"],
+                spread_days=options["spread_days"],
+            )
+        else:
+            orders = self.seed_orders_in_parallel(workers, options)
+        duration = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(f"generated {orders} orders in {duration:.1f}s ({orders / max(duration, 1e-9):.0f}/s)")
+        )
+
+    def seed_orders_in_parallel(self, workers, options):
+        share, remainder = divmod(options["orders"], workers)
+        jobs = [
+            (
+                share + (1 if worker < remainder else 0),
+                options["seed"] + worker,
+                options["batch_size"],
+                options["spread_days"],
+            )
+            for worker in range(workers)
+        ]
+
+        # forked children must not share the parent's open database connection
+        connections.close_all()
+        with multiprocessing.get_context("fork").Pool(workers) as pool:
+            return sum(pool.starmap(seed_orders_worker, jobs))
@@ -0,0 +1,33 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from tsa_products.images import generate_instance_image_variants
+from tsa_products.models import Category, Comment, Product
+
+logger = logging.getLogger(__name__)
+
+MODELS = {"category": Category, "product": Product, "comment": Comment}
+
+
+class Command(BaseCommand):
+    help = "Create the thumbnail, medium and webp derivatives of existing category, product and comment images."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=MODELS, action="append", help="limit to these models, may repeat")
+        parser.add_argument("--force", action="store_true", help="recreate derivatives that already exist")
+
+    def handle(self, *args, **options):
+        for model_name in options["model"] or MODELS:
+            model = MODELS[model_name]
+            generated = failed = 0
+            for instance in model.objects.order_by("pk").iterator():
+                try:
+                    generated += generate_instance_image_variants(instance, force=options["force"])
+                except Exception:
+                    # keep going, the failed instances can be retried by running the command again
+                    logger.exception("could not generate image variants for %s %s", model_name, instance.pk)
+                    failed += 1
+            self.stdout.write(
+                self.style.SUCCESS(f"{model_name}: generated {generated} image variants, {failed} instances failed")
+            )
@@ -0,0 +1,110 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tsa_products.benchmarking import git_commit
+
+# "import time:       self [us] |  cumulative | imported package", nested imports are indented.
+# Modules loaded with importlib.import_module, like the settings and the apps and models Django sets
+# up, are not listed, their time is part of the self time of the module setting up Django.
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def parse_import_times(output):
+    """Self and cumulative import time in ms and the nesting depth of every module in `-X importtime` output."""
+    modules = {}
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules[module] = {
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            }
+    return modules
+
+
+def profile_imports(target):
+    """Import `target` in a fresh interpreter, returns the import times of its modules and the wall time in ms."""
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        cwd=settings.BASE_DIR,
+        env=env,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if process.returncode:
+        raise CommandError(f"importing {target} failed:\n{process.stderr[-2000:]}")
+    return parse_import_times(process.stderr), wall_ms
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the import time of a worker's cold start per module, measured with python -X importtime in a "
+        "fresh interpreter, and compare the total with a previous run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target", default="tsa_app.wsgi", help="module to import, tsa_app.wsgi sets up Django like a worker"
+        )
+        parser.add_argument("--runs", type=int, default=3, help="the fastest of these runs is reported")
+        parser.add_argument("--limit", type=int, default=25, help="number of modules listed")
+        parser.add_argument("--sort", choices=["cumulative", "self"], default="cumulative")
+        parser.add_argument("--output", help="file the results are written to")
+        parser.add_argument("--baseline", help="results of a previous run to compare against")
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.2,
+            help="allowed relative increase of the total import time over the baseline, e.g. 0.2 for 20%%",
+        )
+
+    def handle(self, *args, **options):
+        runs = [profile_imports(options["target"]) for _ in range(options["runs"])]
+        modules, wall_ms = min(runs, key=lambda run: sum(module["self_ms"] for module in run[0].values()))
+        total_ms = sum(module["self_ms"] for module in modules.values())
+
+        key = f"{options['sort']}_ms"
+        self.stdout.write(f"{'module':<60} {'self':>10} {'cumulative':>12}")
+        for name, module in sorted(modules.items(), key=lambda item: item[1][key], reverse=True)[: options["limit"]]:
+            self.stdout.write(f"{name:<60} {module['self_ms']:>8.1f}ms {module['cumulative_ms']:>10.1f}ms")
+        self.stdout.write(
+            f"importing {options['target']} loaded {len(modules)} modules in {total_ms:.1f}ms, "
+            f"the process ran {wall_ms:.1f}ms"
+        )
+
+        if options["output"]:
+            report = {
+                "meta": {
+                    "created": datetime.now(timezone.utc).isoformat(),
+                    "commit": git_commit(),
+                    "target": options["target"],
+                },
+                "total_ms": round(total_ms, 3),
+                "wall_ms": round(wall_ms, 3),
+                "modules": modules,
+            }
+            with open(options["output"], "w") as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"results written to {options['output']}"))
+
+        if options["baseline"]:
+            with open(options["baseline"]) as baseline_file:
+                baseline = json.load(baseline_file)
+            added = sorted(set(modules) - set(baseline["modules"]))
+            if added:
+                self.stdout.write(f"modules not imported by the baseline: {', '.join(added)}")
+            if total_ms > baseline["total_ms"] * (1 + options["max_regression"]):
+                raise CommandError(f"import time regression: {baseline['total_ms']:.1f}ms -> {total_ms:.1f}ms")
@@ -0,0 +1,46 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tsa_products.uploads import process_pending_image_variants, process_pending_uploads
+
+
+class Command(BaseCommand):
+    help = (
+        "Move queued image uploads from the local spool to the media storage and create the derivatives of "
+        "saved images."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="process the pending uploads once and exit")
+        parser.add_argument("--batch-size", type=int, default=10, help="tasks claimed per iteration")
+        parser.add_argument("--sleep", type=float, default=2.0, help="seconds to wait when the queue is empty")
+        parser.add_argument("--max-attempts", type=int, default=settings.UPLOAD_TASK_MAX_ATTEMPTS)
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=900,
+            help="seconds after which a task stuck in processing is claimed again",
+        )
+
+    def handle(self, *args, **options):
+        stale_after = timedelta(seconds=options["stale_after"])
+        while True:
+            results = process_pending_uploads(options["batch_size"], options["max_attempts"], stale_after)
+            if results:
+                self.stdout.write(f"processed {results.count(True)} uploads, {results.count(False)} failed")
+            # after the uploads, their derivatives are queued when they are moved to the product or comment
+            variant_results = process_pending_image_variants(
+                options["batch_size"], options["max_attempts"], stale_after
+            )
+            if variant_results:
+                self.stdout.write(
+                    f"created the image variants of {variant_results.count(True)} instances, "
+                    f"{variant_results.count(False)} failed"
+                )
+            if options["once"]:
+                break
+            if not results and not variant_results:
+                time.sleep(options["sleep"])
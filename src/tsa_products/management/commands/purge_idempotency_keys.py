@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from tsa_products.idempotency import purge_expired_keys
+
+
+class Command(BaseCommand):
+    help = "Delete the stored responses of idempotency keys older than IDEMPOTENCY_KEY_TTL."
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"deleted {purge_expired_keys()} expired idempotency keys")
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from tsa_products.models import ProductVariation
+
+
+class Command(BaseCommand):
+    help = "Recalculate the stored total price and price breakdown of product variations from the current prices."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="variations loaded and updated per batch")
+        parser.add_argument(
+            "--only-unpriced", action="store_true", help="only price variations without a stored total price"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        variations = ProductVariation.objects.with_related().filter(product__isnull=False).order_by("pk")
+        if options["only_unpriced"]:
+            variations = variations.filter(total_price__isnull=True)
+
+        repriced = 0
+        batch = []
+        for variation in variations.iterator(chunk_size=batch_size):
+            variation.reprice()
+            batch.append(variation)
+            if len(batch) >= batch_size:
+                repriced += self.save_batch(batch)
+                batch = []
+        repriced += self.save_batch(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"repriced {repriced} product variations"))
+
+    def save_batch(self, batch):
+        with transaction.atomic():
+            ProductVariation.objects.bulk_update(batch, ["total_price", "price_breakdown"])
+        return len(batch)
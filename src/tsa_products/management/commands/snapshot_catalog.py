@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tsa_products.snapshot import write_catalog_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the JSON of the catalog lists to content hashed files and point the manifest.json of the "
+        "snapshot at them, so a front proxy can serve the catalog without Django."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--root", default=settings.CATALOG_SNAPSHOT_ROOT, help="directory of the snapshot")
+        parser.add_argument(
+            "--base-url", default=settings.CATALOG_SNAPSHOT_BASE_URL, help="public url of the api, used in image urls"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            manifest = write_catalog_snapshot(options["root"], options["base_url"])
+        except RuntimeError as error:
+            raise CommandError(error)
+        for path, file in manifest["files"].items():
+            self.stdout.write(f"{path:<50} {file}")
+        self.stdout.write(self.style.SUCCESS(f"catalog version {manifest['version']} written to {options['root']}"))
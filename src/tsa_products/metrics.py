@@ -0,0 +1,69 @@
+import hmac
+import os
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# with PROMETHEUS_MULTIPROC_DIR set every gunicorn worker writes its samples to memory mapped
+# files in that directory and /metrics aggregates the files of all workers
+REQUESTS = Counter("tsa_http_requests", "HTTP requests by url name", ["method", "view", "status"])
+REQUEST_LATENCY = Histogram("tsa_http_request_duration_seconds", "HTTP request latency by url name", ["view"])
+REQUEST_QUERIES = Histogram(
+    "tsa_http_request_db_queries",
+    "SQL queries per HTTP request by url name",
+    ["view"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200, float("inf")),
+)
+CACHE_REQUESTS = Counter("tsa_cache_requests", "Cache lookups by cache and result (hit or miss)", ["cache", "result"])
+UPLOAD_SIZE = Histogram(
+    "tsa_upload_size_bytes",
+    "Size of uploaded files by url name",
+    ["view"],
+    buckets=(10_000, 100_000, 500_000, 1_000_000, 2_500_000, 5_000_000, 10_000_000, 25_000_000, float("inf")),
+)
+
+
+def view_label(request):
+    """The url name of the requested route, which keeps the label cardinality bounded."""
+    resolver_match = getattr(request, "resolver_match", None)
+    if resolver_match is None or not resolver_match.url_name:
+        return "unmatched"
+    return resolver_match.url_name
+
+
+def record_cache_lookup(cache, hit):
+    CACHE_REQUESTS.labels(cache=cache, result="hit" if hit else "miss").inc()
+
+
+def record_upload_sizes(request):
+    for uploaded_file in request.FILES.values():
+        UPLOAD_SIZE.labels(view=view_label(request)).observe(uploaded_file.size)
+
+
+def get_registry():
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """Expose the metrics of all worker processes in the Prometheus text format."""
+    if not settings.METRICS_TOKEN and settings.MODE == "prod":
+        # per-view traffic and latency are not public, production serves them only with a token
+        raise Http404
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+            return HttpResponse(status=403)
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
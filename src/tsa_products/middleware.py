@@ -0,0 +1,179 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from .metrics import REQUEST_LATENCY, REQUEST_QUERIES, REQUESTS, view_label
+
+logger = logging.getLogger("tsa_products.timing")
+
+
+class QueryTimer:
+    """Database execute wrapper counting the queries of a request and summing up their duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+class RequestTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view_started = None
+        self.view_finished = None
+        self.render_finished = None
+        self.queries = QueryTimer()
+        self.exit_stack = ExitStack()
+
+    def measurements(self, finished):
+        """Durations in seconds of the instrumented phases of a request."""
+        view = (self.view_finished or finished) - self.view_started
+        return {
+            "total": finished - self.started,
+            "view": view,
+            "db": self.queries.duration,
+            # the time of the view outside SQL queries: permissions, parsing, building querysets,
+            # serializing and whatever else the view does in python
+            "app": max(view - self.queries.duration, 0.0),
+            "render": self.render_finished - self.view_finished if self.render_finished else 0.0,
+        }
+
+
+def server_timing_header(measurements, queries):
+    metrics = []
+    for name, duration in measurements.items():
+        description = f';desc="{queries} queries"' if name == "db" else ""
+        metrics.append(f"{name};dur={duration * 1000:.3f}{description}")
+    return ", ".join(metrics)
+
+
+class RequestTimingMiddleware:
+    """Measure where the time of a request goes and report it in a Server-Timing header and a log line.
+
+    Reports the number and duration of SQL queries, the time spent in the view and the part of it
+    spent outside of SQL queries, and the time rendering the response. A share of
+    REQUEST_TIMING_SAMPLE_RATE requests is measured, limited to the url names in
+    REQUEST_TIMING_VIEWS when that list is not empty.
+
+    Only requests served through WSGI are measured. The async views run their queries in a worker
+    thread whose connections do not carry the execute wrapper installed here, so ASGI requests
+    are passed through untouched.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.REQUEST_TIMING_SAMPLE_RATE
+        self.views = frozenset(settings.REQUEST_TIMING_VIEWS)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.get_response(request)
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        request._request_timing = timing = RequestTiming()
+        try:
+            response = self.get_response(request)
+        finally:
+            timing.exit_stack.close()
+        if timing.view_started is None:
+            # the request did not reach an allowed view
+            return response
+
+        measurements = timing.measurements(time.perf_counter())
+        response["Server-Timing"] = server_timing_header(measurements, timing.queries.count)
+        logger.info(
+            json.dumps(
+                {
+                    "method": request.method,
+                    "path": request.path,
+                    "view": request.resolver_match.view_name,
+                    "status": response.status_code,
+                    "queries": timing.queries.count,
+                    **{f"{name}_ms": round(duration * 1000, 3) for name, duration in measurements.items()},
+                }
+            )
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = getattr(request, "_request_timing", None)
+        if timing is None or (self.views and request.resolver_match.url_name not in self.views):
+            return None
+        for connection in connections.all():
+            timing.exit_stack.enter_context(connection.execute_wrapper(timing.queries))
+        timing.view_started = time.perf_counter()
+        return None
+
+    def process_template_response(self, request, response):
+        timing = getattr(request, "_request_timing", None)
+        if timing is None or timing.view_started is None:
+            return response
+        timing.view_finished = time.perf_counter()
+
+        def render_finished(response):
+            timing.render_finished = time.perf_counter()
+
+        response.add_post_render_callback(render_finished)
+        return response
+
+
+class MetricsMiddleware:
+    """Record the count, latency and number of SQL queries of every request, labelled by url name.
+
+    Under ASGI the queries run in worker threads with their own connections, so only the count
+    and latency of async requests are recorded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        queries = QueryTimer()
+        started = time.perf_counter()
+        with ExitStack() as exit_stack:
+            for connection in connections.all():
+                exit_stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - started, queries)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.record(request, response, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, duration, queries=None):
+        view = view_label(request)
+        REQUESTS.labels(method=request.method, view=view, status=response.status_code).inc()
+        REQUEST_LATENCY.labels(view=view).observe(duration)
+        if queries is not None:
+            REQUEST_QUERIES.labels(view=view).observe(queries.count)
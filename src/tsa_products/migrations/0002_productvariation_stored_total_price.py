@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tsa_products", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productvariation",
+            name="price_breakdown",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name="productvariation",
+            name="total_price",
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.8 on 2026-10-18 13:58
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+
+class AddIndexConcurrentlyOnPostgreSQL(AddIndexConcurrently):
+    """AddIndexConcurrently that leaves the other databases, e.g. SQLite in development, untouched."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY builds the trigram index without locking the order table for writes,
+    # it cannot run in a transaction
+    atomic = False
+
+    dependencies = [
+        ("tsa_products", "0003_uploadtask"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="category",
+            index=models.Index(fields=["title"], name="category_title_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(condition=models.Q(("visible", True)), fields=["id"], name="comment_visible_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="letteringitemcategory",
+            index=models.Index(fields=["title"], name="lettering_category_title_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["ordered_date"], name="order_ordered_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["user_email"], name="order_user_email_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(fields=["category", "id"], name="product_category_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                condition=models.Q(("is_uploaded", False)), fields=["category", "id"], name="product_catalog_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="uploadtask",
+            index=models.Index(
+                condition=models.Q(("status__in", ["pending", "processing"])),
+                fields=["id"],
+                name="uploadtask_open_idx",
+            ),
+        ),
+        # the admin searches user_email with icontains, i.e. UPPER(user_email) LIKE '%...%', which only
+        # a trigram index can serve. Other databases scan the table for this search. Creating the pg_trgm
+        # extension takes a role allowed to, if the role of the app is not, a superuser must run
+        # CREATE EXTENSION pg_trgm before migrating. The index is PostgreSQL only, so it is kept out of
+        # the model state.
+        TrigramExtension(),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                AddIndexConcurrentlyOnPostgreSQL(
+                    model_name="order",
+                    index=GinIndex(OpClass(Upper("user_email"), name="gin_trgm_ops"), name="order_user_email_trgm_idx"),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:10
+
+from django.db import migrations
+from django.db.models import Prefetch
+
+BATCH_SIZE = 500
+
+
+def backfill_total_price(apps, schema_editor):
+    # the stored prices of 0002 are only written for new orders, price the existing variations from the
+    # current catalog prices like ProductVariation.calculate_price does. Historical models do not have
+    # the model methods, so the calculation is repeated here.
+    ProductVariation = apps.get_model("tsa_products", "ProductVariation")
+    LetteringItemVariation = apps.get_model("tsa_products", "LetteringItemVariation")
+    variations = (
+        ProductVariation.objects.filter(product__isnull=False, total_price__isnull=True)
+        .select_related("product__category")
+        .prefetch_related(
+            Prefetch(
+                "lettering_item_variation_set",
+                queryset=LetteringItemVariation.objects.filter(lettering_item_category__isnull=False).select_related(
+                    "lettering_item_category"
+                ),
+            )
+        )
+        .order_by("pk")
+    )
+
+    batch = []
+    for variation in variations.iterator(chunk_size=BATCH_SIZE):
+        category = variation.product.category
+        price = category.base_price
+        lines = [{"title": category.title, "price": category.base_price}]
+        for item in variation.lettering_item_variation_set.all():
+            price += item.lettering_item_category.price
+            lines.append(
+                {
+                    "title": item.lettering_item_category.title,
+                    "lettering": item.lettering,
+                    "price": item.lettering_item_category.price,
+                }
+            )
+        variation.total_price = price * variation.amount
+        variation.price_breakdown = {"lines": lines, "unit_price": price, "amount": variation.amount}
+        batch.append(variation)
+        if len(batch) >= BATCH_SIZE:
+            ProductVariation.objects.bulk_update(batch, ["total_price", "price_breakdown"])
+            batch = []
+    ProductVariation.objects.bulk_update(batch, ["total_price", "price_breakdown"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tsa_products", "0006_imagevarianttask"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_total_price, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 14:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tsa_products", "0007_backfill_total_price"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="image_variants_ready",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="image_variants_ready",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="image_variants_ready",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
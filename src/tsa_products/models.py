@@ -1,12 +1,37 @@
 from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models import DEFERRED, OuterRef, Prefetch, Q, Subquery
 
 COLOR_VALIDATOR = RegexValidator(r"^#(?:[0-9a-fA-F]{3}){1,2}$", "only valid hex color code is accepted")
 
 # Create your models here.
 
 
-class Category(models.Model):
+class LoadedImagesMixin:
+    """Remember the names of the images an instance was loaded with in `_loaded_images`.
+
+    The post_save handler queueing image variants compares them with the saved names, so only
+    changed images get new derivatives.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        image_fields = {field.attname for field in cls._meta.concrete_fields if isinstance(field, models.ImageField)}
+        instance._loaded_images = {
+            name: value for name, value in zip(field_names, values) if name in image_fields and value is not DEFERRED
+        }
+        return instance
+
+
+class CategoryQuerySet(models.QuerySet):
+    def with_sample_product_id(self):
+        """Annotate each category with the id of its first product in a single query."""
+        sample_products = Product.objects.filter(category=OuterRef("pk")).order_by("pk").values("pk")[:1]
+        return self.annotate(sample_product_id=Subquery(sample_products))
+
+
+class Category(LoadedImagesMixin, models.Model):
     title = models.CharField(max_length=256)
     image = models.ImageField(upload_to="uploads/categories/")
     base_price = models.FloatField(default=0.0)
@@ -14,9 +39,15 @@ class Category(models.Model):
     max_amount_of_lettering_items = models.IntegerField(default=-1)
     height = models.FloatField(default=0.0)
     width = models.FloatField(default=0.0)
+    # name of each image field's file whose derivatives the upload worker has created
+    image_variants_ready = models.JSONField(default=dict, blank=True, editable=False)
+
+    objects = CategoryQuerySet.as_manager()
 
     class Meta:
         verbose_name_plural = "categories"
+        # categories are looked up by title, e.g. "Truck Sign" for logos and customer images
+        indexes = [models.Index(fields=["title"], name="category_title_idx")]
 
     def __str__(self):
         return self.title
@@ -29,6 +60,8 @@ class LetteringItemCategory(models.Model):
 
     class Meta:
         verbose_name_plural = "lettering item categories"
+        # orders resolve their lettering items by category title
+        indexes = [models.Index(fields=["title"], name="lettering_category_title_idx")]
 
     def __str__(self):
         return self.title
@@ -42,33 +75,87 @@ class ProductColor(models.Model):
         return self.color_nickname
 
 
-class Product(models.Model):
+class ProductQuerySet(models.QuerySet):
+    def with_category(self):
+        """Load the (annotated) categories of all products with one extra query."""
+        return self.prefetch_related(Prefetch("category", queryset=Category.objects.with_sample_product_id()))
+
+
+class Product(LoadedImagesMixin, models.Model):
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
     title = models.CharField(max_length=256)
     image = models.ImageField(upload_to="uploads/products/", blank=True)
     detail_image = models.ImageField(upload_to="uploads/products_detail", blank=True)
     is_uploaded = models.BooleanField(default=False)
+    # name of each image field's file whose derivatives the upload worker has created
+    image_variants_ready = models.JSONField(default=dict, blank=True, editable=False)
+
+    objects = ProductQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # products of a category in id order, as the paginated category listing reads them
+            models.Index(fields=["category", "id"], name="product_category_id_idx"),
+            # logo listing: products of a category that are not customer uploads
+            models.Index(fields=["category", "id"], condition=Q(is_uploaded=False), name="product_catalog_idx"),
+        ]
 
     def __str__(self):
         return self.title + " - " + self.category.title
 
 
+class ProductVariationQuerySet(models.QuerySet):
+    def with_related(self):
+        """Load the product, category, colour and lettering items needed to serialize and price variations."""
+        return self.select_related("product", "product_color").prefetch_related(
+            Prefetch("product__category", queryset=Category.objects.with_sample_product_id()),
+            Prefetch(
+                "lettering_item_variation_set",
+                queryset=LetteringItemVariation.objects.select_related("lettering_item_category"),
+            ),
+        )
+
+
 class ProductVariation(models.Model):
 
     product = models.ForeignKey(Product, on_delete=models.SET_NULL, null=True)
     product_color = models.ForeignKey(ProductColor, on_delete=models.SET_NULL, null=True, blank=True)
     amount = models.IntegerField(default=1)
+    # stored when the order is created, refreshed by the reprice_orders command
+    total_price = models.FloatField(null=True, blank=True)
+    price_breakdown = models.JSONField(default=dict, blank=True)
+
+    objects = ProductVariationQuerySet.as_manager()
 
     def get_all_lettering_items(self):
         return self.lettering_item_variation_set.all()
 
-    def get_total_price(self):
-        items = self.get_all_lettering_items()
-        price = self.product.category.base_price
-        for item in items:
+    def calculate_price(self, lettering_items=None):
+        """Return the total price and its per-line breakdown from the current catalog prices."""
+        if lettering_items is None:
+            lettering_items = self.get_all_lettering_items()
+        category = self.product.category
+        price = category.base_price
+        lines = [{"title": category.title, "price": category.base_price}]
+        for item in lettering_items:
             price += item.lettering_item_category.price
-        price = price * self.amount
-        return price
+            lines.append(
+                {
+                    "title": item.lettering_item_category.title,
+                    "lettering": item.lettering,
+                    "price": item.lettering_item_category.price,
+                }
+            )
+        breakdown = {"lines": lines, "unit_price": price, "amount": self.amount}
+        return price * self.amount, breakdown
+
+    def reprice(self, lettering_items=None):
+        self.total_price, self.price_breakdown = self.calculate_price(lettering_items)
+
+    def get_total_price(self):
+        if self.total_price is None:
+            return self.calculate_price()[0]
+        return self.total_price
 
     def __str__(self):
         try:
@@ -101,6 +188,18 @@ class Payment(models.Model):
         return self.user_email + " - " + self.timestamp.strftime("%b. %-d, %Y, %-I:%M %p")
 
 
+class OrderQuerySet(models.QuerySet):
+    def with_related(self):
+        """Load the whole product variation graph and payment needed to serialize and price orders."""
+        return self.select_related("product__product", "product__product_color", "payment").prefetch_related(
+            Prefetch("product__product__category", queryset=Category.objects.with_sample_product_id()),
+            Prefetch(
+                "product__lettering_item_variation_set",
+                queryset=LetteringItemVariation.objects.select_related("lettering_item_category"),
+            ),
+        )
+
+
 class Order(models.Model):
     ordered_date = models.DateTimeField(auto_now_add=True, blank=True, null=True)
     user_email = models.CharField(max_length=256)
@@ -114,6 +213,15 @@ class Order(models.Model):
     comment = models.TextField(blank=True)
     payment = models.ForeignKey(Payment, on_delete=models.SET_NULL, null=True, blank=True)
 
+    objects = OrderQuerySet.as_manager()
+
+    class Meta:
+        # the admin sorts orders by date and looks customers up by email
+        indexes = [
+            models.Index(fields=["ordered_date"], name="order_ordered_date_idx"),
+            models.Index(fields=["user_email"], name="order_user_email_idx"),
+        ]
+
     def __str__(self):
         return self.user_email + "-" + self.ordered_date.strftime("%b. %-d, %Y, %-I:%M %p")
 
@@ -121,11 +229,94 @@ class Order(models.Model):
         return self.product.get_total_price()
 
 
-class Comment(models.Model):
+class Comment(LoadedImagesMixin, models.Model):
     user_email = models.CharField(max_length=256)
     image = models.ImageField(upload_to="uploads/comments/")
     text = models.TextField(blank=True)
     visible = models.BooleanField(default=False)
+    # name of each image field's file whose derivatives the upload worker has created
+    image_variants_ready = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        # only the few visible comments are listed
+        indexes = [models.Index(fields=["id"], condition=Q(visible=True), name="comment_visible_idx")]
 
     def __str__(self):
         return self.user_email
+
+
+class UploadTask(models.Model):
+    """An uploaded image waiting in the local spool to be moved to the media storage by process_uploads."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        PROCESSING = "processing"
+        DONE = "done"
+        FAILED = "failed"
+
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, null=True, blank=True)
+    comment = models.ForeignKey(Comment, on_delete=models.CASCADE, null=True, blank=True)
+    # file name inside UPLOAD_SPOOL_ROOT
+    spooled_file = models.CharField(max_length=1024)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # workers claim the oldest open tasks, done and failed tasks pile up and are never read by them
+        indexes = [
+            models.Index(fields=["id"], condition=Q(status__in=["pending", "processing"]), name="uploadtask_open_idx")
+        ]
+
+    def __str__(self):
+        return self.spooled_file + " - " + self.status
+
+
+class ImageVariantTask(models.Model):
+    """A saved category, product or comment image whose derivatives process_uploads creates in the background."""
+
+    # class name of the model, one of images.IMAGE_VARIANT_FIELDS
+    model_name = models.CharField(max_length=32)
+    object_id = models.IntegerField()
+    status = models.CharField(max_length=16, choices=UploadTask.Status.choices, default=UploadTask.Status.PENDING)
+    attempts = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # claimed like the upload tasks
+        indexes = [
+            models.Index(
+                fields=["id"], condition=Q(status__in=["pending", "processing"]), name="imagevarianttask_open_idx"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.model_name} {self.object_id} - {self.status}"
+
+
+class IdempotencyKey(models.Model):
+    """The response to a request sent with an Idempotency-Key header, replayed to retries of the request."""
+
+    # the url name of the view, keys of different endpoints do not collide
+    scope = models.CharField(max_length=128)
+    key = models.CharField(max_length=255)
+    # sha256 of the method, path and body, a key reused for another request is rejected
+    request_fingerprint = models.CharField(max_length=64)
+    # empty until the response is stored, which happens in the transaction that created the row
+    status_code = models.PositiveSmallIntegerField(null=True)
+    # the response data as JSON text, which keeps the order of its keys
+    response_body = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["scope", "key"], name="idempotency_scope_key_unique")]
+        # purge_idempotency_keys deletes the expired keys
+        indexes = [models.Index(fields=["expires_at"], name="idempotency_expires_at_idx")]
+
+    def __str__(self):
+        return self.scope + " - " + self.key
@@ -0,0 +1,91 @@
+from django.db import transaction
+
+from .models import LetteringItemCategory, LetteringItemVariation, Order, Product, ProductColor, ProductVariation
+
+
+class PreparedOrder:
+    """Unsaved rows of one order, built from a validated OrderCreateSerializer item."""
+
+    def __init__(self, product_variation, lettering_item_variations, order):
+        self.product_variation = product_variation
+        self.lettering_item_variations = lettering_item_variations
+        self.order = order
+
+
+def get_lettering_item_categories(titles):
+    """Map each title to its lettering item category, the oldest one wins for duplicate titles."""
+    item_categories = {}
+    for item_category in LetteringItemCategory.objects.filter(title__in=titles).order_by("pk"):
+        item_categories.setdefault(item_category.title, item_category)
+    return item_categories
+
+
+def prepare_orders(items):
+    """Resolve products, colours and lettering categories of all items with one query each.
+
+    Returns the prepared orders and a list with the lookup errors of each item, which
+    is empty for items that can be saved.
+    """
+    products = Product.objects.select_related("category").in_bulk({item["product_id"] for item in items})
+    product_colors = ProductColor.objects.in_bulk(
+        {item["product_color_id"] for item in items if item.get("product_color_id") is not None}
+    )
+    lettering_items_per_item = [
+        [lettering_item for lettering_item in item["lettering_items"] if (lettering_item["text"] or "").strip()]
+        for item in items
+    ]
+    item_categories = get_lettering_item_categories(
+        {lettering_item["title"] for lettering_items in lettering_items_per_item for lettering_item in lettering_items}
+    )
+
+    prepared_orders = []
+    errors = []
+    for item, lettering_items in zip(items, lettering_items_per_item):
+        item_errors = {}
+        product = products.get(item["product_id"])
+        if product is None:
+            item_errors["product_id"] = [f"unknown product: {item['product_id']}"]
+        unknown_titles = sorted(
+            {lettering_item["title"] for lettering_item in lettering_items} - item_categories.keys()
+        )
+        if unknown_titles:
+            item_errors["lettering_items"] = [f"unknown lettering item category: {title}" for title in unknown_titles]
+        errors.append(item_errors)
+        if item_errors:
+            continue
+
+        lettering_item_variations = [
+            LetteringItemVariation(
+                lettering_item_category=item_categories[lettering_item["title"]], lettering=lettering_item["text"]
+            )
+            for lettering_item in lettering_items
+        ]
+        product_variation = ProductVariation(
+            product=product, product_color=product_colors.get(item.get("product_color_id")), amount=1
+        )
+        product_variation.reprice(lettering_item_variations)
+        order = Order(**item["order"], product=product_variation, payment=None)
+        prepared_orders.append(PreparedOrder(product_variation, lettering_item_variations, order))
+
+    return prepared_orders, errors
+
+
+def save_orders(prepared_orders):
+    """Insert the rows of all prepared orders in one transaction with one bulk insert per table."""
+    with transaction.atomic():
+        ProductVariation.objects.bulk_create([prepared.product_variation for prepared in prepared_orders])
+
+        lettering_item_variations = []
+        for prepared in prepared_orders:
+            for lettering_item_variation in prepared.lettering_item_variations:
+                lettering_item_variation.product_variation = prepared.product_variation
+                lettering_item_variations.append(lettering_item_variation)
+        LetteringItemVariation.objects.bulk_create(lettering_item_variations)
+
+        orders = []
+        for prepared in prepared_orders:
+            prepared.order.product = prepared.product_variation
+            orders.append(prepared.order)
+        Order.objects.bulk_create(orders)
+
+    return orders
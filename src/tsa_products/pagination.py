@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.http import QueryDict
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+class OptInCursorPagination(CursorPagination):
+    """Cursor pagination that is only used when the client sends a cursor or page size.
+
+    Requests without one of these parameters keep receiving a plain list, capped at
+    API_UNPAGINATED_MAX_RESULTS rows, so existing clients continue to work unchanged.
+    """
+
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    unpaginated_max_results = settings.API_UNPAGINATED_MAX_RESULTS
+
+    def is_requested(self, request):
+        return self.cursor_query_param in request.query_params or self.page_size_query_param in request.query_params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.requested = self.is_requested(request)
+        if not self.requested:
+            ordering = self.get_ordering(request, queryset, view)
+            return list(queryset.order_by(*ordering)[: self.unpaginated_max_results])
+        page = super().paginate_queryset(queryset, request, view)
+        # the links only carry the parameters read here, so cached pages do not depend on any others
+        query = pagination_query(request)
+        self.base_url = request.build_absolute_uri(f"{request.path}?{query}" if query else request.path)
+        return page
+
+    def get_paginated_response(self, data):
+        if not self.requested:
+            return Response(data)
+        return super().get_paginated_response(data)
+
+
+def pagination_query(request):
+    """Query string of the parameters OptInCursorPagination reads from `request`."""
+    query = QueryDict(mutable=True)
+    for name in (OptInCursorPagination.cursor_query_param, OptInCursorPagination.page_size_query_param):
+        if name in request.GET:
+            query.setlist(name, request.GET.getlist(name))
+    return query.urlencode()
+
+
+def estimated_row_count(queryset):
+    """Row estimate of the planner statistics for an unfiltered PostgreSQL queryset, None otherwise."""
+    connection = connections[queryset.db]
+    if queryset.query.where or connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT reltuples FROM pg_class WHERE oid = %s::regclass", [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    # reltuples is -1 for tables that were never vacuumed or analyzed
+    return int(row[0]) if row and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator for admin changelists of large tables.
+
+    Counting all rows of a large PostgreSQL table scans the whole table, so unfiltered changelists
+    show the planner estimate once it exceeds ADMIN_ESTIMATED_COUNT_THRESHOLD rows.
+    """
+
+    @cached_property
+    def count(self):
+        if isinstance(self.object_list, QuerySet):
+            estimate = estimated_row_count(self.object_list)
+            if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return super().count
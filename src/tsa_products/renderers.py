@@ -0,0 +1,39 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson writes datetimes in its own format, passing them through to the DRF encoder keeps the
+# millisecond precision and "Z" suffix of the stdlib renderer. Dict keys that are not strings
+# are converted like json.dumps does.
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson when it is installed.
+
+    The output is the same as the one of the stdlib based JSONRenderer, types orjson does not
+    know (Decimal, lazy strings, querysets, ...) are converted by the DRF JSONEncoder. Indented
+    output, e.g. for the browsable API, ASCII only output (UNICODE_JSON = False) and missing orjson
+    fall back to the stdlib renderer.
+
+    Unlike the stdlib renderer, which raises ValueError on NaN and infinite floats, orjson renders
+    them as null.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or not self.compact or not self.strict or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=JSONEncoder().default, option=ORJSON_OPTIONS)
+        # like the stdlib renderer, escape the line separators JavaScript does not allow in strings
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -0,0 +1,192 @@
+import itertools
+import random
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import (
+    Category,
+    Comment,
+    LetteringItemCategory,
+    LetteringItemVariation,
+    Order,
+    Product,
+    ProductColor,
+    ProductVariation,
+)
+
+# categories the views look up by title are always part of a seeded catalog
+REQUIRED_CATEGORY_TITLES = ("Truck Sign",)
+LETTERING_ITEM_TITLES = ("Company Name", "VIN Number", "MC Number", "DOT Number", "Phone Number", "City")
+LETTERING_ITEM_AMOUNTS = (0, 1, 2, 3, 4, 5)
+LETTERING_ITEM_AMOUNT_WEIGHTS = (10, 25, 30, 20, 10, 5)
+AMOUNTS = (1, 2, 3, 5)
+AMOUNT_WEIGHTS = (80, 15, 4, 1)
+
+
+def batched(objects, batch_size):
+    for start in range(0, len(objects), batch_size):
+        yield objects[start : start + batch_size]
+
+
+def seed_catalog(categories=5, products=50, colors=10, lettering_categories=6, seed=0, batch_size=1000):
+    """Create a catalog with bulk inserts and return its rows by model name.
+
+    Required categories which exist already are reused, so seeding a real database keeps them unique.
+    """
+    rng = random.Random(seed)
+
+    def category_fields(index):
+        return {
+            "image": f"uploads/categories/category-{index}.png",
+            "base_price": round(rng.uniform(20, 200), 2),
+            "max_amount_of_lettering_items": rng.choice([-1, 2, 4, 6]),
+            "height": rng.choice([12.0, 18.0, 24.0]),
+            "width": rng.choice([12.0, 18.0, 24.0]),
+        }
+
+    # the views get() these categories by title, an existing one is reused instead of duplicated
+    category_rows = [
+        Category.objects.get_or_create(title=title, defaults=category_fields(index))[0]
+        for index, title in enumerate(REQUIRED_CATEGORY_TITLES)
+    ]
+    category_rows += Category.objects.bulk_create(
+        [
+            Category(title=f"Category {index}", **category_fields(index))
+            for index in range(len(REQUIRED_CATEGORY_TITLES), categories)
+        ],
+        batch_size=batch_size,
+    )
+    lettering_category_rows = LetteringItemCategory.objects.bulk_create(
+        [
+            LetteringItemCategory(
+                title=LETTERING_ITEM_TITLES[index % len(LETTERING_ITEM_TITLES)]
+                + ("" if index < len(LETTERING_ITEM_TITLES) else f" {index}"),
+                price=round(rng.uniform(1, 15), 2),
+            )
+            for index in range(lettering_categories)
+        ],
+        batch_size=batch_size,
+    )
+    color_rows = ProductColor.objects.bulk_create(
+        [
+            ProductColor(color_in_hex=f"#{rng.randrange(0x1000000):06x}", color_nickname=f"Color {index}")
+            for index in range(colors)
+        ],
+        batch_size=batch_size,
+    )
+    product_rows = []
+    for batch in batched(range(products), batch_size):
+        product_rows += Product.objects.bulk_create(
+            [
+                Product(
+                    category=category_rows[index % len(category_rows)],
+                    title=f"Product {index}",
+                    image=f"uploads/products/product-{index}.png",
+                    detail_image=f"uploads/products_detail/product-{index}.png",
+                    is_uploaded=rng.random() < 0.1,
+                )
+                for index in batch
+            ]
+        )
+    return {
+        "categories": category_rows,
+        "lettering_categories": lettering_category_rows,
+        "colors": color_rows,
+        "products": product_rows,
+    }
+
+
+def popularity_weights(amount, exponent=1.1):
+    """Zipf-like cumulative weights, a few rows are picked often and most rows rarely."""
+    return list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(amount)))
+
+
+def seed_orders(
+    products,
+    colors,
+    lettering_categories,
+    orders=100,
+    seed=0,
+    batch_size=1000,
+    spread_days=365,
+):
+    """Create priced orders with their product variations and lettering items, returns the amount of orders.
+
+    Products and colours are picked by popularity, most variations have one to three lettering
+    items and an amount of one, and the order dates are spread over the last `spread_days` days.
+    """
+    rng = random.Random(seed)
+    categories = Category.objects.in_bulk({product.category_id for product in products})
+    for product in products:
+        product.category = categories[product.category_id]
+    product_weights = popularity_weights(len(products))
+    color_weights = popularity_weights(len(colors))
+    customers = max(orders // 3, 1)
+    now = timezone.now()
+
+    created = 0
+    for batch in batched(range(orders), batch_size):
+        variations = []
+        lettering_items = []
+        for _ in batch:
+            variation = ProductVariation(
+                product=rng.choices(products, cum_weights=product_weights)[0],
+                product_color=rng.choices(colors, cum_weights=color_weights)[0] if colors else None,
+                amount=rng.choices(AMOUNTS, weights=AMOUNT_WEIGHTS)[0],
+            )
+            amount_of_items = rng.choices(LETTERING_ITEM_AMOUNTS, weights=LETTERING_ITEM_AMOUNT_WEIGHTS)[0]
+            items = [
+                LetteringItemVariation(
+                    lettering_item_category=rng.choice(lettering_categories),
+                    lettering=f"TRUCKING {rng.randrange(10000)}",
+                )
+                for _ in range(amount_of_items if lettering_categories else 0)
+            ]
+            variation.reprice(items)
+            variations.append(variation)
+            lettering_items.append(items)
+
+        with transaction.atomic():
+            ProductVariation.objects.bulk_create(variations)
+            for variation, items in zip(variations, lettering_items):
+                for item in items:
+                    item.product_variation = variation
+            LetteringItemVariation.objects.bulk_create([item for items in lettering_items for item in items])
+            order_rows = [
+                Order(
+                    ordered_date=now - timedelta(seconds=rng.randrange(spread_days * 24 * 3600 + 1)),
+                    user_email=f"customer-{rng.randrange(customers)}@example.com",
+                    user_first_name="Jane",
+                    user_last_name="Trucker",
+                    product=variation,
+                    ordered=rng.random() < 0.7,
+                )
+                for variation in variations
+            ]
+            # bulk_create overwrites ordered_date with the auto_now_add value, the spread dates are set after
+            ordered_dates = [order.ordered_date for order in order_rows]
+            Order.objects.bulk_create(order_rows)
+            for order, ordered_date in zip(order_rows, ordered_dates):
+                order.ordered_date = ordered_date
+            Order.objects.bulk_update(order_rows, ["ordered_date"])
+        created += len(variations)
+    return created
+
+
+def seed_comments(comments=50, visible_ratio=0.8, seed=0, batch_size=1000):
+    rng = random.Random(seed)
+    for batch in batched(range(comments), batch_size):
+        Comment.objects.bulk_create(
+            [
+                Comment(
+                    user_email=f"customer-{index}@example.com",
+                    image=f"uploads/comments/comment-{index}.png",
+                    text="Great sign, fast delivery.",
+                    visible=rng.random() < visible_ratio,
+                )
+                for index in batch
+            ]
+        )
+    return comments
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from .images import variant_urls
 from .models import (
     Category,
     Comment,
@@ -10,17 +11,40 @@ from .models import (
     Product,
     ProductColor,
     ProductVariation,
+    UploadTask,
 )
 
 
+class ImageVariantsField(serializers.Field):
+    """Read-only urls of the thumbnail, medium and webp derivatives of an image field, or of the original
+    image while they do not exist."""
+
+    def __init__(self, **kwargs):
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        urls = variant_urls(value)
+        request = self.context.get("request", None)
+        if request is not None:
+            return {variant: request.build_absolute_uri(url) for variant, url in urls.items()}
+        return urls
+
+
 class CategorySerializer(serializers.ModelSerializer):
 
     image = serializers.ImageField(use_url=True)
+    image_variants = ImageVariantsField(source="image")
     sample_product_id = serializers.SerializerMethodField("get_sample_product_id")
 
     def get_sample_product_id(self, obj):
-        product = Product.objects.filter(category=obj).first()
-        return product.id
+        # querysets built with Category.objects.with_sample_product_id() carry the value already
+        if hasattr(obj, "sample_product_id"):
+            return obj.sample_product_id
+        product = Product.objects.filter(category=obj).order_by("pk").first()
+        return product.id if product else None
 
     class Meta:
         model = Category
@@ -32,6 +56,7 @@ class CategorySerializer(serializers.ModelSerializer):
             "height",
             "width",
             "sample_product_id",
+            "image_variants",
         )
 
 
@@ -72,10 +97,12 @@ class ProductSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     image = serializers.ImageField(use_url=True)
     detail_image = serializers.ImageField(use_url=True)
+    image_variants = ImageVariantsField(source="image")
+    detail_image_variants = ImageVariantsField(source="detail_image")
 
     class Meta:
         model = Product
-        fields = "__all__"
+        exclude = ("image_variants_ready",)
 
 
 class ProductVariationSerializer(serializers.ModelSerializer):
@@ -86,12 +113,7 @@ class ProductVariationSerializer(serializers.ModelSerializer):
     total_price = serializers.SerializerMethodField("get_total_price")
 
     def get_total_price(self, obj):
-        items = obj.get_all_lettering_items()
-        price = obj.product.category.base_price
-        for item in items:
-            price += item.lettering_item_category.price
-        price = price * obj.amount
-        return price
+        return obj.get_total_price()
 
     class Meta:
         model = ProductVariation
@@ -123,8 +145,49 @@ class CommentSerializer(serializers.ModelSerializer):
 
     user_email = serializers.EmailField(required=True)
     image = serializers.ImageField(use_url=True)
+    image_variants = ImageVariantsField(source="image")
     text = serializers.CharField(required=False)
 
     class Meta:
         model = Comment
-        fields = "__all__"
+        exclude = ("image_variants_ready",)
+
+
+class LetteringItemInputSerializer(serializers.Serializer):
+
+    title = serializers.CharField()
+    text = serializers.CharField(allow_blank=True, allow_null=True, trim_whitespace=False)
+
+
+class OrderCreateSerializer(serializers.Serializer):
+    """Validates the payload of one order, as posted to CreateOrder or as an item of BatchCreateOrder."""
+
+    product_id = serializers.IntegerField()
+    product_color_id = serializers.IntegerField(required=False, allow_null=True)
+    lettering_items = LetteringItemInputSerializer(many=True)
+    order = OrderSerializer()
+
+
+class OrderExportFilterSerializer(serializers.Serializer):
+    """Query parameters of the order export, dates are inclusive."""
+
+    date_from = serializers.DateField(required=False, default=None)
+    date_to = serializers.DateField(required=False, default=None)
+    ordered = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+    def validate(self, data):
+        if data["date_from"] and data["date_to"] and data["date_from"] > data["date_to"]:
+            raise serializers.ValidationError({"date_to": ["must not be before date_from"]})
+        return data
+
+
+class ImageUploadSerializer(serializers.Serializer):
+
+    image = serializers.ImageField()
+
+
+class UploadTaskSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = UploadTask
+        fields = ("id", "status", "product", "comment", "created_at", "updated_at")
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cache import bump_catalog_version
+from .images import IMAGE_VARIANT_FIELDS
+from .models import Category, Comment, LetteringItemCategory, Product, ProductColor
+from .snapshot import schedule_catalog_snapshot
+from .uploads import enqueue_image_variants
+
+CATALOG_MODELS = (Category, LetteringItemCategory, Product, ProductColor)
+
+
+def invalidate_catalog(sender, **kwargs):
+    # bump after commit, otherwise a concurrent request could cache the old rows under the new version
+    transaction.on_commit(bump_catalog_version)
+    if settings.CATALOG_SNAPSHOT_AUTO:
+        schedule_catalog_snapshot()
+
+
+for catalog_model in CATALOG_MODELS:
+    post_save.connect(invalidate_catalog, sender=catalog_model, dispatch_uid=f"catalog_save_{catalog_model.__name__}")
+    post_delete.connect(
+        invalidate_catalog, sender=catalog_model, dispatch_uid=f"catalog_delete_{catalog_model.__name__}"
+    )
+
+
+def queue_image_variants(sender, instance, raw=False, update_fields=None, **kwargs):
+    # rendering the derivatives takes several round trips to the media storage, process_uploads
+    # creates them in the background instead of the request saving the instance. Fixtures and saves
+    # that leave the images as they were loaded queue nothing.
+    field_names = IMAGE_VARIANT_FIELDS[sender.__name__]
+    if raw or (update_fields is not None and not update_fields & set(field_names)):
+        return
+    loaded = getattr(instance, "_loaded_images", {})
+    # deferred images are not saved, so they cannot have changed
+    saved = {name: getattr(instance, name).name for name in field_names if name in instance.__dict__}
+    instance._loaded_images = {**loaded, **saved}
+    if any(name and name != loaded.get(field_name) for field_name, name in saved.items()):
+        enqueue_image_variants(instance)
+
+
+for image_model in (Category, Product, Comment):
+    post_save.connect(queue_image_variants, sender=image_model, dispatch_uid=f"image_variants_{image_model.__name__}")
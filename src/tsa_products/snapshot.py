@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.urls import reverse
+
+from .cache import get_catalog_version
+from .models import Category
+from .urls import URL_NAMESPACE
+from .views import (
+    CategoryListView,
+    LetteringItemCategoryListView,
+    LogoListView,
+    ProductColorListView,
+    ProductFromCategoryListView,
+)
+
+MANIFEST_NAME = "manifest.json"
+FILES_DIR = "files"
+# route name, view and whether the route takes a category id
+SNAPSHOT_ROUTES = [
+    ("categories-api", CategoryListView, False),
+    ("lettering-item-categories-api", LetteringItemCategoryListView, False),
+    ("product-color-api", ProductColorListView, False),
+    ("truck-logo-list-api", LogoListView, False),
+    ("product-category-api", ProductFromCategoryListView, True),
+]
+
+
+def render_route(factory, base_url, name, view_class, kwargs):
+    """Path and JSON body of a catalog route, rendered by its view for a request to `base_url`."""
+    path = reverse(f"{URL_NAMESPACE}:{name}", kwargs=kwargs)
+    # without a page size the route answers with the first API_UNPAGINATED_MAX_RESULTS rows only
+    rows = view_class(kwargs=kwargs).get_queryset().count()
+    if rows > settings.API_UNPAGINATED_MAX_RESULTS:
+        raise RuntimeError(
+            f"{path} lists {rows} rows, its snapshot would be truncated to "
+            f"API_UNPAGINATED_MAX_RESULTS={settings.API_UNPAGINATED_MAX_RESULTS}"
+        )
+    url = urlsplit(base_url)
+    request = factory.get(path, secure=url.scheme == "https", headers={"host": url.netloc})
+    response = view_class.as_view()(request, **kwargs)
+    response.render()
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} answered with {response.status_code}")
+    return path, response.content
+
+
+def write_atomic(path, content):
+    # readers see either the old or the new file, never a partially written one
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".", delete=False) as file:
+        file.write(content)
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, path)
+
+
+def write_catalog_snapshot(root=None, base_url=None):
+    """Render the catalog routes to content hashed files under `root` and point manifest.json at them.
+
+    Image urls in the payloads are built for `base_url`, the public url of the API. Files of the
+    previous manifest are kept for clients still holding it, older files are removed.
+    Returns the new manifest.
+    """
+    root = Path(root or settings.CATALOG_SNAPSHOT_ROOT)
+    base_url = base_url or settings.CATALOG_SNAPSHOT_BASE_URL
+    (root / FILES_DIR).mkdir(parents=True, exist_ok=True)
+
+    # imported here, django.test and unittest are not needed by the workers importing this module
+    from django.test import RequestFactory
+
+    factory = RequestFactory()
+    category_kwargs = [
+        {"id": category_id} for category_id in Category.objects.order_by("id").values_list("id", flat=True)
+    ]
+    # api path -> file, relative to the manifest
+    files = {}
+    for name, view_class, per_category in SNAPSHOT_ROUTES:
+        for kwargs in category_kwargs if per_category else [{}]:
+            path, content = render_route(factory, base_url, name, view_class, kwargs)
+            digest = hashlib.sha256(content).hexdigest()[:16]
+            # e.g. truck-signs-product-category-3.<digest>.json, unchanged payloads keep their file
+            file_name = f"{path.strip('/').replace('/', '-')}.{digest}.json"
+            if not (root / FILES_DIR / file_name).exists():
+                write_atomic(root / FILES_DIR / file_name, content)
+            files[path] = f"{FILES_DIR}/{file_name}"
+
+    manifest_path = root / MANIFEST_NAME
+    previous = json.loads(manifest_path.read_text()) if manifest_path.exists() else {"files": {}}
+    manifest = {
+        "version": get_catalog_version(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "snapshot_url": settings.CATALOG_SNAPSHOT_URL,
+        "files": files,
+    }
+    write_atomic(manifest_path, json.dumps(manifest, indent=2).encode("utf-8"))
+
+    referenced = {Path(path).name for path in [*files.values(), *previous["files"].values()]}
+    for file in (root / FILES_DIR).iterdir():
+        # dot files are being written by another snapshot
+        if file.name not in referenced and not file.name.startswith("."):
+            file.unlink(missing_ok=True)
+    return manifest
+
+
+class ScheduledSnapshot:
+    """A snapshot written by the first of the commit callbacks it is registered as."""
+
+    written = False
+
+    def __call__(self):
+        if not self.written:
+            self.written = True
+            write_catalog_snapshot()
+
+
+def schedule_catalog_snapshot():
+    """Write the snapshot when the current transaction commits, once however many catalog rows it changed."""
+    scheduled = getattr(connection, "scheduled_catalog_snapshot", None)
+    if scheduled is None or scheduled.written:
+        scheduled = connection.scheduled_catalog_snapshot = ScheduledSnapshot()
+    # every change registers the callback, so a rolled back transaction or savepoint that drops some of
+    # them cannot lose the snapshot of a later change. The first callback run writes it, the others return
+    # robust: the catalog change is committed already, a failing snapshot is logged instead of raised
+    transaction.on_commit(scheduled, robust=True)
@@ -0,0 +1,135 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tsa_products.models import (
+    Category,
+    LetteringItemCategory,
+    LetteringItemVariation,
+    Order,
+    Product,
+    ProductColor,
+    ProductVariation,
+    UploadTask,
+)
+from tsa_products.pagination import EstimatedCountPaginator
+
+
+class AdminChangelistTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_user = User.objects.create_superuser("admin", "admin@example.com", "test-password")
+        self.test_category = Category.objects.create(title="Truck Sign", image="test-path")
+        self.test_product = Product.objects.create(category=self.test_category, title="test-title")
+        self.test_color = ProductColor.objects.create(color_nickname="red", color_in_hex="#ff0000")
+        self.test_item_category = LetteringItemCategory.objects.create(title="Company Name", price=2)
+        self.create_orders(2)
+
+    @classmethod
+    def create_orders(cls, amount):
+        for index in range(amount):
+            product_variation = ProductVariation.objects.create(product=cls.test_product, product_color=cls.test_color)
+            LetteringItemVariation.objects.create(
+                lettering_item_category=cls.test_item_category, lettering="test", product_variation=product_variation
+            )
+            LetteringItemVariation.objects.create(
+                lettering_item_category=cls.test_item_category, lettering="test", product_variation=product_variation
+            )
+            Order.objects.create(user_email=f"test-{index}@example.com", product=product_variation)
+            UploadTask.objects.create(product=cls.test_product, spooled_file=f"test-{index}.png")
+
+    def setUp(self):
+        self.client.force_login(self.test_user)
+
+    def count_changelist_queries(self, model_name):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(f"admin:tsa_products_{model_name}_changelist"))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_success_changelist_queries_do_not_grow_with_rows(self):
+        """Tests that changelists run the same number of queries for 2 and 10 rows."""
+        model_names = ["order", "productvariation", "letteringitemvariation", "product", "uploadtask"]
+        queries = {model_name: self.count_changelist_queries(model_name) for model_name in model_names}
+        self.create_orders(8)
+        for model_name in model_names:
+            with self.subTest(model_name=model_name):
+                self.assertEqual(self.count_changelist_queries(model_name), queries[model_name])
+
+    def test_success_order_total_price_of_unpriced_variations(self):
+        """Tests that the order changelist shows the calculated total of variations without a stored price."""
+        changelist = self.client.get(reverse("admin:tsa_products_order_changelist")).context["cl"]
+        self.assertEqual(
+            [changelist.model_admin.get_total_price(order) for order in changelist.result_list],
+            [4.0] * Order.objects.count(),
+        )
+
+    def test_success_variation_is_repriced_when_saved(self):
+        """Tests that the stored price is read-only and recalculated after the variation and its lettering are saved."""
+        variation = ProductVariation.objects.first()
+        url = reverse("admin:tsa_products_productvariation_change", args=[variation.id])
+        items = list(variation.lettering_item_variation_set.order_by("pk"))
+        prefix = "lettering_item_variation_set"
+        data = {
+            "product": self.test_product.id,
+            "product_color": self.test_color.id,
+            "amount": 3,
+            "total_price": 1000,
+            f"{prefix}-TOTAL_FORMS": 2,
+            f"{prefix}-INITIAL_FORMS": 2,
+            f"{prefix}-0-id": items[0].id,
+            f"{prefix}-0-product_variation": variation.id,
+            f"{prefix}-0-lettering_item_category": self.test_item_category.id,
+            f"{prefix}-0-lettering": "test",
+            f"{prefix}-1-id": items[1].id,
+            f"{prefix}-1-product_variation": variation.id,
+            f"{prefix}-1-lettering_item_category": self.test_item_category.id,
+            f"{prefix}-1-lettering": "test",
+            f"{prefix}-1-DELETE": "on",
+        }
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        variation.refresh_from_db()
+        self.assertEqual(variation.lettering_item_variation_set.count(), 1)
+        self.assertEqual(variation.total_price, 6.0)
+        self.assertEqual(variation.price_breakdown["amount"], 3)
+
+    def test_success_variation_is_repriced_when_lettering_changes(self):
+        """Tests that editing a lettering item in its own admin reprices its variation."""
+        item = LetteringItemVariation.objects.order_by("pk").first()
+        expensive_category = LetteringItemCategory.objects.create(title="Logo", price=10)
+        url = reverse("admin:tsa_products_letteringitemvariation_change", args=[item.id])
+        data = {
+            "lettering_item_category": expensive_category.id,
+            "lettering": "test",
+            "product_variation": item.product_variation_id,
+        }
+        self.assertEqual(self.client.post(url, data).status_code, 302)
+        self.assertEqual(ProductVariation.objects.get(pk=item.product_variation_id).total_price, 12.0)
+
+    def test_success_amount_of_lettering_is_annotated(self):
+        """Tests that the amount of lettering items is shown from an annotation and can be sorted by."""
+        response = self.client.get(reverse("admin:tsa_products_productvariation_changelist"), {"o": "2"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [row.amount_of_lettering for row in response.context["cl"].result_list],
+            [2] * ProductVariation.objects.count(),
+        )
+
+    def test_success_search_related_titles(self):
+        """Tests that products are searched by category title."""
+        Product.objects.create(category=Category.objects.create(title="Logo", image="test-path"), title="other")
+        response = self.client.get(reverse("admin:tsa_products_product_changelist"), {"q": "Truck Sign"})
+        self.assertEqual(list(response.context["cl"].result_list), [self.test_product])
+
+    def test_success_estimated_count_for_large_tables(self):
+        """Tests that the paginator uses the row estimate of large unfiltered tables only."""
+        with mock.patch("tsa_products.pagination.estimated_row_count", return_value=5_000_000):
+            self.assertEqual(EstimatedCountPaginator(Order.objects.order_by("pk"), 100).count, 5_000_000)
+        with mock.patch("tsa_products.pagination.estimated_row_count", return_value=10):
+            self.assertEqual(EstimatedCountPaginator(Order.objects.order_by("pk"), 100).count, Order.objects.count())
+        # there are no planner statistics to estimate from on sqlite
+        self.assertEqual(EstimatedCountPaginator(Order.objects.order_by("pk"), 100).count, Order.objects.count())
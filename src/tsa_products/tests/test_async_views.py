@@ -0,0 +1,149 @@
+import os
+import subprocess
+import sys
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from tsa_products.models import (
+    Category,
+    LetteringItemCategory,
+    Order,
+    Product,
+    ProductColor,
+    ProductVariation,
+)
+
+
+class AsyncViewsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="Truck Sign", image="uploads/categories/test.png")
+        for index in range(4):
+            Product.objects.create(
+                category=self.test_category, title=f"test-title-{index}", image=f"uploads/products/{index}.png"
+            )
+        self.test_product = Product.objects.order_by("pk").first()
+        LetteringItemCategory.objects.create(title="test-lettering", price=2)
+        ProductColor.objects.create(color_nickname="red", color_in_hex="#ff0000")
+        self.test_order = Order.objects.create(
+            user_email="test-email", product=ProductVariation.objects.create(product=self.test_product)
+        )
+
+    def setUp(self):
+        # Clears the catalog cache so each view builds its own response.
+        cache.clear()
+
+    def route_kwargs(self, name):
+        if name == "product-category-api":
+            return {"id": self.test_category.id}
+        if name == "product-detail-api":
+            return {"id": self.test_product.id}
+        if name == "retrieve-order-api":
+            return {"id": self.test_order.id}
+        return {}
+
+    def get_pair(self, name, kwargs=None, **params):
+        """Responses of the sync route and of its async version."""
+        kwargs = self.route_kwargs(name) if kwargs is None else kwargs
+        sync_response = self.client.get(reverse(f"trucks-signs-namespace:{name}", kwargs=kwargs), params)
+        async_response = self.client.get(reverse(f"trucks-signs-namespace:async-{name}", kwargs=kwargs), params)
+        return sync_response, async_response
+
+    def test_success_async_views_match_sync_views(self):
+        """Tests that the async views return the same JSON as the DRF views, with both serialization paths."""
+        names = [
+            "categories-api",
+            "lettering-item-categories-api",
+            "products-api",
+            "product-category-api",
+            "product-color-api",
+            "product-detail-api",
+            "truck-logo-list-api",
+            "retrieve-order-api",
+        ]
+        for fast in [True, False]:
+            for name in names:
+                with self.subTest(name=name, fast=fast), override_settings(CATALOG_FAST_SERIALIZATION=fast):
+                    cache.clear()
+                    sync_response, async_response = self.get_pair(name)
+                    self.assertEqual(async_response.status_code, 200)
+                    self.assertEqual(async_response["Content-Type"], "application/json")
+                    self.assertEqual(async_response.content, sync_response.content)
+
+    def test_success_async_paginated_list(self):
+        """Tests that the async lists are cursor paginated like the sync lists."""
+        sync_response, async_response = self.get_pair("products-api", page_size=3)
+        sync_page, async_page = sync_response.json(), async_response.json()
+        self.assertEqual(async_page["results"], sync_page["results"])
+        self.assertEqual(async_page["next"], sync_page["next"].replace("/products/", "/async/products/"))
+        self.assertEqual(len(self.client.get(async_page["next"]).json()["results"]), 1)
+
+    def test_success_async_conditional_get(self):
+        """Tests that an async catalog response is answered with 304 for its ETag, reading the cache asynchronously."""
+        url = reverse("trucks-signs-namespace:async-products-api")
+        with mock.patch("tsa_products.cache.get_catalog_version", side_effect=AssertionError("sync cache access")):
+            first = self.client.get(url)
+            response = self.client.get(url, headers={"if-none-match": first["ETag"]})
+            modified_response = self.client.get(url, headers={"if-modified-since": first["Last-Modified"]})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(modified_response.status_code, 304)
+
+    def test_success_async_catalog_is_cached(self):
+        """Tests that the second async catalog request is served without queries."""
+        url = reverse("trucks-signs-namespace:async-categories-api")
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(second.content, first.content)
+
+    def test_failure_async_not_found(self):
+        """Tests that missing products and orders are answered with 404 and DRF's message."""
+        for name in ["product-detail-api", "retrieve-order-api"]:
+            with self.subTest(name=name):
+                sync_response, async_response = self.get_pair(name, {"id": 987654})
+                self.assertEqual(async_response.status_code, 404)
+                self.assertEqual(async_response.json(), sync_response.json())
+
+    def test_failure_async_invalid_cursor(self):
+        """Tests that an invalid cursor is answered with 404 and DRF's message by the async lists."""
+        for name in ["categories-api", "products-api", "product-category-api", "product-color-api"]:
+            with self.subTest(name=name):
+                sync_response, async_response = self.get_pair(name, cursor="garbage")
+                self.assertEqual(async_response.status_code, 404)
+                self.assertEqual(async_response.json(), sync_response.json())
+
+    async def test_success_async_client(self):
+        """Tests that the async views and the middleware work when served through the ASGI handler."""
+
+        def requests_total():
+            labels = {"method": "GET", "view": "async-retrieve-order-api", "status": "200"}
+            return REGISTRY.get_sample_value("tsa_http_requests_total", labels) or 0
+
+        before = requests_total()
+        response = await self.async_client.get(
+            reverse("trucks-signs-namespace:async-retrieve-order-api", kwargs={"id": self.test_order.id})
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user_email"], "test-email")
+        self.assertEqual(requests_total(), before + 1)
+
+
+class AsgiApplicationTestCase(SimpleTestCase):
+    def test_success_persistent_connections_disabled(self):
+        """Tests that the ASGI application does not keep persistent connections, which would leak per request."""
+        code = "import tsa_app.asgi, django.conf; print(django.conf.settings.DATABASES['default']['CONN_MAX_AGE'])"
+        process = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            cwd=settings.BASE_DIR,
+            env={**os.environ, "MODE": "prod", "DB_CONN_MAX_AGE": "60"},
+            check=True,
+        )
+        self.assertEqual(process.stdout.strip(), "0")
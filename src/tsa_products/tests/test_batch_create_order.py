@@ -0,0 +1,98 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from tsa_products.models import (
+    Category,
+    LetteringItemCategory,
+    LetteringItemVariation,
+    Order,
+    Product,
+    ProductColor,
+    ProductVariation,
+)
+
+
+class BatchCreateOrderTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="test", image="test-path", base_price=10.0)
+        self.test_products = [
+            Product.objects.create(category=self.test_category, title=f"test-title-{index}") for index in range(3)
+        ]
+        self.test_product_color = ProductColor.objects.create(color_nickname="test-color-name")
+        LetteringItemCategory.objects.create(title="company", price=1.0)
+        LetteringItemCategory.objects.create(title="vin", price=2.0)
+        self.test_url = reverse("trucks-signs-namespace:batch-create-order-api")
+
+    def build_item(self, product, email="test@example.com"):
+        return {
+            "product_id": product.id,
+            "product_color_id": self.test_product_color.id,
+            "lettering_items": [{"title": "company", "text": "ACME"}, {"title": "vin", "text": "123"}],
+            "order": {"user_email": email},
+        }
+
+    def test_successful_batch_creation(self):
+        """Tests that all orders of a batch are created and reported per item."""
+        payload = [
+            self.build_item(product, f"test-{index}@example.com") for index, product in enumerate(self.test_products)
+        ]
+        response = self.client.post(self.test_url, payload, content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([result["status"] for result in results], ["created"] * 3)
+        self.assertEqual(
+            [result["order"]["user_email"] for result in results], [item["order"]["user_email"] for item in payload]
+        )
+        self.assertEqual(results[0]["order"]["product"]["total_price"], 13.0)
+        self.assertEqual(Order.objects.count(), 3)
+        self.assertEqual(LetteringItemVariation.objects.count(), 6)
+
+    def test_success_batch_creation_uses_constant_queries(self):
+        """Tests that the amount of queries does not depend on the batch size."""
+        with self.assertNumQueries(11):
+            self.client.post(self.test_url, [self.build_item(self.test_products[0])], content_type="application/json")
+        with self.assertNumQueries(11):
+            self.client.post(
+                self.test_url,
+                [self.build_item(product) for product in self.test_products * 5],
+                content_type="application/json",
+            )
+
+    def test_failure_batch_creation_with_invalid_item(self):
+        """Tests that one invalid item reports per-item errors and creates nothing."""
+        payload = [self.build_item(product) for product in self.test_products]
+        payload[1]["order"]["user_email"] = "not-an-email"
+        payload[2]["lettering_items"].append({"title": "unknown", "text": "lettering"})
+        response = self.client.post(self.test_url, payload, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        results = response.json()["results"]
+        self.assertEqual(results[0], {"index": 0, "status": "not_created"})
+        self.assertIn("order", results[1]["errors"])
+        self.assertEqual(results[1]["status"], "invalid")
+        self.assertEqual(ProductVariation.objects.count(), 0)
+
+    def test_failure_batch_creation_with_unknown_lookups(self):
+        """Tests that unknown products and lettering categories are reported per item."""
+        payload = [self.build_item(product) for product in self.test_products[:2]]
+        payload[0]["product_id"] = 0
+        payload[1]["lettering_items"].append({"title": "unknown", "text": "lettering"})
+        response = self.client.post(self.test_url, payload, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        results = response.json()["results"]
+        self.assertEqual(results[0]["errors"], {"product_id": ["unknown product: 0"]})
+        self.assertEqual(results[1]["errors"], {"lettering_items": ["unknown lettering item category: unknown"]})
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_failure_batch_creation_without_list(self):
+        """Tests that a payload which is not a list is rejected."""
+        response = self.client.post(
+            self.test_url, self.build_item(self.test_products[0]), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_failure_batch_creation_with_empty_list(self):
+        """Tests that an empty batch is rejected."""
+        response = self.client.post(self.test_url, [], content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"non_field_errors": ["This list may not be empty."]})
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from tsa_products.benchmarking import find_regressions, percentile
+from tsa_products.models import Category, Order, Product
+
+
+class BenchmarkEndpointsTestCase(TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output_dir.cleanup)
+        self.output = os.path.join(self.output_dir.name, "results.json")
+
+    def run_benchmark(self, *args):
+        call_command(
+            "benchmark_endpoints",
+            "--in-place",
+            "--products=10",
+            "--orders=5",
+            "--comments=5",
+            "--iterations=2",
+            f"--output={self.output}",
+            *args,
+            stdout=StringIO(),
+        )
+        with open(self.output) as output:
+            return json.load(output)
+
+    def test_success_percentile(self):
+        """Tests the nearest-rank percentile."""
+        self.assertEqual(percentile(list(range(1, 101)), 0.95), 95)
+        self.assertEqual(percentile([3.0], 0.99), 3.0)
+
+    def test_success_benchmark_covers_every_route(self):
+        """Tests that the benchmark seeds the database and measures every route."""
+        report = self.run_benchmark()
+        self.assertTrue(Category.objects.filter(title="Truck Sign").exists())
+        self.assertGreaterEqual(Product.objects.count(), 10)
+        self.assertGreaterEqual(Order.objects.count(), 5)
+        self.assertEqual(report["meta"]["dataset"]["products"], 10)
+        routes = report["routes"]
+        self.assertIn("categories-api GET", routes)
+        self.assertIn("order-payment-api POST", routes)
+        self.assertIn("order-export-api GET", routes)
+        # the staff user of the export route is removed again
+        self.assertFalse(User.objects.exists())
+        for route, measurement in routes.items():
+            with self.subTest(route=route):
+                self.assertLess(measurement["status"], 400)
+                self.assertLessEqual(measurement["p50_ms"], measurement["p95_ms"])
+
+    @override_settings(STORAGES={"default": {"BACKEND": "tsa_products.tests.unreachable.MediaStorage"}})
+    def test_success_benchmark_uploads_stay_local(self):
+        """Tests that the benchmark uploads to a temporary directory instead of the configured media storage."""
+        routes = self.run_benchmark()["routes"]
+        self.assertEqual(routes["upload-customer-image-api POST"]["status"], 200)
+
+    def test_failure_query_regression_against_baseline(self):
+        """Tests that a query count above the baseline fails the benchmark."""
+        baseline = os.path.join(self.output_dir.name, "baseline.json")
+        with open(baseline, "w") as baseline_file:
+            json.dump(
+                {"routes": {"products-api GET": {"queries": 0, "cold_queries": 0, "p95_ms": 1000.0}}}, baseline_file
+            )
+        with self.assertRaisesMessage(CommandError, "products-api GET: cold_queries 0 -> 2"):
+            self.run_benchmark(f"--baseline={baseline}")
+
+    def test_success_p95_regression_threshold(self):
+        """Tests that p95 regressions are only reported above the allowed ratio."""
+        baseline = {"route": {"queries": 1, "cold_queries": 1, "p95_ms": 10.0}}
+        results = {"route": {"queries": 1, "cold_queries": 1, "p95_ms": 11.0}}
+        self.assertEqual(find_regressions(results, baseline, max_p95_regression=0.2), [])
+        self.assertEqual(find_regressions(results, baseline, max_p95_regression=0.05), ["route: p95 10.0ms -> 11.0ms"])
@@ -0,0 +1,100 @@
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tsa_products.cache import CATALOG_VERSION_KEY, bump_catalog_version, get_catalog_version
+from tsa_products.models import Category, LetteringItemCategory, Product, ProductColor
+
+
+class CatalogCacheTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="Truck Sign", image="test-path")
+        self.test_product = Product.objects.create(category=self.test_category, title="test-title")
+        self.test_product_color = ProductColor.objects.create(color_nickname="test-color-name")
+        self.test_lettering_item_category = LetteringItemCategory.objects.create(title="test")
+
+    def setUp(self):
+        # Clears the catalog cache to ensure a clean state before each test.
+        cache.clear()
+
+    def assert_served_from_cache(self, url):
+        first_response = self.client.get(url)
+        with self.assertNumQueries(0):
+            second_response = self.client.get(url)
+        self.assertEqual(first_response.json(), second_response.json())
+
+    def test_success_catalog_views_are_served_from_cache(self):
+        """Tests that repeated catalog requests do not hit the database."""
+        for url_name in [
+            "categories-api",
+            "lettering-item-categories-api",
+            "products-api",
+            "product-color-api",
+            "truck-logo-list-api",
+        ]:
+            with self.subTest(url_name=url_name):
+                self.assert_served_from_cache(reverse(f"trucks-signs-namespace:{url_name}"))
+
+    def test_success_unread_query_parameters_share_the_cache_entry(self):
+        """Tests that query parameters the catalog views do not read neither miss the cache nor show in links."""
+        Product.objects.create(category=self.test_category, title="other-title")
+        url = reverse("trucks-signs-namespace:products-api")
+        self.client.get(url, {"x": "first"})
+        self.client.get(url, {"page_size": 1, "x": "first"})
+        with self.assertNumQueries(0):
+            self.client.get(url, {"x": "other"})
+            self.client.get(url)
+            response = self.client.get(url, {"x": "other", "page_size": 1})
+        self.assertNotIn("x=", response.json()["next"])
+        self.assertIn("page_size=1", response.json()["next"])
+
+    def test_success_catalog_change_bumps_version(self):
+        """Tests that saving and deleting catalog models invalidates cached payloads."""
+        url = reverse("trucks-signs-namespace:products-api")
+        self.assertEqual(len(self.client.get(url).json()), 1)
+
+        version = get_catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            product = Product.objects.create(category=self.test_category, title="new-title")
+        self.assertNotEqual(get_catalog_version(), version)
+        self.assertEqual(len(self.client.get(url).json()), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product.delete()
+        self.assertEqual(len(self.client.get(url).json()), 1)
+
+    def test_success_queryset_update_keeps_version(self):
+        """Tests that a queryset update() does not invalidate the catalog, it sends no signals (known limitation)."""
+        version = get_catalog_version()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            Category.objects.filter(pk=self.test_category.pk).update(title="not-signalled")
+        self.assertEqual(callbacks, [])
+        self.assertEqual(get_catalog_version(), version)
+
+    def test_success_version_expires_in_per_process_cache(self):
+        """Tests that the catalog version only expires when the cache is not shared by the workers."""
+        with self.settings(CATALOG_CACHE_SHARED=True, CATALOG_CACHE_TIMEOUT=0):
+            version = bump_catalog_version()
+            self.assertEqual(cache.get(CATALOG_VERSION_KEY), version)
+        with self.settings(CATALOG_CACHE_SHARED=False, CATALOG_CACHE_TIMEOUT=0):
+            bump_catalog_version()
+            self.assertIsNone(cache.get(CATALOG_VERSION_KEY))
+
+    def test_success_not_found_is_not_cached(self):
+        """Tests that error responses are not stored in the catalog cache."""
+        url = reverse("trucks-signs-namespace:product-detail-api", kwargs={"id": 0})
+        self.assertEqual(self.client.get(url).status_code, 404)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_success_file_based_cache(self):
+        """Tests that the catalog cache works with the file-based cache backend."""
+        with tempfile.TemporaryDirectory() as cache_dir:
+            file_cache = {
+                "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": cache_dir}
+            }
+            with override_settings(CACHES=file_cache):
+                self.assert_served_from_cache(reverse("trucks-signs-namespace:categories-api"))
@@ -0,0 +1,115 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tsa_products.models import Category, LetteringItemCategory, Product, ProductColor
+
+
+class CatalogSnapshotTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="Truck Sign", image="uploads/categories/test.png")
+        self.test_other_category = Category.objects.create(title="Other")
+        self.test_product = Product.objects.create(
+            category=self.test_category, title="test-title", image="uploads/products/test.png"
+        )
+        ProductColor.objects.create(color_nickname="red", color_in_hex="#ff0000")
+        LetteringItemCategory.objects.create(title="test-lettering")
+
+    def setUp(self):
+        cache.clear()
+        self.snapshot_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.snapshot_dir.cleanup)
+        self.root = Path(self.snapshot_dir.name)
+
+    def write_snapshot(self):
+        call_command("snapshot_catalog", f"--root={self.root}", "--base-url=http://testserver", stdout=StringIO())
+        return json.loads((self.root / "manifest.json").read_text())
+
+    def test_success_snapshot_matches_api(self):
+        """Tests that the snapshot files hold the same bytes the catalog routes answer with."""
+        manifest = self.write_snapshot()
+        expected_paths = [
+            reverse(f"trucks-signs-namespace:{name}")
+            for name in ["categories-api", "lettering-item-categories-api", "product-color-api", "truck-logo-list-api"]
+        ]
+        expected_paths += [
+            reverse("trucks-signs-namespace:product-category-api", kwargs={"id": category.id})
+            for category in [self.test_category, self.test_other_category]
+        ]
+        self.assertCountEqual(manifest["files"], expected_paths)
+        for path, file in manifest["files"].items():
+            with self.subTest(path=path):
+                self.assertEqual((self.root / file).read_bytes(), self.client.get(path).content)
+
+    def test_success_snapshot_files_are_content_hashed(self):
+        """Tests that unchanged payloads keep their file and that files older than the previous manifest are removed."""
+        categories_path = reverse("trucks-signs-namespace:categories-api")
+        colors_path = reverse("trucks-signs-namespace:product-color-api")
+        first = self.write_snapshot()
+
+        Category.objects.filter(pk=self.test_other_category.pk).update(title="Renamed")
+        cache.clear()
+        second = self.write_snapshot()
+        self.assertNotEqual(second["files"][categories_path], first["files"][categories_path])
+        self.assertEqual(second["files"][colors_path], first["files"][colors_path])
+        # clients holding the previous manifest can still fetch its files
+        self.assertTrue((self.root / first["files"][categories_path]).exists())
+
+        Category.objects.filter(pk=self.test_other_category.pk).update(title="Renamed again")
+        cache.clear()
+        self.write_snapshot()
+        self.assertFalse((self.root / first["files"][categories_path]).exists())
+
+    @override_settings(CATALOG_SNAPSHOT_AUTO=True)
+    def test_success_snapshot_written_once_per_transaction(self):
+        """Tests that catalog changes write the snapshot once when their transaction commits."""
+        with (
+            mock.patch("tsa_products.snapshot.write_catalog_snapshot") as write_catalog_snapshot,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            with transaction.atomic():
+                Product.objects.create(category=self.test_category, title="test-new-1")
+                Product.objects.create(category=self.test_category, title="test-new-2")
+        write_catalog_snapshot.assert_called_once_with()
+
+    @override_settings(CATALOG_SNAPSHOT_AUTO=True)
+    def test_success_snapshot_written_after_rolled_back_change(self):
+        """Tests that a rolled back savepoint does not keep a later change from writing the snapshot."""
+        with (
+            mock.patch("tsa_products.snapshot.write_catalog_snapshot") as write_catalog_snapshot,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        Product.objects.create(category=self.test_category, title="test-rolled-back")
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+                Product.objects.create(category=self.test_category, title="test-new")
+        write_catalog_snapshot.assert_called_once_with()
+
+    @override_settings(API_UNPAGINATED_MAX_RESULTS=1)
+    def test_failure_truncated_list(self):
+        """Tests that a list longer than the unpaginated routes answer with fails the snapshot instead of being cut."""
+        with self.assertRaisesMessage(CommandError, "its snapshot would be truncated"):
+            self.write_snapshot()
+        self.assertFalse((self.root / "manifest.json").exists())
+
+    def test_success_snapshot_not_written_by_default(self):
+        """Tests that catalog changes do not write the snapshot unless CATALOG_SNAPSHOT_AUTO is enabled."""
+        with (
+            mock.patch("tsa_products.snapshot.write_catalog_snapshot") as write_catalog_snapshot,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            ProductColor.objects.create(color_nickname="blue", color_in_hex="#0000ff")
+        write_catalog_snapshot.assert_not_called()
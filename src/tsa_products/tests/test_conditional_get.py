@@ -0,0 +1,65 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from tsa_products.models import Category, Comment, Order, Product, ProductVariation
+
+
+class ConditionalGetTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="Truck Sign", image="test-path")
+        self.test_product = Product.objects.create(category=self.test_category, title="test-title")
+        self.test_order = Order.objects.create(
+            user_email="test-email", product=ProductVariation.objects.create(product=self.test_product)
+        )
+        Comment.objects.create(user_email="test-email", image="test-path", visible=True)
+
+    def setUp(self):
+        # Clears the catalog cache to ensure a clean state before each test.
+        cache.clear()
+
+    def test_success_catalog_views_send_validators(self):
+        """Tests that catalog views send a strong ETag and a Last-Modified header."""
+        response = self.client.get(reverse("trucks-signs-namespace:categories-api"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+    def test_success_catalog_if_none_match_skips_database(self):
+        """Tests that a matching If-None-Match is answered with 304 without any query."""
+        url = reverse("trucks-signs-namespace:products-api")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_success_catalog_etag_changes_with_catalog(self):
+        """Tests that a catalog change invalidates previously sent ETags."""
+        url = reverse("trucks-signs-namespace:products-api")
+        etag = self.client.get(url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(category=self.test_category, title="new-title")
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_success_catalog_if_modified_since(self):
+        """Tests that Last-Modified can be used for conditional requests."""
+        url = reverse("trucks-signs-namespace:categories-api")
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, headers={"if-modified-since": last_modified})
+        self.assertEqual(response.status_code, 304)
+
+    def test_success_order_and_comment_views_use_content_etag(self):
+        """Tests that the remaining GET views answer conditional requests from a content hash."""
+        for url in [
+            reverse("trucks-signs-namespace:retrieve-order-api", kwargs={"id": self.test_order.id}),
+            reverse("trucks-signs-namespace:order-payment-api", kwargs={"id": self.test_order.id}),
+            reverse("trucks-signs-namespace:comments-api"),
+        ]:
+            with self.subTest(url=url):
+                etag = self.client.get(url)["ETag"]
+                response = self.client.get(url, headers={"if-none-match": etag})
+                self.assertEqual(response.status_code, 304)
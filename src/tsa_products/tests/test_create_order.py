@@ -0,0 +1,80 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from tsa_products.models import (
+    Category,
+    LetteringItemCategory,
+    LetteringItemVariation,
+    Order,
+    Product,
+    ProductColor,
+    ProductVariation,
+)
+
+
+class CreateOrderTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_product = Product.objects.create(
+            category=Category.objects.create(title="test", image="test-path", base_price=10.0), title="test-title"
+        )
+        self.test_product_color = ProductColor.objects.create(color_nickname="test-color-name")
+        self.test_lettering_item_categories = [
+            LetteringItemCategory.objects.create(title=f"test-{index}", price=1.0) for index in range(5)
+        ]
+        self.test_url = reverse("trucks-signs-namespace:create-order-api", kwargs={"id": self.test_product.id})
+
+    def build_payload(self, amount_of_lettering_items):
+        return {
+            "product_color_id": self.test_product_color.id,
+            "lettering_items": [
+                {"title": f"test-{index}", "text": f"lettering-{index}"} for index in range(amount_of_lettering_items)
+            ]
+            + [{"title": "test-0", "text": "  "}],
+            "order": {"user_email": "test@example.com"},
+        }
+
+    def test_successful_order_creation(self):
+        """Tests that an order is created with its variation and non-blank lettering items."""
+        response = self.client.post(self.test_url, self.build_payload(3), content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        product_variation = ProductVariation.objects.get()
+        self.assertEqual(product_variation.product_color, self.test_product_color)
+        self.assertEqual(product_variation.get_all_lettering_items().count(), 3)
+        self.assertEqual(Order.objects.get().product, product_variation)
+        self.assertEqual(response.json()["Result"]["product"]["total_price"], 13.0)
+
+    def test_success_order_creation_uses_constant_queries(self):
+        """Tests that the amount of queries does not depend on the amount of lettering items."""
+        with self.assertNumQueries(11):
+            self.client.post(self.test_url, self.build_payload(1), content_type="application/json")
+        with self.assertNumQueries(11):
+            self.client.post(self.test_url, self.build_payload(5), content_type="application/json")
+
+    def test_failure_order_creation_with_unknown_lettering_item_category(self):
+        """Tests that an unknown lettering item category leaves no rows behind."""
+        payload = self.build_payload(2)
+        payload["lettering_items"].append({"title": "unknown", "text": "lettering"})
+        response = self.client.post(self.test_url, payload, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ProductVariation.objects.count(), 0)
+        self.assertEqual(LetteringItemVariation.objects.count(), 0)
+
+    def test_failure_order_creation_with_invalid_order_data(self):
+        """Tests that invalid order data leaves no rows behind."""
+        payload = self.build_payload(2)
+        payload["order"] = {"user_email": "not-an-email"}
+        response = self.client.post(self.test_url, payload, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ProductVariation.objects.count(), 0)
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_failure_order_creation_with_non_object_body(self):
+        """Tests that a JSON body which is not an object is rejected without writing anything."""
+        for payload in ["[1]", '"text"', "1"]:
+            with self.subTest(payload=payload):
+                response = self.client.post(self.test_url, payload, content_type="application/json")
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("non_field_errors", response.json())
+        self.assertEqual(ProductVariation.objects.count(), 0)
+        self.assertEqual(Order.objects.count(), 0)
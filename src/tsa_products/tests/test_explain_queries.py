@@ -0,0 +1,51 @@
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+
+from tsa_products.models import Comment, Order, Product, UploadTask
+from tsa_products.seeding import seed_catalog, seed_comments, seed_orders
+
+
+class ExplainQueriesTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        catalog = seed_catalog(categories=3, products=20, colors=2, lettering_categories=3)
+        seed_orders(catalog["products"], catalog["colors"], catalog["lettering_categories"], orders=20)
+        seed_comments(20)
+
+    def explain(self, *names):
+        stdout = StringIO()
+        call_command("explain_queries", *names, stdout=stdout)
+        return stdout.getvalue()
+
+    def test_success_lookup_indexes_exist(self):
+        """Tests that the migrations create the lookup indexes."""
+        with connection.cursor() as cursor:
+            for model, index in [
+                (Product, "product_catalog_idx"),
+                (Order, "order_user_email_idx"),
+                (Order, "order_ordered_date_idx"),
+                (Comment, "comment_visible_idx"),
+                (UploadTask, "uploadtask_open_idx"),
+            ]:
+                constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+                self.assertIn(index, constraints)
+
+    def test_success_every_view_is_explained(self):
+        """Tests that the command prints a plan for the main query of the views."""
+        output = self.explain()
+        for name in ["categories-api", "products-api", "truck-logo-list-api", "comments-api", "process_uploads claim"]:
+            self.assertIn(name, output)
+
+    def test_success_filtered_queries_use_indexes(self):
+        """Tests that the title lookups and the comment listing are served by the new indexes."""
+        self.assertIn("category_title_idx", self.explain("truck-logo-list-api"))
+        self.assertIn("lettering_category_title_idx", self.explain("create-order-api lettering categories"))
+        self.assertIn("comment_visible_idx", self.explain("comments-api"))
+
+    def test_failure_unknown_query(self):
+        """Tests that unknown query names are rejected."""
+        with self.assertRaises(CommandError):
+            self.explain("unknown-api")
@@ -0,0 +1,70 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tsa_products.models import Category, Product
+
+
+class FastSerializersTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(
+            title="Truck Sign", image="uploads/categories/truck sign ü.png", base_price=12, height=1.5
+        )
+        self.test_empty_category = Category.objects.create(title="Empty", image="")
+        for index in range(5):
+            Product.objects.create(
+                category=self.test_category,
+                title=f"test-title-{index}",
+                image=f"uploads/products/product #{index}.png" if index % 2 else "",
+                detail_image="uploads/products_detail/detail.jpg",
+                is_uploaded=index == 4,
+            )
+        Product.objects.create(category=self.test_empty_category, title="test-empty")
+        # derivatives of some images exist, others are still waiting for the worker
+        Category.objects.filter(pk=self.test_category.pk).update(image_variants_ready={"image": "uploads/x.png"})
+        Product.objects.filter(image__endswith="#1.png").update(
+            image_variants_ready={"image": "uploads/products/product #1.png"}
+        )
+
+    def setUp(self):
+        # Clears the catalog cache so both serialization paths build their response.
+        cache.clear()
+
+    def get_content(self, url, fast, **params):
+        cache.clear()
+        with override_settings(CATALOG_FAST_SERIALIZATION=fast):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def assert_parity(self, url, **params):
+        self.assertEqual(self.get_content(url, True, **params), self.get_content(url, False, **params))
+
+    def test_success_list_parity(self):
+        """Tests that the fast path renders the same bytes as the DRF serializers."""
+        urls = [reverse(f"trucks-signs-namespace:{name}") for name in ["categories-api", "products-api"]]
+        urls += [
+            reverse("trucks-signs-namespace:truck-logo-list-api"),
+            reverse("trucks-signs-namespace:product-category-api", kwargs={"id": self.test_category.id}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assert_parity(url)
+
+    def test_success_paginated_parity(self):
+        """Tests that cursor paginated pages are the same with both serialization paths."""
+        url = reverse("trucks-signs-namespace:products-api")
+        self.assert_parity(url, page_size=2)
+        next_page = self.client.get(url, {"page_size": 2}).json()["next"]
+        with override_settings(CATALOG_FAST_SERIALIZATION=True):
+            fast = self.client.get(next_page).content
+        cache.clear()
+        with override_settings(CATALOG_FAST_SERIALIZATION=False):
+            slow = self.client.get(next_page).content
+        self.assertEqual(fast, slow)
+
+    def test_success_fast_path_query_count(self):
+        """Tests that the fast product list needs one query for products and one for their categories."""
+        with override_settings(CATALOG_FAST_SERIALIZATION=True), self.assertNumQueries(2):
+            self.client.get(reverse("trucks-signs-namespace:products-api"))
@@ -0,0 +1,60 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count, Max, Min
+from django.test import TestCase
+
+from tsa_products.models import Category, Comment, LetteringItemVariation, Order, Product, ProductVariation
+
+
+class GenerateDataTestCase(TestCase):
+    def generate(self, *args):
+        out = StringIO()
+        call_command(
+            "generate_data",
+            "--categories=3",
+            "--products=40",
+            "--colors=5",
+            "--lettering-categories=4",
+            "--orders=300",
+            "--comments=25",
+            "--batch-size=100",
+            *args,
+            stdout=out,
+        )
+        return out.getvalue()
+
+    def test_success_generates_requested_volumes(self):
+        """Tests that the requested amount of rows is generated and every order is priced."""
+        self.generate()
+        self.assertEqual(Category.objects.count(), 3)
+        self.assertEqual(Product.objects.count(), 40)
+        self.assertEqual(Comment.objects.count(), 25)
+        self.assertEqual(Order.objects.count(), 300)
+        self.assertEqual(ProductVariation.objects.filter(total_price__isnull=True).count(), 0)
+        self.assertGreater(LetteringItemVariation.objects.count(), 300)
+
+    def test_success_orders_follow_distributions(self):
+        """Tests that popular products are ordered more often and order dates are spread."""
+        self.generate("--spread-days=30")
+        orders_per_product = list(
+            ProductVariation.objects.values("product").annotate(orders=Count("id")).order_by("-orders")
+        )
+        self.assertGreater(orders_per_product[0]["orders"], orders_per_product[-1]["orders"])
+        dates = Order.objects.aggregate(first=Min("ordered_date"), last=Max("ordered_date"))
+        self.assertGreater((dates["last"] - dates["first"]).days, 7)
+        self.assertLessEqual((dates["last"] - dates["first"]).days, 30)
+
+    def test_success_existing_required_category_is_reused(self):
+        """Tests that generating data twice keeps a single category of each title the views look up."""
+        self.generate()
+        self.generate()
+        self.assertEqual(Category.objects.filter(title="Truck Sign").count(), 1)
+        self.assertEqual(Category.objects.count(), 5)
+        self.assertTrue(Order._meta.get_field("ordered_date").auto_now_add)
+
+    def test_success_parallel_workers_fall_back_on_sqlite(self):
+        """Tests that parallel workers are not used with sqlite."""
+        output = self.generate("--workers=4")
+        self.assertIn("sqlite serializes writes", output)
+        self.assertEqual(Order.objects.count(), 300)
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from tsa_products.models import (
+    Category,
+    IdempotencyKey,
+    LetteringItemCategory,
+    Order,
+    Product,
+    ProductColor,
+    ProductVariation,
+)
+from tsa_products.serializers import OrderSerializer
+
+
+class IdempotencyTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_product = Product.objects.create(
+            category=Category.objects.create(title="test", image="test-path", base_price=10.0), title="test-title"
+        )
+        self.test_product_color = ProductColor.objects.create(color_nickname="test-color-name")
+        LetteringItemCategory.objects.create(title="test-lettering", price=1.0)
+        self.test_url = reverse("trucks-signs-namespace:create-order-api", kwargs={"id": self.test_product.id})
+        self.test_payload = {
+            "product_color_id": self.test_product_color.id,
+            "lettering_items": [{"title": "test-lettering", "text": "TRUCKING"}],
+            "order": {"user_email": "test@example.com"},
+        }
+
+    def post(self, url, payload, key="test-key"):
+        headers = {"idempotency-key": key} if key is not None else {}
+        return self.client.post(url, payload, content_type="application/json", headers=headers)
+
+    def test_success_retry_replays_response(self):
+        """Tests that a retry with the same key returns the stored response without creating another order."""
+        first = self.post(self.test_url, self.test_payload)
+        second = self.post(self.test_url, self.test_payload)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertFalse(first.has_header("Idempotent-Replayed"))
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(ProductVariation.objects.count(), 1)
+
+    def test_success_requests_without_key_are_not_deduplicated(self):
+        """Tests that requests without the header and with different keys each create an order."""
+        self.post(self.test_url, self.test_payload, key=None)
+        self.post(self.test_url, self.test_payload, key=None)
+        self.post(self.test_url, self.test_payload, key="other-key")
+        self.assertEqual(Order.objects.count(), 3)
+        self.assertEqual(IdempotencyKey.objects.count(), 1)
+
+    def test_success_expired_key_is_used_again(self):
+        """Tests that a request with an expired key does the work again."""
+        self.post(self.test_url, self.test_payload)
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.post(self.test_url, self.test_payload)
+        self.assertFalse(response.has_header("Idempotent-Replayed"))
+        self.assertEqual(Order.objects.count(), 2)
+
+    def test_success_batch_and_payment_replay(self):
+        """Tests that batch order creation and payments are not executed again for a retry."""
+        batch_url = reverse("trucks-signs-namespace:batch-create-order-api")
+        batch_payload = [{**self.test_payload, "product_id": self.test_product.id}] * 2
+        self.post(batch_url, batch_payload)
+        self.post(batch_url, batch_payload)
+        self.assertEqual(Order.objects.count(), 2)
+
+        payment_url = reverse("trucks-signs-namespace:order-payment-api", kwargs={"id": Order.objects.first().id})
+        payment_payload = {"order": {"user_first_name": "test-name"}}
+        with mock.patch.object(OrderSerializer, "save", autospec=True, side_effect=OrderSerializer.save) as save:
+            first = self.post(payment_url, payment_payload)
+            second = self.post(payment_url, payment_payload)
+        self.assertEqual(save.call_count, 1)
+        self.assertEqual(second.json(), first.json())
+
+    def test_failure_key_reused_for_another_request(self):
+        """Tests that a key sent with a different payload is rejected."""
+        self.post(self.test_url, self.test_payload)
+        response = self.post(self.test_url, {**self.test_payload, "order": {"user_email": "other@example.com"}})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failure_error_responses_are_not_stored(self):
+        """Tests that an invalid request leaves no key behind, so the key can be used for the corrected request."""
+        invalid_payload = {**self.test_payload, "lettering_items": [{"title": "unknown", "text": "TRUCKING"}]}
+        self.assertEqual(self.post(self.test_url, invalid_payload).status_code, 400)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.post(self.test_url, self.test_payload).status_code, 200)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_failure_invalid_key(self):
+        """Tests that an empty or too long key is rejected."""
+        for key in ["", "k" * 256]:
+            with self.subTest(length=len(key)):
+                self.assertEqual(self.post(self.test_url, self.test_payload, key=key).status_code, 400)
+        self.assertEqual(Order.objects.count(), 0)
+
+    def test_success_purge_expired_keys(self):
+        """Tests that the purge command deletes the expired keys only."""
+        self.post(self.test_url, self.test_payload, key="expired")
+        self.post(self.test_url, self.test_payload, key="current")
+        IdempotencyKey.objects.filter(key="expired").update(expires_at=timezone.now() - timedelta(seconds=1))
+        call_command("purge_idempotency_keys", stdout=StringIO())
+        self.assertEqual(list(IdempotencyKey.objects.values_list("key", flat=True)), ["current"])
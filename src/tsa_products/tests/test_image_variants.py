@@ -0,0 +1,172 @@
+import io
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from tsa_products.images import IMAGE_VARIANTS, variant_name
+from tsa_products.models import Category, ImageVariantTask, Product
+
+TEST_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def build_test_image(size=(1200, 600), mode="RGBA"):
+    content = io.BytesIO()
+    Image.new(mode, size, (255, 0, 0, 128) if mode == "RGBA" else "red").save(content, format="PNG")
+    return ContentFile(content.getvalue())
+
+
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT)
+class ImageVariantsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="Truck Sign", image="test-path")
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        # Clears the catalog cache to ensure a clean state before each test.
+        cache.clear()
+
+    def variant_path(self, name, variant):
+        return os.path.join(TEST_MEDIA_ROOT, variant_name(name, variant))
+
+    def process_tasks(self):
+        call_command("process_uploads", "--once", stdout=StringIO())
+
+    def test_success_variants_are_generated_in_background(self):
+        """Tests that saving a product with an image queues a task that creates every derivative."""
+        product = Product(category=self.test_category, title="test-title")
+        product.image.save("logo.png", build_test_image(), save=False)
+        product.save()
+        self.assertFalse(os.path.exists(self.variant_path(product.image.name, "thumbnail")))
+
+        self.process_tasks()
+        task = ImageVariantTask.objects.get(model_name="Product", object_id=product.id)
+        self.assertEqual(task.status, "done")
+        for variant, options in IMAGE_VARIANTS.items():
+            with Image.open(self.variant_path(product.image.name, variant)) as image:
+                self.assertEqual(image.format, options["format"])
+                self.assertLessEqual(image.width, options["size"][0])
+                self.assertLessEqual(image.height, options["size"][1])
+
+    def test_success_serializers_expose_variant_urls(self):
+        """Tests that the product serializer exposes absolute urls of the derivatives once they exist."""
+        product = Product.objects.create(category=self.test_category, title="test-title", image="uploads/a.png")
+        url = reverse("trucks-signs-namespace:product-detail-api", kwargs={"id": product.id})
+        data = self.client.get(url).json()
+        self.assertEqual(data["image_variants"], dict.fromkeys(IMAGE_VARIANTS, "http://testserver/media/uploads/a.png"))
+        self.assertNotIn("image_variants_ready", data)
+
+        Product.objects.filter(pk=product.pk).update(image_variants_ready={"image": "uploads/a.png"})
+        cache.clear()
+        data = self.client.get(url).json()
+        self.assertEqual(
+            data["image_variants"],
+            {
+                "thumbnail": "http://testserver/media/uploads/variants/a_thumbnail.jpg",
+                "medium": "http://testserver/media/uploads/variants/a_medium.jpg",
+                "webp": "http://testserver/media/uploads/variants/a_webp.webp",
+            },
+        )
+        self.assertIsNone(data["detail_image_variants"])
+        self.assertEqual(data["category"]["image_variants"]["thumbnail"], "http://testserver/media/test-path")
+
+    def test_success_worker_marks_variants_ready(self):
+        """Tests that the worker marks the images whose derivatives it created, rejected images keep the original."""
+        product = Product(category=self.test_category, title="test-title")
+        product.image.save("ready.png", build_test_image(), save=False)
+        product.detail_image.save("broken.png", ContentFile(b"not an image"), save=False)
+        product.save()
+        with self.assertLogs("tsa_products.images", "WARNING"):
+            self.process_tasks()
+
+        product.refresh_from_db()
+        self.assertEqual(product.image_variants_ready, {"image": product.image.name})
+        data = self.client.get(reverse("trucks-signs-namespace:product-detail-api", kwargs={"id": product.id})).json()
+        self.assertTrue(data["image_variants"]["thumbnail"].endswith("_thumbnail.jpg"))
+        self.assertEqual(data["detail_image_variants"]["thumbnail"], data["detail_image"])
+
+    def test_success_saves_without_images_are_not_queued(self):
+        """Tests that instances without images and saves of other fields queue no task."""
+        product = Product.objects.create(category=self.test_category, title="test-title")
+        Product.objects.create(category=self.test_category, title="test-title", image="uploads/a.png").save(
+            update_fields=["title"]
+        )
+        self.assertFalse(ImageVariantTask.objects.filter(model_name="Product", object_id=product.id).exists())
+        self.assertEqual(ImageVariantTask.objects.filter(model_name="Product").count(), 1)
+
+    def test_success_unchanged_images_are_not_queued(self):
+        """Tests that saving a loaded instance queues a task only when one of its images changed."""
+        product = Product.objects.create(category=self.test_category, title="test-title", image="uploads/a.png")
+        product = Product.objects.get(pk=product.pk)
+        product.title = "other-title"
+        product.save()
+        Product.objects.only("title").get(pk=product.pk).save(update_fields=["title"])
+        self.assertEqual(ImageVariantTask.objects.filter(model_name="Product", object_id=product.id).count(), 1)
+
+        product.detail_image = "uploads/detail.png"
+        product.save()
+        product.save()
+        self.assertEqual(ImageVariantTask.objects.filter(model_name="Product", object_id=product.id).count(), 2)
+
+    def test_success_fixtures_are_not_queued(self):
+        """Tests that loading fixtures queues no task."""
+        fixture = os.path.join(TEST_MEDIA_ROOT, "products.json")
+        with open(fixture, "w") as fixture_file:
+            fixture_file.write(
+                '[{"model": "tsa_products.product", "pk": 9999, "fields": '
+                f'{{"category": {self.test_category.pk}, "title": "test-title", "image": "uploads/a.png"}}}}]'
+            )
+        call_command("loaddata", fixture, verbosity=0)
+        self.assertFalse(ImageVariantTask.objects.filter(model_name="Product", object_id=9999).exists())
+
+    def test_success_missing_original_is_skipped(self):
+        """Tests that images which do not exist in the storage do not fail the task."""
+        Product.objects.create(category=self.test_category, title="test-title", image="uploads/missing.png")
+        self.process_tasks()
+        self.assertFalse(os.path.exists(self.variant_path("uploads/missing.png", "thumbnail")))
+        self.assertFalse(ImageVariantTask.objects.exclude(status="done").exists())
+
+    def test_failure_storage_error_is_retried(self):
+        """Tests that a storage error leaves the saved instance alone and the task pending for another attempt."""
+        product = Product(category=self.test_category, title="test-title")
+        product.image.save("retry.png", build_test_image(), save=False)
+        with mock.patch("tsa_products.images.render_variant", side_effect=RuntimeError("storage unavailable")):
+            product.save()
+            with self.assertLogs("tsa_products.uploads", "ERROR"):
+                self.process_tasks()
+        task = ImageVariantTask.objects.get(model_name="Product", object_id=product.id)
+        self.assertEqual(task.status, "pending")
+        self.assertEqual(task.error, "storage unavailable")
+
+        self.process_tasks()
+        task.refresh_from_db()
+        self.assertEqual(task.status, "done")
+        self.assertTrue(os.path.exists(self.variant_path(product.image.name, "thumbnail")))
+
+    def test_success_backfill_command(self):
+        """Tests that the management command creates derivatives for existing images."""
+        product = Product(category=self.test_category, title="test-title")
+        product.image.save("backfill.png", build_test_image(mode="RGB"), save=False)
+        Product.objects.bulk_create([product])
+
+        call_command("generate_image_variants", "--model=product", stdout=StringIO())
+        self.assertTrue(os.path.exists(self.variant_path(product.image.name, "thumbnail")))
+
+        modified = os.path.getmtime(self.variant_path(product.image.name, "webp"))
+        out = StringIO()
+        call_command("generate_image_variants", "--model=product", stdout=out)
+        self.assertIn("generated 0 image variants, 0 instances failed", out.getvalue())
+        self.assertEqual(os.path.getmtime(self.variant_path(product.image.name, "webp")), modified)
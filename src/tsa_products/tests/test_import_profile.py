@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase
+
+from tsa_products.management.commands.import_profile import parse_import_times
+
+IMPORT_TIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     orjson
+import time:      2500 |       2620 |   tsa_products.renderers
+import time:       800 |       3420 | tsa_app.wsgi
+"""
+
+
+class ImportProfileTestCase(SimpleTestCase):
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output_dir.cleanup)
+        self.output = os.path.join(self.output_dir.name, "imports.json")
+
+    def test_success_parse_import_times(self):
+        """Tests that self and cumulative times and the nesting depth are read from -X importtime output."""
+        modules = parse_import_times(IMPORT_TIME_OUTPUT)
+        self.assertEqual(list(modules), ["orjson", "tsa_products.renderers", "tsa_app.wsgi"])
+        self.assertEqual(modules["tsa_products.renderers"], {"self_ms": 2.5, "cumulative_ms": 2.62, "depth": 1})
+        self.assertEqual(modules["orjson"]["depth"], 2)
+
+    def test_success_import_profile_without_unconfigured_apps(self):
+        """Tests that a worker's cold start is profiled and does not import cloudinary without CLOUD_NAME."""
+        call_command("import_profile", "--runs=1", f"--output={self.output}", stdout=StringIO())
+        with open(self.output) as output:
+            report = json.load(output)
+        self.assertIn("tsa_app.wsgi", report["modules"])
+        self.assertIn("tsa_products.signals", report["modules"])
+        if not settings.CLOUD_NAME:
+            self.assertNotIn("cloudinary", report["modules"])
+        # the test client and the snapshot's request factory are imported by the code using them
+        self.assertNotIn("django.test", report["modules"])
+        self.assertGreater(report["total_ms"], 0)
+
+    def test_failure_import_time_regression(self):
+        """Tests that an import time above the baseline fails the command."""
+        baseline = os.path.join(self.output_dir.name, "baseline.json")
+        with open(baseline, "w") as baseline_file:
+            json.dump({"total_ms": 0.001, "modules": {}}, baseline_file)
+        with self.assertRaises(CommandError):
+            call_command("import_profile", "--runs=1", f"--baseline={baseline}", stdout=StringIO())
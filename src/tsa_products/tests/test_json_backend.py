@@ -0,0 +1,98 @@
+import io
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.functional import lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from tsa_products.models import Category, Order, Product, ProductVariation
+from tsa_products.parsers import FastJSONParser
+from tsa_products.renderers import FastJSONRenderer
+
+
+def build_payload():
+    return {
+        "ordered_date": datetime(2026, 10, 18, 13, 45, 12, 123456),
+        "day": date(2026, 10, 18),
+        "amount": Decimal("12.50"),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "title": lazy(lambda: "Truck Sign", str)(),
+        "prices": {1: 2.5, 2: 10.0},
+        "text": "Größe Zeile",
+        "image": "http://testserver/media/uploads/products/product%20%231.png",
+        "items": [None, True, 1, 1.5, "x"],
+    }
+
+
+class JSONBackendTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="Truck Sign", image="uploads/categories/test.png")
+        self.test_product = Product.objects.create(
+            category=self.test_category, title="test-title", image="uploads/products/test ü.png"
+        )
+        self.test_order = Order.objects.create(
+            user_email="test-email", product=ProductVariation.objects.create(product=self.test_product)
+        )
+
+    def assert_same_rendering(self, data, accepted_media_type=None):
+        self.assertEqual(
+            FastJSONRenderer().render(data, accepted_media_type), JSONRenderer().render(data, accepted_media_type)
+        )
+
+    def test_success_renderer_matches_stdlib_renderer(self):
+        """Tests that datetimes, decimals, lazy strings and line separators are rendered like DRF does."""
+        self.assert_same_rendering(build_payload())
+        self.assert_same_rendering(build_payload(), "application/json; indent=4")
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_success_renderer_matches_stdlib_renderer_for_responses(self):
+        """Tests that product and order responses are rendered byte for byte like DRF does."""
+        for url in [
+            reverse("trucks-signs-namespace:products-api"),
+            reverse("trucks-signs-namespace:retrieve-order-api", kwargs={"id": self.test_order.id}),
+        ]:
+            with self.subTest(url=url):
+                self.assert_same_rendering(self.client.get(url).data)
+
+    def test_success_renderer_without_orjson(self):
+        """Tests that the renderer falls back to the stdlib renderer when orjson is missing."""
+        with mock.patch("tsa_products.renderers.orjson", None):
+            self.assert_same_rendering(build_payload())
+
+    def test_success_renderer_ensure_ascii(self):
+        """Tests that ASCII only output is rendered like DRF does."""
+        with mock.patch.object(JSONRenderer, "ensure_ascii", True):
+            self.assert_same_rendering(build_payload())
+
+    def test_success_renderer_nan_as_null(self):
+        """Tests that NaN and infinite floats are rendered as null where the stdlib renderer raises."""
+        self.assertEqual(FastJSONRenderer().render([float("nan"), float("inf")]), b"[null,null]")
+        with self.assertRaises(ValueError):
+            JSONRenderer().render([float("nan")])
+
+    def test_success_parser(self):
+        """Tests that the parser returns the same data as the stdlib parser."""
+        body = JSONRenderer().render(build_payload())
+        self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+        with mock.patch("tsa_products.parsers.orjson", None):
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+    def test_failure_parser_rejects_invalid_json(self):
+        """Tests that invalid JSON and NaN are rejected with a parse error."""
+        for body in [b"{", b'{"amount": NaN}']:
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                FastJSONParser().parse(io.BytesIO(body))
+
+    def test_failure_invalid_json_request(self):
+        """Tests that an invalid JSON request body is answered with 400."""
+        response = self.client.post(
+            reverse("trucks-signs-namespace:batch-create-order-api"), data="[{", content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
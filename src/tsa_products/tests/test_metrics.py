@@ -0,0 +1,94 @@
+import shutil
+import tempfile
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from tsa_products.models import Category, Product
+from tsa_products.tests.test_uploads import build_test_image
+
+TEST_UPLOAD_SPOOL_ROOT = tempfile.mkdtemp()
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@override_settings(UPLOAD_SPOOL_ROOT=TEST_UPLOAD_SPOOL_ROOT, METRICS_TOKEN="")
+class MetricsTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="Truck Sign", image="test-path")
+        Product.objects.create(category=self.test_category, title="test-title")
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEST_UPLOAD_SPOOL_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        # Clears the catalog cache so the first request of a test is a cache miss.
+        cache.clear()
+
+    def test_success_request_metrics_by_url_name(self):
+        """Tests that request count, latency and query count are recorded under the url name."""
+        requests = sample("tsa_http_requests_total", method="GET", view="products-api", status="200")
+        latencies = sample("tsa_http_request_duration_seconds_count", view="products-api")
+        queries = sample("tsa_http_request_db_queries_sum", view="products-api")
+
+        self.client.get(reverse("trucks-signs-namespace:products-api"))
+
+        self.assertEqual(
+            sample("tsa_http_requests_total", method="GET", view="products-api", status="200"), requests + 1
+        )
+        self.assertEqual(sample("tsa_http_request_duration_seconds_count", view="products-api"), latencies + 1)
+        self.assertGreater(sample("tsa_http_request_db_queries_sum", view="products-api"), queries)
+
+    def test_success_catalog_cache_hits_and_misses(self):
+        """Tests that catalog cache lookups are counted as hits and misses."""
+        hits = sample("tsa_cache_requests_total", cache="catalog", result="hit")
+        misses = sample("tsa_cache_requests_total", cache="catalog", result="miss")
+
+        self.client.get(reverse("trucks-signs-namespace:categories-api"))
+        self.client.get(reverse("trucks-signs-namespace:categories-api"))
+
+        self.assertEqual(sample("tsa_cache_requests_total", cache="catalog", result="miss"), misses + 1)
+        self.assertEqual(sample("tsa_cache_requests_total", cache="catalog", result="hit"), hits + 1)
+
+    def test_success_upload_sizes(self):
+        """Tests that the size of uploaded images is recorded."""
+        image = build_test_image()
+        uploads = sample("tsa_upload_size_bytes_count", view="queued-upload-customer-image-api")
+        uploaded_bytes = sample("tsa_upload_size_bytes_sum", view="queued-upload-customer-image-api")
+
+        response = self.client.post(
+            reverse("trucks-signs-namespace:queued-upload-customer-image-api"), {"image": image}
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(sample("tsa_upload_size_bytes_count", view="queued-upload-customer-image-api"), uploads + 1)
+        self.assertEqual(
+            sample("tsa_upload_size_bytes_sum", view="queued-upload-customer-image-api"), uploaded_bytes + image.size
+        )
+
+    def test_success_metrics_endpoint(self):
+        """Tests that /metrics exposes the metrics in the Prometheus text format."""
+        self.client.get(reverse("trucks-signs-namespace:products-api"))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        self.assertIn(b'tsa_http_requests_total{method="GET",status="200",view="products-api"}', response.content)
+
+    @override_settings(METRICS_TOKEN="test-token")
+    def test_failure_metrics_endpoint_requires_token(self):
+        """Tests that /metrics requires the configured bearer token."""
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        response = self.client.get(reverse("metrics"), headers={"authorization": "Bearer test-token"})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(MODE="prod")
+    def test_failure_metrics_endpoint_without_token_in_prod(self):
+        """Tests that /metrics is not served in prod when no token is configured."""
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from tsa_products.models import (
+    Category,
+    LetteringItemCategory,
+    LetteringItemVariation,
+    Order,
+    Product,
+    ProductColor,
+    ProductVariation,
+)
+
+
+class OrderExportTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_staff = User.objects.create_user("staff", password="test-password", is_staff=True)
+        self.test_category = Category.objects.create(title="Truck Sign", image="test-path", base_price=10)
+        self.test_product = Product.objects.create(category=self.test_category, title="test-title")
+        self.test_color = ProductColor.objects.create(color_nickname="red", color_in_hex="#ff0000")
+        self.test_item_category = LetteringItemCategory.objects.create(title="Company Name", price=2)
+        self.test_orders = []
+        for day, ordered in [(1, True), (2, False), (3, True)]:
+            variation = ProductVariation.objects.create(product=self.test_product, product_color=self.test_color)
+            LetteringItemVariation.objects.create(
+                lettering_item_category=self.test_item_category, lettering=f"ACME {day}", product_variation=variation
+            )
+            order = Order.objects.create(user_email=f"test-{day}@example.com", product=variation, ordered=ordered)
+            Order.objects.filter(pk=order.pk).update(ordered_date=datetime(2026, 10, day, 12))
+            self.test_orders.append(order)
+        # an order whose product variation was deleted
+        Order.objects.create(user_email="cancelled@example.com", product=None)
+
+    def setUp(self):
+        self.client.force_login(self.test_staff)
+
+    def export(self, export_format, **params):
+        response = self.client.get(
+            reverse("trucks-signs-namespace:order-export-api", kwargs={"export_format": export_format}), params
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_success_csv_export(self):
+        """Tests that the csv export has one row per order with its variation, lettering and total."""
+        rows = list(csv.DictReader(io.StringIO(self.export("csv"))))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["order_id"], str(self.test_orders[0].id))
+        self.assertEqual(rows[0]["color_nickname"], "red")
+        self.assertEqual(rows[0]["lettering"], "Company Name - ACME 1")
+        self.assertEqual(rows[0]["total_price"], "12.0")
+        self.assertEqual(rows[3]["product_variation_id"], "")
+
+    def test_success_csv_export_escapes_formulas(self):
+        """Tests that customer text starting like a spreadsheet formula is written as text, in csv only."""
+        Order.objects.create(user_email='=HYPERLINK("http://example.com")', product=None, comment="@SUM(A1)")
+        row = list(csv.DictReader(io.StringIO(self.export("csv"))))[-1]
+        self.assertEqual(row["user_email"], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(row["comment"], "'@SUM(A1)")
+        self.assertEqual(json.loads(self.export("ndjson").splitlines()[-1])["comment"], "@SUM(A1)")
+
+    def test_success_ndjson_export_with_filters(self):
+        """Tests that the ndjson export is filtered by the inclusive date range and ordered status."""
+        lines = self.export("ndjson", date_from="2026-10-01", date_to="2026-10-02", ordered="true").splitlines()
+        self.assertEqual([json.loads(line)["order_id"] for line in lines], [self.test_orders[0].id])
+        lines = self.export("ndjson", date_from="2026-10-02", date_to="2026-10-03").splitlines()
+        self.assertEqual(len(lines), 2)
+
+    def test_success_export_queries_do_not_grow_with_orders(self):
+        """Tests that the export loads the orders of a chunk and their lettering items with two queries."""
+        with self.assertNumQueries(4):
+            # session, user and the two export queries
+            self.export("csv")
+
+    def test_success_admin_export_action(self):
+        """Tests that the admin action streams the selected orders."""
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "test-password"))
+        response = self.client.post(
+            reverse("admin:tsa_products_order_changelist"),
+            {"action": "export_orders_csv", "_selected_action": [order.id for order in self.test_orders[:2]]},
+        )
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([row["user_email"] for row in rows], ["test-1@example.com", "test-2@example.com"])
+
+    def test_failure_export_requires_staff(self):
+        """Tests that customers cannot export orders."""
+        self.client.logout()
+        response = self.client.get(reverse("trucks-signs-namespace:order-export-api", kwargs={"export_format": "csv"}))
+        self.assertEqual(response.status_code, 403)
+
+    def test_failure_invalid_date_range(self):
+        """Tests that a date range ending before it starts is rejected."""
+        response = self.client.get(
+            reverse("trucks-signs-namespace:order-export-api", kwargs={"export_format": "csv"}),
+            {"date_from": "2026-10-03", "date_to": "2026-10-01"},
+        )
+        self.assertEqual(response.status_code, 400)
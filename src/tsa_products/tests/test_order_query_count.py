@@ -0,0 +1,68 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from tsa_products.models import (
+    Category,
+    LetteringItemCategory,
+    LetteringItemVariation,
+    Order,
+    Product,
+    ProductColor,
+    ProductVariation,
+)
+
+
+class OrderQueryCountTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="test", image="test-path", base_price=10.0)
+        self.test_product = Product.objects.create(category=self.test_category, title="test-title")
+        self.test_product_color = ProductColor.objects.create(color_nickname="test-color-name")
+        self.test_lettering_item_category = LetteringItemCategory.objects.create(title="test", price=2.5)
+        self.test_product_variation = ProductVariation.objects.create(
+            product=self.test_product, product_color=self.test_product_color, amount=2
+        )
+        self.test_order = Order.objects.create(user_email="test-email", product=self.test_product_variation)
+
+    def add_lettering_items(self, amount):
+        for index in range(amount):
+            LetteringItemVariation.objects.create(
+                lettering_item_category=LetteringItemCategory.objects.create(title=f"extra-{index}", price=1.0),
+                lettering=f"test-{index}",
+                product_variation=self.test_product_variation,
+            )
+
+    def assert_query_budget(self, url, budget):
+        with self.assertNumQueries(budget):
+            self.client.get(url)
+        self.add_lettering_items(5)
+        with self.assertNumQueries(budget):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_product_variation_retrieve_query_budget(self):
+        """Tests that retrieving a product variation needs a fixed number of queries."""
+        url = f"/truck-signs/product-variation-retrieve/{self.test_product_variation.id}/"
+        data = self.assert_query_budget(url, 3)
+        self.assertEqual(len(data["all_lettering_items"]), 5)
+        self.assertEqual(data["total_price"], (10.0 + 5 * 1.0) * 2)
+
+    def test_retrieve_order_query_budget(self):
+        """Tests that retrieving an order needs a fixed number of queries."""
+        url = reverse("trucks-signs-namespace:retrieve-order-api", kwargs={"id": self.test_order.id})
+        data = self.assert_query_budget(url, 3)
+        self.assertEqual(data["product"]["product"]["category"]["sample_product_id"], self.test_product.id)
+
+    def test_payment_view_get_query_budget(self):
+        """Tests that the payment view loads the order graph in a fixed number of queries."""
+        url = reverse("trucks-signs-namespace:order-payment-api", kwargs={"id": self.test_order.id})
+        data = self.assert_query_budget(url, 3)
+        self.assertEqual(data["Order"]["product"]["total_price"], (10.0 + 5 * 1.0) * 2)
+
+    def test_total_price_reuses_prefetched_items(self):
+        """Tests that the price computation does not query prefetched lettering items again."""
+        self.add_lettering_items(3)
+        order = Order.objects.with_related().get(id=self.test_order.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(order.get_total_price(), (10.0 + 3 * 1.0) * 2)
@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from tsa_products.models import Category, Comment, Product
+from tsa_products.pagination import OptInCursorPagination
+
+
+class OptInCursorPaginationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="Truck Sign", image="test-path")
+        self.test_products = [
+            Product.objects.create(category=self.test_category, title=f"test-title-{index}") for index in range(5)
+        ]
+        for index in range(5):
+            Comment.objects.create(user_email=f"test-email-{index}", image="test-path", visible=True)
+
+    def setUp(self):
+        # Clears the catalog cache to ensure a clean state before each test.
+        cache.clear()
+
+    def test_success_unpaginated_without_parameters(self):
+        """Tests that clients without pagination parameters still receive a plain list."""
+        response = self.client.get(reverse("trucks-signs-namespace:products-api"))
+        self.assertEqual([product["id"] for product in response.json()], [p.id for p in self.test_products])
+
+    def test_success_unpaginated_list_is_capped(self):
+        """Tests that the unpaginated list is capped at the configured amount of rows."""
+        original_cap = OptInCursorPagination.unpaginated_max_results
+        OptInCursorPagination.unpaginated_max_results = 3
+        self.addCleanup(setattr, OptInCursorPagination, "unpaginated_max_results", original_cap)
+        response = self.client.get(reverse("trucks-signs-namespace:comments-api"))
+        self.assertEqual(len(response.json()), 3)
+
+    def test_success_cursor_pagination_walks_all_pages(self):
+        """Tests that following the next links returns every row exactly once."""
+        url = reverse("trucks-signs-namespace:truck-logo-list-api") + "?page_size=2"
+        seen_ids = []
+        while url:
+            page = self.client.get(url).json()
+            self.assertLessEqual(len(page["results"]), 2)
+            seen_ids += [product["id"] for product in page["results"]]
+            url = page["next"]
+        self.assertEqual(seen_ids, [p.id for p in self.test_products])
+
+    def test_success_page_size_is_limited(self):
+        """Tests that the requested page size cannot exceed the configured maximum."""
+        response = self.client.get(
+            reverse("trucks-signs-namespace:comments-api"),
+            {"page_size": OptInCursorPagination.max_page_size + 1},
+        )
+        self.assertEqual(len(response.json()["results"]), 5)
+        self.assertIsNone(response.json()["next"])
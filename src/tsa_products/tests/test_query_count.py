@@ -0,0 +1,72 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from tsa_products.models import Category, Product
+
+
+class CatalogQueryCountTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.truck_sign_category = Category.objects.create(title="Truck Sign", image="test-path")
+        self.other_category = Category.objects.create(title="Fire Extinguisher", image="test-path")
+        self.empty_category = Category.objects.create(title="empty", image="test-path")
+        for index in range(5):
+            Product.objects.create(category=self.truck_sign_category, title=f"truck-{index}")
+            Product.objects.create(category=self.other_category, title=f"fire-{index}")
+
+    def setUp(self):
+        # Clears the catalog cache so every request below is served from the database.
+        cache.clear()
+
+    def add_catalog_rows(self, amount):
+        # Runs the on-commit catalog invalidation so the next request misses the cache.
+        with self.captureOnCommitCallbacks(execute=True):
+            for index in range(amount):
+                category = Category.objects.create(title=f"extra-{index}", image="test-path")
+                Product.objects.create(category=category, title=f"extra-product-{index}")
+
+    def test_category_list_uses_fixed_number_of_queries(self):
+        """Tests that the category list does not query per category."""
+        url = reverse("trucks-signs-namespace:categories-api")
+        with self.assertNumQueries(1):
+            self.client.get(url)
+        self.add_catalog_rows(10)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()), 13)
+
+    def test_category_list_returns_first_product_as_sample(self):
+        """Tests that the sample product is the first product of each category."""
+        response = self.client.get(reverse("trucks-signs-namespace:categories-api"))
+        sample_ids = {category["title"]: category["sample_product_id"] for category in response.json()}
+        self.assertEqual(
+            sample_ids["Truck Sign"], Product.objects.filter(category=self.truck_sign_category).order_by("pk")[0].pk
+        )
+        self.assertIsNone(sample_ids["empty"])
+
+    def test_product_list_uses_fixed_number_of_queries(self):
+        """Tests that the product list does not query per product or per category."""
+        url = reverse("trucks-signs-namespace:products-api")
+        with self.assertNumQueries(2):
+            self.client.get(url)
+        self.add_catalog_rows(10)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()), 20)
+
+    def test_product_from_category_and_logo_list_use_fixed_number_of_queries(self):
+        """Tests that the filtered product lists do not query per product."""
+        with self.assertNumQueries(2):
+            self.client.get(f"/truck-signs/product-category/{self.other_category.id}/")
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("trucks-signs-namespace:truck-logo-list-api"))
+        self.assertEqual(len(response.json()), 5)
+        self.assertEqual(response.json()[0]["category"]["title"], "Truck Sign")
+
+    def test_product_detail_uses_fixed_number_of_queries(self):
+        """Tests that the product detail loads the annotated category in one extra query."""
+        product = Product.objects.filter(category=self.other_category).first()
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("trucks-signs-namespace:product-detail-api", kwargs={"id": product.id}))
+        self.assertEqual(response.json()["category"]["sample_product_id"], product.id)
@@ -0,0 +1,91 @@
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from tsa_products.models import Category, LetteringItemCategory, LetteringItemVariation, Product, ProductVariation
+
+
+class RepriceOrdersTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="test", image="test-path", base_price=10.0)
+        self.test_product = Product.objects.create(category=self.test_category, title="test-title")
+        self.test_lettering_item_category = LetteringItemCategory.objects.create(title="test", price=2.5)
+
+    def create_order(self):
+        response = self.client.post(
+            reverse("trucks-signs-namespace:create-order-api", kwargs={"id": self.test_product.id}),
+            {
+                "product_color_id": None,
+                "lettering_items": [{"title": "test", "text": "lettering"}],
+                "order": {"user_email": "test@example.com"},
+            },
+            content_type="application/json",
+        )
+        return ProductVariation.objects.get(id=response.json()["Result"]["product"]["id"])
+
+    def test_success_order_creation_stores_total_price(self):
+        """Tests that creating an order stores the total price and its breakdown."""
+        product_variation = self.create_order()
+        self.assertEqual(product_variation.total_price, 12.5)
+        self.assertEqual(
+            product_variation.price_breakdown,
+            {
+                "lines": [
+                    {"title": "test", "price": 10.0},
+                    {"title": "test", "lettering": "lettering", "price": 2.5},
+                ],
+                "unit_price": 12.5,
+                "amount": 1,
+            },
+        )
+
+    def test_success_stored_total_price_is_read_without_queries(self):
+        """Tests that the stored total price is used instead of recalculating it."""
+        product_variation = ProductVariation.objects.get(id=self.create_order().id)
+        with self.assertNumQueries(0):
+            self.assertEqual(product_variation.get_total_price(), 12.5)
+
+    def test_success_reprice_orders_command(self):
+        """Tests that prices only change after running the reprice_orders command."""
+        product_variation = self.create_order()
+        unpriced_variation = ProductVariation.objects.create(product=self.test_product, amount=2)
+        LetteringItemVariation.objects.create(
+            lettering_item_category=self.test_lettering_item_category,
+            lettering="lettering",
+            product_variation=unpriced_variation,
+        )
+        Category.objects.filter(pk=self.test_category.pk).update(base_price=20.0)
+        product_variation.refresh_from_db()
+        self.assertEqual(product_variation.get_total_price(), 12.5)
+
+        call_command("reprice_orders", "--only-unpriced", stdout=StringIO())
+        product_variation.refresh_from_db()
+        unpriced_variation.refresh_from_db()
+        self.assertEqual(product_variation.total_price, 12.5)
+        self.assertEqual(unpriced_variation.total_price, 45.0)
+
+        call_command("reprice_orders", "--batch-size=1", stdout=StringIO())
+        product_variation.refresh_from_db()
+        self.assertEqual(product_variation.total_price, 22.5)
+
+    def test_success_migration_backfills_total_price(self):
+        """Tests that the backfill migration prices the variations created before prices were stored."""
+        product_variation = self.create_order()
+        unpriced_variation = ProductVariation.objects.create(product=self.test_product, amount=2)
+        LetteringItemVariation.objects.create(
+            lettering_item_category=self.test_lettering_item_category,
+            lettering="lettering",
+            product_variation=unpriced_variation,
+        )
+        migration = import_module("tsa_products.migrations.0007_backfill_total_price")
+        migration.backfill_total_price(apps, None)
+
+        unpriced_variation.refresh_from_db()
+        self.assertEqual(unpriced_variation.total_price, 25.0)
+        self.assertEqual(unpriced_variation.price_breakdown, unpriced_variation.calculate_price()[1])
+        self.assertEqual(ProductVariation.objects.get(pk=product_variation.pk).total_price, 12.5)
@@ -0,0 +1,62 @@
+import json
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from tsa_products.models import Category, Product
+
+
+def parse_server_timing(header):
+    metrics = {}
+    for metric in header.split(", "):
+        name, *parameters = metric.split(";")
+        metrics[name] = dict(parameter.split("=", 1) for parameter in parameters)
+    return metrics
+
+
+@override_settings(REQUEST_TIMING_SAMPLE_RATE=1, REQUEST_TIMING_VIEWS=[])
+class RequestTimingTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="Truck Sign", image="test-path")
+        Product.objects.create(category=self.test_category, title="test-title")
+
+    def setUp(self):
+        # Clears the catalog cache so the measured requests query the database.
+        cache.clear()
+
+    def test_success_server_timing_header(self):
+        """Tests that a sampled request reports its phases and query count in a Server-Timing header."""
+        with self.assertLogs("tsa_products.timing", "INFO"):
+            response = self.client.get(reverse("trucks-signs-namespace:products-api"))
+        metrics = parse_server_timing(response["Server-Timing"])
+        self.assertEqual(set(metrics), {"total", "view", "db", "app", "render"})
+        self.assertRegex(metrics["db"]["desc"], r'^"[1-9]\d* queries"$')
+        self.assertGreaterEqual(float(metrics["total"]["dur"]), float(metrics["view"]["dur"]))
+
+    def test_success_structured_log_line(self):
+        """Tests that a sampled request is logged as one JSON object."""
+        with self.assertLogs("tsa_products.timing", "INFO") as logs:
+            self.client.get(reverse("trucks-signs-namespace:categories-api"))
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual(line["view"], "trucks-signs-namespace:categories-api")
+        self.assertEqual(line["status"], 200)
+        self.assertGreater(line["queries"], 0)
+        self.assertIn("app_ms", line)
+        self.assertIn("render_ms", line)
+
+    @override_settings(REQUEST_TIMING_SAMPLE_RATE=0)
+    def test_success_unsampled_request_is_not_measured(self):
+        """Tests that no header is sent when the sample rate is 0."""
+        response = self.client.get(reverse("trucks-signs-namespace:products-api"))
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(REQUEST_TIMING_VIEWS=["categories-api"])
+    def test_success_view_allow_list(self):
+        """Tests that only the url names on the allow-list are measured."""
+        response = self.client.get(reverse("trucks-signs-namespace:products-api"))
+        self.assertNotIn("Server-Timing", response)
+        with self.assertLogs("tsa_products.timing", "INFO"):
+            response = self.client.get(reverse("trucks-signs-namespace:categories-api"))
+        self.assertIn("Server-Timing", response)
@@ -0,0 +1,99 @@
+import io
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from tsa_products.models import Category, Comment, Product, UploadTask
+
+TEST_MEDIA_ROOT = tempfile.mkdtemp()
+TEST_UPLOAD_SPOOL_ROOT = tempfile.mkdtemp()
+
+
+def build_test_image(name="test.png"):
+    content = io.BytesIO()
+    Image.new("RGB", (32, 32), "red").save(content, format="PNG")
+    return SimpleUploadedFile(name, content.getvalue(), content_type="image/png")
+
+
+@override_settings(MEDIA_ROOT=TEST_MEDIA_ROOT, UPLOAD_SPOOL_ROOT=TEST_UPLOAD_SPOOL_ROOT)
+class QueuedUploadTestCase(TestCase):
+    @classmethod
+    def setUpTestData(self):
+        self.test_category = Category.objects.create(title="Truck Sign", image="test-path")
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(TEST_MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(TEST_UPLOAD_SPOOL_ROOT, ignore_errors=True)
+
+    def test_success_customer_image_is_queued_and_processed(self):
+        """Tests that a queued customer image is spooled and moved to the product by the worker."""
+        response = self.client.post(
+            reverse("trucks-signs-namespace:queued-upload-customer-image-api"), {"image": build_test_image()}
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["status"], "pending")
+        task = UploadTask.objects.get(id=response.json()["id"])
+        self.assertTrue(os.path.exists(os.path.join(TEST_UPLOAD_SPOOL_ROOT, task.spooled_file)))
+        self.assertFalse(task.product.image)
+
+        call_command("process_uploads", "--once", stdout=StringIO())
+
+        task.refresh_from_db()
+        product = Product.objects.get(id=task.product_id)
+        self.assertEqual(task.status, UploadTask.Status.DONE)
+        self.assertTrue(product.is_uploaded)
+        self.assertTrue(product.image.name.startswith("uploads/products/"))
+        self.assertEqual(product.detail_image.name, product.image.name)
+        self.assertFalse(os.path.exists(os.path.join(TEST_UPLOAD_SPOOL_ROOT, task.spooled_file)))
+
+        status_response = self.client.get(reverse("trucks-signs-namespace:upload-task-api", kwargs={"id": task.id}))
+        self.assertEqual(status_response.json()["status"], "done")
+
+    def test_success_comment_is_queued_and_processed(self):
+        """Tests that a queued comment image is moved to the comment by the worker."""
+        response = self.client.post(
+            reverse("trucks-signs-namespace:queued-comment-create-api"),
+            {"user_email": "test@example.com", "text": "test-text", "image": build_test_image()},
+        )
+        self.assertEqual(response.status_code, 202)
+        comment = Comment.objects.get(id=response.json()["comment"])
+        self.assertEqual(comment.text, "test-text")
+        self.assertFalse(comment.image)
+
+        call_command("process_uploads", "--once", stdout=StringIO())
+
+        comment.refresh_from_db()
+        self.assertTrue(comment.image.name.startswith("uploads/comments/"))
+
+    def test_failure_invalid_image_is_rejected(self):
+        """Tests that files which are not images are rejected before anything is queued."""
+        response = self.client.post(
+            reverse("trucks-signs-namespace:queued-upload-customer-image-api"),
+            {"image": SimpleUploadedFile("test.png", b"not an image")},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(UploadTask.objects.count(), 0)
+
+    def test_failure_missing_spooled_file_is_retried_until_failed(self):
+        """Tests that a failing task is retried and marked failed after the maximum attempts."""
+        product = Product.objects.create(category=self.test_category, title="test-title", is_uploaded=True)
+        task = UploadTask.objects.create(product=product, spooled_file="missing.png")
+
+        call_command("process_uploads", "--once", "--max-attempts=2", stdout=StringIO())
+        task.refresh_from_db()
+        self.assertEqual(task.status, UploadTask.Status.PENDING)
+        self.assertNotEqual(task.error, "")
+
+        call_command("process_uploads", "--once", "--max-attempts=2", stdout=StringIO())
+        task.refresh_from_db()
+        self.assertEqual(task.status, UploadTask.Status.FAILED)
+        self.assertEqual(task.attempts, 2)
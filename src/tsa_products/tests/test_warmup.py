@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.test import TestCase
+from django.urls import clear_url_caches, get_resolver
+
+from tsa_products.cache import CATALOG_VERSION_KEY
+from tsa_products.warmup import warm_up
+
+
+class WarmUpTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        clear_url_caches()
+
+    def test_success_warm_up(self):
+        """Tests that warming up a worker connects, populates the url resolver and initialises the catalog version."""
+        with mock.patch.object(connection, "close") as close:
+            warm_up(keep_connections=True)
+        self.assertIsNotNone(connection.connection)
+        close.assert_not_called()
+        self.assertTrue(get_resolver()._populated)
+        self.assertIsNotNone(cache.get(CATALOG_VERSION_KEY))
+
+    def test_success_connections_handed_back(self):
+        """Tests that the connections are closed again for workers serving requests from other threads."""
+        with mock.patch.object(connection, "close") as close:
+            warm_up()
+        close.assert_called_once_with()
+
+    def test_failure_database_unavailable(self):
+        """Tests that a worker still warms up when the database cannot be reached."""
+        with (
+            mock.patch.object(connection, "ensure_connection", side_effect=DatabaseError("unavailable")),
+            self.assertLogs("tsa_products.warmup", "WARNING"),
+        ):
+            warm_up(keep_connections=True)
+        self.assertTrue(get_resolver()._populated)
+        self.assertIsNotNone(cache.get(CATALOG_VERSION_KEY))
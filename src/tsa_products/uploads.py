@@ -0,0 +1,117 @@
+import logging
+import os
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .images import generate_instance_image_variants
+from .models import Category, Comment, ImageVariantTask, Product, UploadTask
+
+logger = logging.getLogger(__name__)
+
+
+def get_spool_storage():
+    return FileSystemStorage(location=settings.UPLOAD_SPOOL_ROOT)
+
+
+def enqueue_upload(image, product=None, comment=None):
+    """Store the uploaded image in the local spool and queue its transfer to the media storage."""
+    spooled_file = get_spool_storage().save(os.path.basename(image.name), image)
+    return UploadTask.objects.create(product=product, comment=comment, spooled_file=spooled_file)
+
+
+IMAGE_VARIANT_MODELS = {model.__name__: model for model in (Category, Product, Comment)}
+
+
+def enqueue_image_variants(instance):
+    """Queue the creation of the derivatives of a saved instance's images."""
+    return ImageVariantTask.objects.create(model_name=type(instance).__name__, object_id=instance.pk)
+
+
+def claimable_tasks(model, stale_before):
+    """Pending tasks and tasks left in processing since before `stale_before` of a task model, oldest first."""
+    # the redundant status__in matches the condition of the partial <model>_open_idx index
+    return model.objects.filter(
+        Q(status=UploadTask.Status.PENDING) | Q(status=UploadTask.Status.PROCESSING, updated_at__lt=stale_before),
+        status__in=[UploadTask.Status.PENDING, UploadTask.Status.PROCESSING],
+    ).order_by("pk")
+
+
+def claim_tasks(model, limit, stale_after):
+    """Mark up to `limit` pending tasks as processing and return them.
+
+    Tasks left in processing for longer than `stale_after` (e.g. by a killed worker) are
+    claimed again. Rows locked by another worker are skipped on PostgreSQL.
+    """
+    stale_before = timezone.now() - stale_after
+    with transaction.atomic():
+        tasks = list(claimable_tasks(model, stale_before).select_for_update(skip_locked=True)[:limit])
+        model.objects.filter(pk__in=[task.pk for task in tasks]).update(
+            status=UploadTask.Status.PROCESSING, attempts=F("attempts") + 1, updated_at=timezone.now()
+        )
+    for task in tasks:
+        task.status = UploadTask.Status.PROCESSING
+        task.attempts += 1
+    return tasks
+
+
+def process_upload_task(task, max_attempts):
+    """Move the spooled image of a claimed task to its product or comment."""
+    spool_storage = get_spool_storage()
+    try:
+        instance = task.product or task.comment
+        with spool_storage.open(task.spooled_file) as spooled_file:
+            instance.image.save(os.path.basename(task.spooled_file), File(spooled_file), save=False)
+        if task.product is not None:
+            instance.detail_image = instance.image
+        instance.save()
+    except Exception as error:
+        logger.exception("could not process upload task %s", task.pk)
+        task.status = UploadTask.Status.FAILED if task.attempts >= max_attempts else UploadTask.Status.PENDING
+        task.error = str(error)
+        task.save(update_fields=["status", "error", "updated_at"])
+        return False
+
+    spool_storage.delete(task.spooled_file)
+    task.status = UploadTask.Status.DONE
+    task.error = ""
+    task.save(update_fields=["status", "error", "updated_at"])
+    return True
+
+
+def process_pending_uploads(limit=10, max_attempts=None, stale_after=timedelta(minutes=15)):
+    if max_attempts is None:
+        max_attempts = settings.UPLOAD_TASK_MAX_ATTEMPTS
+    tasks = claim_tasks(UploadTask, limit, stale_after)
+    return [process_upload_task(task, max_attempts) for task in tasks]
+
+
+def process_image_variant_task(task, max_attempts):
+    """Create the derivatives of the images of a claimed task's instance, if it still exists."""
+    try:
+        instance = IMAGE_VARIANT_MODELS[task.model_name].objects.filter(pk=task.object_id).first()
+        if instance is not None:
+            generate_instance_image_variants(instance)
+    except Exception as error:
+        logger.exception("could not process image variant task %s", task.pk)
+        task.status = UploadTask.Status.FAILED if task.attempts >= max_attempts else UploadTask.Status.PENDING
+        task.error = str(error)
+        task.save(update_fields=["status", "error", "updated_at"])
+        return False
+
+    task.status = UploadTask.Status.DONE
+    task.error = ""
+    task.save(update_fields=["status", "error", "updated_at"])
+    return True
+
+
+def process_pending_image_variants(limit=10, max_attempts=None, stale_after=timedelta(minutes=15)):
+    if max_attempts is None:
+        max_attempts = settings.UPLOAD_TASK_MAX_ATTEMPTS
+    tasks = claim_tasks(ImageVariantTask, limit, stale_after)
+    return [process_image_variant_task(task, max_attempts) for task in tasks]
@@ -1,24 +1,42 @@
 from django.urls import re_path
 
+from .async_views import (
+    AsyncCategoryListView,
+    AsyncLetteringItemCategoryListView,
+    AsyncLogoListView,
+    AsyncProductColorListView,
+    AsyncProductDetail,
+    AsyncProductFromCategoryListView,
+    AsyncProductListView,
+    AsyncRetrieveOrder,
+)
+
 # from .views import PricesPageAPI,HowToAPIView, CreateOrderAPI, OrderSummaryAPIView, RetrieveAllProductColorsAPI
 from .views import (
+    BatchCreateOrder,
     CategoryListView,
     CommentCreateView,
     CommentsView,
     CreateOrder,
     LetteringItemCategoryListView,
     LogoListView,
+    OrderExportView,
     PaymentView,
     ProductColorListView,
     ProductDetail,
     ProductFromCategoryListView,
     ProductListView,
     ProductVariationRetrieveView,
+    QueuedCommentCreateView,
+    QueuedUploadCustomerImage,
     RetrieveOrder,
     UploadCustomerImage,
+    UploadTaskRetrieveView,
 )
 
 app_name = "tsa_products"
+# instance namespace tsa_app/urls.py includes these routes with, e.g. "trucks-signs-namespace:categories-api"
+URL_NAMESPACE = "trucks-signs-namespace"
 
 urlpatterns = [
     re_path(r"^categories/$", CategoryListView.as_view(), name="categories-api"),
@@ -30,15 +48,41 @@ urlpatterns = [
     re_path(
         r"^product-variation-retrieve/(?P<id>[0-9]+)/$",
         ProductVariationRetrieveView.as_view(),
-        name="product-category-api",
+        name="product-variation-retrieve-api",
     ),
     re_path(r"^product-color/$", ProductColorListView.as_view(), name="product-color-api"),
     re_path(r"^product-detail/(?P<id>[0-9]+)/$", ProductDetail.as_view(), name="product-detail-api"),
     re_path(r"^truck-logo-list/$", LogoListView.as_view(), name="truck-logo-list-api"),
     re_path(r"^order/(?P<id>[0-9]+)/create/$", CreateOrder.as_view(), name="create-order-api"),
+    re_path(r"^order/batch-create/$", BatchCreateOrder.as_view(), name="batch-create-order-api"),
     re_path(r"^order/(?P<id>[0-9]+)/retrieve/$", RetrieveOrder.as_view(), name="retrieve-order-api"),
+    re_path(r"^order/export/(?P<export_format>csv|ndjson)/$", OrderExportView.as_view(), name="order-export-api"),
     re_path(r"^order-payment/(?P<id>[0-9]+)/$", PaymentView.as_view(), name="order-payment-api"),
     re_path(r"^comments/$", CommentsView.as_view(), name="comments-api"),
     re_path(r"^comment/create/$", CommentCreateView.as_view(), name="comment-create-api"),
+    re_path(r"^comment/create/queued/$", QueuedCommentCreateView.as_view(), name="queued-comment-create-api"),
     re_path(r"^upload-customer-image/$", UploadCustomerImage.as_view(), name="upload-customer-image-api"),
+    re_path(
+        r"^upload-customer-image/queued/$",
+        QueuedUploadCustomerImage.as_view(),
+        name="queued-upload-customer-image-api",
+    ),
+    re_path(r"^upload-task/(?P<id>[0-9]+)/$", UploadTaskRetrieveView.as_view(), name="upload-task-api"),
+    # async versions of the read-only routes, see async_views.py
+    re_path(r"^async/categories/$", AsyncCategoryListView.as_view(), name="async-categories-api"),
+    re_path(
+        r"^async/lettering-item-categories/$",
+        AsyncLetteringItemCategoryListView.as_view(),
+        name="async-lettering-item-categories-api",
+    ),
+    re_path(r"^async/products/$", AsyncProductListView.as_view(), name="async-products-api"),
+    re_path(
+        r"^async/product-category/(?P<id>[0-9]+)/$",
+        AsyncProductFromCategoryListView.as_view(),
+        name="async-product-category-api",
+    ),
+    re_path(r"^async/product-color/$", AsyncProductColorListView.as_view(), name="async-product-color-api"),
+    re_path(r"^async/product-detail/(?P<id>[0-9]+)/$", AsyncProductDetail.as_view(), name="async-product-detail-api"),
+    re_path(r"^async/truck-logo-list/$", AsyncLogoListView.as_view(), name="async-truck-logo-list-api"),
+    re_path(r"^async/order/(?P<id>[0-9]+)/retrieve/$", AsyncRetrieveOrder.as_view(), name="async-retrieve-order-api"),
 ]
@@ -1,34 +1,51 @@
+from collections.abc import Mapping
 from datetime import datetime
 
+from django.conf import settings
+from django.db import transaction
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import (
     CreateAPIView,
     GenericAPIView,
     ListAPIView,
     RetrieveAPIView,
 )
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from .cache import CatalogCacheMixin
+from .exports import filter_orders, stream_orders
+from .fast_serializers import CATEGORY_VALUES, PRODUCT_VALUES, ValuesListMixin, serialize_categories, serialize_products
+from .idempotency import idempotent
+from .metrics import record_upload_sizes
 from .models import (
     Category,
     Comment,
     LetteringItemCategory,
-    LetteringItemVariation,
     Order,
     Product,
     ProductColor,
     ProductVariation,
+    UploadTask,
 )
+from .orders import prepare_orders, save_orders
 from .serializers import (
     CategorySerializer,
     CommentSerializer,
+    ImageUploadSerializer,
     LetteringItemCategorySerializer,
+    OrderCreateSerializer,
+    OrderExportFilterSerializer,
     OrderSerializer,
     PaymentSerializer,
     ProductColorSerializer,
     ProductSerializer,
     ProductVariationSerializer,
+    UploadTaskSerializer,
 )
+from .uploads import enqueue_upload
 
 # admin_email = settings.EMAIL_ADMIN
 # current_admin_domain = settings.CURRENT_ADMIN_DOMAIN
@@ -36,58 +53,66 @@ from .serializers import (
 # Create your views here.
 
 
-class CategoryListView(ListAPIView):
+class CategoryListView(CatalogCacheMixin, ValuesListMixin, ListAPIView):
     authentication_classes = []
     serializer_class = CategorySerializer
+    values_fields = CATEGORY_VALUES
+    values_serializer = staticmethod(serialize_categories)
     model = Category
-    queryset = Category.objects.all()
+    queryset = Category.objects.with_sample_product_id()
 
 
-class LetteringItemCategoryListView(ListAPIView):
+class LetteringItemCategoryListView(CatalogCacheMixin, ListAPIView):
     authentication_classes = []
     serializer_class = LetteringItemCategorySerializer
     model = LetteringItemCategory
     queryset = LetteringItemCategory.objects.all()
 
 
-class ProductListView(ListAPIView):
+class ProductListView(CatalogCacheMixin, ValuesListMixin, ListAPIView):
     authentication_classes = []
     serializer_class = ProductSerializer
+    values_fields = PRODUCT_VALUES
+    values_serializer = staticmethod(serialize_products)
     model = Product
-    queryset = Product.objects.all()
+    queryset = Product.objects.with_category()
 
 
-class ProductFromCategoryListView(ListAPIView):
+class ProductFromCategoryListView(CatalogCacheMixin, ValuesListMixin, ListAPIView):
     authentication_classes = []
     serializer_class = ProductSerializer
+    values_fields = PRODUCT_VALUES
+    values_serializer = staticmethod(serialize_products)
     model = Product
     lookup_url_kwarg = "id"
 
     def get_queryset(self):
         category_id = self.kwargs.get(self.lookup_url_kwarg)
-        return Product.objects.filter(category__id=category_id)
+        return Product.objects.with_category().filter(category__id=category_id)
 
 
-class ProductColorListView(ListAPIView):
+class ProductColorListView(CatalogCacheMixin, ListAPIView):
     authentication_classes = []
     serializer_class = ProductColorSerializer
     model = ProductColor
     queryset = ProductColor.objects.all()
 
 
-class LogoListView(ListAPIView):
+class LogoListView(CatalogCacheMixin, ValuesListMixin, ListAPIView):
     authentication_classes = []
     serializer_class = ProductSerializer
+    values_fields = PRODUCT_VALUES
+    values_serializer = staticmethod(serialize_products)
     model = Product
-    queryset = Product.objects.filter(category__title="Truck Sign", is_uploaded=False)
+    queryset = Product.objects.with_category().filter(category__title="Truck Sign", is_uploaded=False)
 
 
-class ProductDetail(RetrieveAPIView):
+class ProductDetail(CatalogCacheMixin, RetrieveAPIView):
     authentication_classes = []
     serializer_class = ProductSerializer
     model = Product
     lookup_field = "id"
-    queryset = Product.objects.all()
+    queryset = Product.objects.with_category()
 
 
 class ProductVariationRetrieveView(RetrieveAPIView):
@@ -95,47 +120,69 @@ class ProductVariationRetrieveView(RetrieveAPIView):
     serializer_class = ProductVariationSerializer
     model = ProductVariation
     lookup_field = "id"
-    queryset = ProductVariation.objects.all()
+    queryset = ProductVariation.objects.with_related()
 
 
 class CreateOrder(GenericAPIView):
     authentication_classes = []
     serializer_class = OrderSerializer
 
+    @idempotent
     def post(self, request, id, format=None):
-        data = request.data
+        if not isinstance(request.data, Mapping):
+            # the message the serializer answers a non-object body with, before it can be merged with the id
+            message = f"Invalid data. Expected a dictionary, but got {type(request.data).__name__}."
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+        serializer = OrderCreateSerializer(data={**request.data, "product_id": id})
+        serializer.is_valid(raise_exception=True)
 
-        product = Product.objects.get(id=id)
+        prepared_orders, errors = prepare_orders([serializer.validated_data])
+        if errors[0]:
+            raise ValidationError(errors[0])
+        (order,) = save_orders(prepared_orders)
 
-        product_variation = ProductVariation(product=product)
-        product_variation.save()
+        order_serializer = OrderSerializer(Order.objects.with_related().get(id=order.id))
 
-        lettering_items = data["lettering_items"]
-        for custom_lettering_item in lettering_items:
-            if custom_lettering_item["text"] and custom_lettering_item["text"].strip():
-                item_category = LetteringItemCategory.objects.get(title=custom_lettering_item["title"])
-                item_category.save()
-                lettering_item = LetteringItemVariation(
-                    lettering_item_category=item_category,
-                    lettering=custom_lettering_item["text"],
-                    product_variation=product_variation,
-                )
-                lettering_item.save()
+        return Response({"Result": order_serializer.data}, status=status.HTTP_200_OK)
 
-        try:
-            product_color = ProductColor.objects.get(id=data["product_color_id"])
-        except ProductColor.DoesNotExist:
-            product_color = None
-        product_variation.product_color = product_color
-        product_variation.amount = 1
-        product_variation.save()
-
-        order_serializer = OrderSerializer(data=data["order"])
-        order_serializer.is_valid(raise_exception=True)
-        order = order_serializer.save(product=product_variation, payment=None)
-        order_serializer = OrderSerializer(order)
 
-        return Response({"Result": order_serializer.data}, status=status.HTTP_200_OK)
+class BatchCreateOrder(GenericAPIView):
+    authentication_classes = []
+    serializer_class = OrderCreateSerializer
+
+    @idempotent
+    def post(self, request, format=None):
+        serializer = OrderCreateSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=settings.ORDER_BATCH_MAX_SIZE
+        )
+        if not serializer.is_valid():
+            if not isinstance(serializer.errors, list):
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            return self.invalid_response(serializer.errors)
+
+        prepared_orders, errors = prepare_orders(serializer.validated_data)
+        if any(errors):
+            return self.invalid_response(errors)
+        orders = save_orders(prepared_orders)
+
+        orders_by_id = Order.objects.with_related().in_bulk([order.id for order in orders])
+        results = [
+            {"index": index, "status": "created", "order": OrderSerializer(orders_by_id[order.id]).data}
+            for index, order in enumerate(orders)
+        ]
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    def invalid_response(self, errors):
+        # nothing is created if one item is invalid, the valid items are reported as not created
+        results = [
+            (
+                {"index": index, "status": "invalid", "errors": item_errors}
+                if item_errors
+                else {"index": index, "status": "not_created"}
+            )
+            for index, item_errors in enumerate(errors)
+        ]
+        return Response({"results": results}, status=status.HTTP_400_BAD_REQUEST)
 
 
 class RetrieveOrder(RetrieveAPIView):
@@ -143,7 +190,20 @@ class RetrieveOrder(RetrieveAPIView):
     serializer_class = OrderSerializer
     model = Order
     lookup_field = "id"
-    queryset = Order.objects.all()
+    queryset = Order.objects.with_related()
+
+
+class OrderExportView(GenericAPIView):
+    """Stream the orders of a date range as csv or ndjson for fulfillment, staff only."""
+
+    permission_classes = [IsAdminUser]
+    serializer_class = OrderExportFilterSerializer
+
+    def get(self, request, export_format, format=None):
+        # a plain dict, as a QueryDict would turn a missing "ordered" into False
+        filters = OrderExportFilterSerializer(data=request.query_params.dict())
+        filters.is_valid(raise_exception=True)
+        return stream_orders(filter_orders(Order.objects.all(), **filters.validated_data), export_format)
 
 
 class PaymentView(GenericAPIView):
@@ -152,10 +212,11 @@ class PaymentView(GenericAPIView):
     serializer_class = PaymentSerializer
 
     def get(self, post, id, format=None):
-        order = Order.objects.get(id=id)
+        order = Order.objects.with_related().get(id=id)
         order_serializer = OrderSerializer(order)
         return Response({"Order": order_serializer.data}, status=status.HTTP_200_OK)
 
+    @idempotent
     def post(self, request, id, format=None):
 
         try:
@@ -212,6 +273,25 @@ class CommentCreateView(CreateAPIView):
     serializer_class = CommentSerializer
     queryset = Comment.objects.all()
 
+    def perform_create(self, serializer):
+        record_upload_sizes(self.request)
+        super().perform_create(serializer)
+
+
+class QueuedCommentCreateView(GenericAPIView):
+    authentication_classes = []
+    serializer_class = CommentSerializer
+
+    def post(self, request, format=None):
+        serializer = CommentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        image = serializer.validated_data.pop("image")
+        record_upload_sizes(request)
+        with transaction.atomic():
+            comment = Comment.objects.create(**serializer.validated_data)
+            task = enqueue_upload(image, comment=comment)
+        return Response(UploadTaskSerializer(task).data, status=status.HTTP_202_ACCEPTED)
+
 
 class UploadCustomerImage(GenericAPIView):
     authentication_classes = []
@@ -225,8 +305,33 @@ class UploadCustomerImage(GenericAPIView):
 
         product_serializer = ProductSerializer(product, data=data, partial=True)
         product_serializer.is_valid(raise_exception=True)
+        record_upload_sizes(request)
         product = product_serializer.save()
         product.detail_image = product.image
         product.save()
         product_serializer = ProductSerializer(product)
         return Response({"Result": product_serializer.data}, status=status.HTTP_200_OK)
+
+
+class QueuedUploadCustomerImage(GenericAPIView):
+    authentication_classes = []
+    serializer_class = ImageUploadSerializer
+
+    def post(self, request, format=None):
+        serializer = ImageUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        record_upload_sizes(request)
+        product_title = "Customer-Image-" + str(datetime.now())
+        category = Category.objects.get(title="Truck Sign")
+        with transaction.atomic():
+            product = Product.objects.create(category=category, title=product_title, is_uploaded=True)
+            task = enqueue_upload(serializer.validated_data["image"], product=product)
+        return Response(UploadTaskSerializer(task).data, status=status.HTTP_202_ACCEPTED)
+
+
+class UploadTaskRetrieveView(RetrieveAPIView):
+    authentication_classes = []
+    serializer_class = UploadTaskSerializer
+    model = UploadTask
+    lookup_field = "id"
+    queryset = UploadTask.objects.all()
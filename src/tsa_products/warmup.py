@@ -0,0 +1,38 @@
+import logging
+import time
+
+from django.db import DatabaseError, connections
+from django.urls import get_resolver
+
+from .cache import get_catalog_version
+from .serializers import CategorySerializer, OrderSerializer, ProductSerializer
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up(keep_connections=False):
+    """Prepare a freshly forked worker so its first requests do not pay for the setup.
+
+    Connects to the databases, which fills the connection pools, populates the url resolver and the
+    serializer fields, and initialises the catalog version the ETags and cache keys are built from.
+    The catalog payloads themselves are not rendered, their cache keys contain the requested host.
+
+    Connections are thread local, so they are closed again (handing pooled ones back to their pool)
+    unless `keep_connections` is set for workers serving requests from the calling thread.
+    Returns the duration in seconds.
+    """
+    started = time.perf_counter()
+    for connection in connections.all():
+        try:
+            connection.ensure_connection()
+        except DatabaseError:
+            # the worker still starts, the first request connects again
+            logger.warning("could not connect to database %r while warming up", connection.alias, exc_info=True)
+        if not keep_connections:
+            connection.close()
+    # populating the lookups of reverse() imports the url modules as well
+    get_resolver().reverse_dict
+    for serializer_class in (CategorySerializer, ProductSerializer, OrderSerializer):
+        serializer_class().fields
+    get_catalog_version()
+    return time.perf_counter() - started